@@ -0,0 +1,107 @@
+import threading
+
+import pandas as pd
+
+from ledger import _col, parse_currency
+
+# --- EXPENSE ROLLUPS ---
+# Daily, weekly and monthly cost totals per category and per payment method, kept pre-aggregated.
+# update() takes the mirrored sheet rows only: the mirror is append-only between full reloads, so
+# just the rows past the last mirror row count are folded in, and a new mirror generation (full
+# reload) or a shrunken mirror triggers a rebuild. Journal rows not on the sheet yet are laid over a
+# copy by snapshot() and never kept, so a flush can't count them twice. Charts and period
+# comparisons read these small tables, so years of history cost the same as a week.
+GRAINS = {"Daily": "D", "Weekly": "W-SUN", "Monthly": "M"}
+DIMENSIONS = {"category": "category", "account": "payment method"}
+
+
+def _rows(expenses):
+    # Same filter as ledger.build_ledger: only positive costs count
+    cost = parse_currency(_col(expenses, "cost", 0)).to_numpy()
+    paid = cost > 0
+    return pd.DataFrame({
+        "day": pd.to_datetime(_col(expenses, "date", None), errors="coerce", format="mixed").dt.normalize().to_numpy()[paid],
+        "category": _col(expenses, "category", "Other").fillna("Other").astype(str).to_numpy()[paid],
+        "account": _col(expenses, "payment method", "").fillna("").astype(str).str.strip().to_numpy()[paid],
+        "cost": cost[paid],
+    })
+
+
+class ExpenseRollups:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.generation, self.applied = None, 0
+        self.tables, self.pairs = {}, None
+
+    def _fold(self, rows):
+        for grain, freq in GRAINS.items():
+            # Weekly buckets run Monday-Sunday ("W-SUN" names the week's last day); undated rows stay under NaT so totals still match the sheet
+            period = rows["day"].dt.to_period(freq).dt.start_time
+            for dim in DIMENSIONS:
+                new = rows.groupby([period.rename("period"), rows[dim]], dropna=False)["cost"].agg(["sum", "count"])
+                old = self.tables.get((grain, dim))
+                self.tables[(grain, dim)] = new if old is None else old.add(new, fill_value=0)
+        new = rows.groupby(["category", "account"])["cost"].sum()
+        self.pairs = new if self.pairs is None else self.pairs.add(new, fill_value=0)
+
+    def update(self, synced, generation=None):
+        # synced: the mirror's rows (not the journal overlay); returns the number of rows folded in
+        with self._lock:
+            if generation != self.generation or len(synced) < self.applied:
+                self.generation, self.applied, self.tables, self.pairs = generation, 0, {}, None
+            fresh = synced.iloc[self.applied:]
+            if self.applied == 0 or len(fresh): self._fold(_rows(fresh))
+            self.applied = len(synced)
+            return len(fresh)
+
+    def snapshot(self, pending=None):
+        # A read-only view: the persisted rollups plus the given unsent rows
+        view = ExpenseRollups()
+        with self._lock: view.tables, view.pairs = dict(self.tables), self.pairs
+        if pending is not None and len(pending): view._fold(_rows(pending))
+        return view
+
+    def table(self, grain, dim):
+        with self._lock: return self.tables[(grain, dim)]
+
+    def totals(self, dim):
+        # All-time totals per category/account (the monthly table is the smallest one to sum)
+        return self.table("Monthly", dim)["sum"].groupby(level=1).sum().sort_values(ascending=False)
+
+    def compact(self):
+        # One row per (category, payment method) with its total cost: the same totals build_ledger
+        # derives from raw rows, at a fraction of the size
+        with self._lock: pairs = self.pairs
+        if pairs is None or pairs.empty: return pd.DataFrame(columns=["category", "payment method", "cost"])
+        return pairs.rename("cost").rename_axis(["category", "payment method"]).reset_index()
+
+    def trend(self, grain, dim, periods=None):
+        # period x dim frame of costs, oldest first; periods limits it to the most recent N buckets
+        wide = self.table(grain, dim)["sum"].unstack(fill_value=0.0)
+        wide = wide[wide.index.notna()].sort_index()
+        return wide.iloc[-periods:] if periods else wide
+
+    def compare(self, grain, dim, today=None):
+        # The current period against the one before it, per category/account
+        wide = self.trend(grain, dim)
+        today = pd.Timestamp(today or pd.Timestamp.now()).normalize()
+        current = today.to_period(GRAINS[grain]).start_time
+        previous = (today.to_period(GRAINS[grain]) - 1).start_time
+        out = pd.DataFrame({
+            "Current": wide.loc[current] if current in wide.index else 0.0,
+            "Previous": wide.loc[previous] if previous in wide.index else 0.0,
+        }, index=wide.columns).fillna(0.0)
+        out["Change"] = out["Current"] - out["Previous"]
+        out["Change %"] = (out["Change"] / out["Previous"].where(out["Previous"] != 0)) * 100
+        return out.sort_values("Current", ascending=False), current, previous
+
+
+_rollups = None
+_rollups_lock = threading.Lock()
+
+
+def get_rollups():
+    global _rollups
+    with _rollups_lock:
+        if _rollups is None: _rollups = ExpenseRollups()
+        return _rollups
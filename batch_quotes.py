@@ -0,0 +1,116 @@
+import io
+import itertools
+import multiprocessing
+import os
+import re
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from quote_engine import quote_engine
+
+# --- BATCH QUOTE EXPORT ---
+# Re-issues a sheet of estimates in one go: every row is priced with the Event Quoter math,
+# the PDFs are rendered across a process pool, and each one is streamed into a single ZIP.
+# Rows that can't be read (e.g. "forty" adults) are skipped and reported by row number. Rates come
+# from the engine passed in (quote_engine.engine_for(catalog) for a location's own pricing).
+#
+#   python batch_quotes.py events.csv estimates.zip
+
+# CSV column -> (quote field, default). Defaults match the Event Quoter form.
+COLUMNS = {
+    "client": ("client_name", ""), "date": ("event_date", ""), "address": ("event_address", ""), "notes": ("event_desc", ""),
+    "adults": ("adults", 40), "kids": ("kids", 10), "tier": ("adult_tier", "Classic"),
+    "adult_bevs": ("add_adult_bevs", True), "kid_bevs": ("add_kid_bevs", True),
+    "tax": ("apply_tax", True), "cc_fee": ("apply_cc", False),
+    "discount": ("discount_pct", 0.0), "setup_fee": ("event_fee", 150.0), "menu_ext_fee": ("menu_ext_fee", 0.0),
+    "pizzas": ("selected_pizzas", ""),
+}
+TRUTHY = {"1", "y", "yes", "true", "x"}
+
+
+def _flag(value):
+    return value if isinstance(value, bool) else str(value).strip().lower() in TRUTHY
+
+
+def _tier(value, tiers):
+    value = str(value).strip()
+    return next((label for label in tiers if label.lower().startswith(value.lower()[:7])), list(tiers)[0])
+
+
+def _count(value):
+    n = float(value)
+    if n < 0 or n != int(n): raise ValueError
+    return int(n)
+
+
+def normalize_events(events, engine=quote_engine):
+    # -> (rows, bad): bad is [(CSV line number, problem)] for rows that were left out
+    df = events.rename(columns=lambda c: str(c).strip().lower().replace(" ", "_"))
+    rows, bad = [], []
+    for i, record in enumerate(df.to_dict("records")):
+        row = {}
+        for col, (field, default) in COLUMNS.items():
+            value = record.get(col, default)
+            row[field] = default if pd.isna(value) or value == "" else value
+        problems = []
+        for col, field, parse in (("adults", "adults", _count), ("kids", "kids", _count), ("discount", "discount_pct", float),
+                                  ("setup_fee", "event_fee", float), ("menu_ext_fee", "menu_ext_fee", float)):
+            try: row[field] = parse(str(row[field]).strip().lstrip("$").replace(",", ""))
+            except (ValueError, OverflowError): problems.append(f"{col} {row[field]!r}")
+        if problems:
+            bad.append((i + 2, "bad " + ", ".join(problems)))
+            continue
+        for field in ("add_adult_bevs", "add_kid_bevs", "apply_tax", "apply_cc"): row[field] = _flag(row[field])
+        row["adult_tier"] = _tier(row["adult_tier"], engine.adult_tiers)
+        row["selected_pizzas"] = [p.strip() for p in re.split(r"[;|]", str(row["selected_pizzas"])) if p.strip()]
+        rows.append(row)
+    return rows, bad
+
+
+def render_event(row, engine):
+    from quote_pdf import generate_pdf_quote
+    q = engine.price(row["adults"], row["kids"], row["adult_tier"], row["add_adult_bevs"], row["add_kid_bevs"],
+                    row["apply_tax"], row["apply_cc"], row["discount_pct"], row["event_fee"], row["menu_ext_fee"])
+    pdf = generate_pdf_quote(row["client_name"], row["event_date"], row["event_address"], row["event_desc"], q["printable_items"],
+                             row["event_fee"], row["menu_ext_fee"], q["gross_subtotal"], q["discount_amount"], row["discount_pct"],
+                             q["tax_amount"], q["cc_fee_amount"], q["final_quote"], q["adult_pies"], q["kid_pies"],
+                             row["adult_tier"], row["adults"], row["kids"], row["selected_pizzas"],
+                             engine.covered_pizzas(row["adult_tier"]), engine.tax_line, engine.cc_fee_line)
+    return row["client_name"], pdf
+
+
+def export_zip(events, out, max_workers=None, engine=quote_engine):
+    # -> (estimates written, bad rows skipped). Workers are spawned, not forked: forking the
+    # Streamlit server would copy its threads and held locks into every worker.
+    rows, bad = normalize_events(events, engine)
+    used = set()
+    pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zf, pool:
+        chunksize = max(1, len(rows) // (4 * (max_workers or os.cpu_count() or 1)))
+        for client_name, pdf in pool.map(render_event, rows, itertools.repeat(engine, len(rows)), chunksize=chunksize):
+            stem = re.sub(r"[^\w\- ]", "", client_name).strip() or "Client"
+            name, n = f"CCK_Estimate_{stem}.pdf", 1
+            while name in used:
+                n += 1; name = f"CCK_Estimate_{stem}_{n}.pdf"
+            used.add(name)
+            zf.writestr(name, pdf)
+    return len(rows), bad
+
+
+def export_zip_bytes(events, max_workers=None, engine=quote_engine):
+    buf = io.BytesIO()
+    export_zip(events, buf, max_workers, engine)
+    return buf.getvalue()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python batch_quotes.py events.csv estimates.zip")
+    from catalog import get_catalog
+    from quote_engine import engine_for
+    count, bad = export_zip(pd.read_csv(sys.argv[1]), sys.argv[2], engine=engine_for(get_catalog()))
+    for line, problem in bad: print(f"Skipped line {line}: {problem}", file=sys.stderr)
+    print(f"Wrote {count} estimates to {sys.argv[2]}")
@@ -0,0 +1,95 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# --- COLD-START BENCHMARKS ---
+# Run before deploy: python benchmarks/bench_import_time.py
+# Every sample is a fresh interpreter, like a container waking up. Streamlit itself is imported
+# before the clock starts (the server has it loaded before any script runs); what's timed is
+#   - importing the modules the PIN gate needs, and the ones loaded after sign-in,
+#   - the first script run (login screen) and the first signed-in run, with and without warmup.
+# Exits non-zero when a step blows its budget or the gate pulls in a heavy module.
+APP = os.path.join(ROOT, "main.py")
+PIN = "CCK2026!"
+GATE_MODULES = ("warmup", "memo", "profiling", "templates", "tenants")
+BUDGETS_MS = {"login screen (no warmup)": 1000.0, "first signed-in run (warmup)": 1000.0}
+HEAVY = ("pandas", "altair", "fpdf", "streamlit_gsheets", "arrow")
+
+
+def child_imports(modules):
+    import streamlit  # noqa: F401
+    t = time.perf_counter()
+    for m in modules: __import__(m)
+    return {"ms": (time.perf_counter() - t) * 1000}
+
+
+def child_app(typing_delay):
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(APP, default_timeout=120)
+    t = time.perf_counter()
+    at.run()
+    gate_ms = (time.perf_counter() - t) * 1000
+    gate_heavy = [m for m in HEAVY if m in sys.modules]
+    time.sleep(typing_delay)  # staff member typing the PIN
+    at.text_input[0].input(PIN)
+    at.button[0].click()
+    t = time.perf_counter()
+    at.run()
+    return {"gate_ms": gate_ms, "signed_in_ms": (time.perf_counter() - t) * 1000, "gate_heavy": gate_heavy,
+            "errors": [str(e.value) for e in at.exception]}
+
+
+def spawn(args, env=None):
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", *args], capture_output=True, text=True,
+                         cwd=ROOT, env={**os.environ, **(env or {})}, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import and first-render timings")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--typing-delay", type=float, default=2.0, help="seconds between the login screen and sign-in")
+    parser.add_argument("--child", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        kind, *rest = args.child
+        print(json.dumps(child_imports(rest) if kind == "imports" else child_app(float(rest[0]))))
+        return 0
+
+    # Offline, with a throwaway sheet cache, so the network doesn't dominate the numbers
+    env = {"CCK_FAKE_SHEETS": os.environ.get("CCK_FAKE_SHEETS", "1"), "CCK_CACHE_DIR": tempfile.mkdtemp(prefix="cck-bench-")}
+    from warmup import HEAVY_MODULES
+    results = {
+        "import gate modules": statistics.median(spawn(["imports", *GATE_MODULES], env)["ms"] for _ in range(args.repeat)),
+        "import app modules": statistics.median(spawn(["imports", *HEAVY_MODULES], env)["ms"] for _ in range(args.repeat)),
+    }
+    gate_heavy, errors = set(), []
+    for label, warm in (("no warmup", "0"), ("warmup", "1")):
+        runs = [spawn(["app", str(args.typing_delay)], {**env, "CCK_WARMUP": warm}) for _ in range(args.repeat)]
+        results[f"login screen ({label})"] = statistics.median(r["gate_ms"] for r in runs)
+        results[f"first signed-in run ({label})"] = statistics.median(r["signed_in_ms"] for r in runs)
+        if warm == "0": gate_heavy.update(m for r in runs for m in r["gate_heavy"])
+        errors += [e for r in runs for e in r["errors"]]
+
+    failed = bool(gate_heavy or errors)
+    for name, ms in results.items():
+        budget = BUDGETS_MS.get(name)
+        ok = budget is None or ms <= budget
+        failed |= not ok
+        print(f"{name:<32} {ms:10.1f} ms" + (f"   budget {budget:>8.1f} ms   {'OK' if ok else 'OVER BUDGET'}" if budget else ""))
+    print(f"{'heavy modules at the gate':<32} {', '.join(sorted(gate_heavy)) or 'none'}")
+    if errors: print(f"{len(errors)} script errors, first: {errors[0]}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
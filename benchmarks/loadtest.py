@@ -0,0 +1,146 @@
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import multiprocessing
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Offline before anything imports sheets: sample worksheets and a throwaway cache dir
+os.environ.setdefault("CCK_FAKE_SHEETS", "1")
+os.environ.setdefault("CCK_CACHE_DIR", tempfile.mkdtemp(prefix="cck-loadtest-"))
+
+from streamlit.testing.v1 import AppTest
+
+# --- LOAD TEST ---
+# Replays scripted staff sessions against main.py with Streamlit's AppTest: log in through the PIN
+# gate, then work the Event Quoter, Pizza Builder and Recipe Margins tabs. AppTest swaps a global
+# Runtime in and out around every run (and rebinds __main__), so concurrency comes from forked
+# worker processes, each replaying its share of the sessions back to back. Reports p50/p95 rerun latency per step and tracemalloc-measured memory per live session.
+#
+#   python benchmarks/loadtest.py --sessions 24 --workers 8
+APP = os.path.join(ROOT, "main.py")
+PIN = "CCK2026!"
+MENU = ["The Plain Jane", "The Premium Pepperoni", "The Carnivore", "The Velvet Sting", "The Buffalo Soldier", "Kids Cheese"]
+
+
+def scenario(rng):
+    # (step label, active tab, {session_state key: value}) -- each entry is one rerun
+    quoter, builder, margins = "🎫 Event Quoter", "🍕 Pizza Builder", "📖 Recipe Margins"
+    steps = [
+        ("quoter: open", quoter, {}),
+        ("quoter: client", quoter, {"quote_client_name": f"Client {rng.randrange(1000)}", "quote_event_date": "2026-11-14", "quote_event_address": "1 Main St"}),
+        ("quoter: headcount", quoter, {"quote_adults": rng.randrange(10, 300, 5), "quote_kids": rng.randrange(0, 80, 5)}),
+        ("quoter: package", quoter, {"quote_adult_tier": rng.choice(["Classic ($17/head)", "Premium ($22/head)"]), "quote_selected_pizzas": rng.sample(MENU, 3)}),
+        ("quoter: fees", quoter, {"quote_apply_cc": rng.random() < 0.5, "quote_discount_pct": float(rng.choice([0, 5, 10]))}),
+        ("builder: open", builder, {}),
+        ("builder: pie", builder, {"builder_base": '14" Dough Ball', "builder_cheeses": ["Grande Mozzarella", "Ricotta Cheese"],
+                                   "builder_toppings": rng.sample(["Premium Sliced Pepperoni", "Fontanini Sausage", "Candied Bacon"], 2)}),
+        ("margins: item", margins, {"margins_view": "Single Item", "margins_selected_pie": rng.choice(MENU)}),
+        ("margins: menu", margins, {"margins_view": "Whole Menu"}),
+        ("margins: shock", margins, {"margins_shock_pct": rng.randrange(5, 50, 5)}),
+        ("quoter: back", quoter, {}),
+    ]
+    return steps
+
+
+def login(timeout):
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    at.run()
+    at.text_input[0].input(PIN)
+    at.button[0].click()
+    at.run()
+    return at
+
+
+def run_session(seed, iterations, timeout):
+    rng = random.Random(seed)
+    timings, errors = [], []
+    t = time.perf_counter()
+    at = login(timeout)
+    timings.append(("login", (time.perf_counter() - t) * 1000))
+    for _ in range(iterations):
+        for label, tab, values in scenario(rng):
+            at.session_state["active_tab"] = tab
+            for k, v in values.items(): at.session_state[k] = v
+            t = time.perf_counter()
+            at.run()
+            timings.append((label, (time.perf_counter() - t) * 1000))
+            errors += [f"{label}: {e.value}" for e in at.exception]
+    return at, timings, errors
+
+
+def percentiles(ms):
+    return np.percentile(ms, 50), np.percentile(ms, 95), max(ms)
+
+
+def worker(seeds, iterations, timeout, out):
+    out.put([run_session(seed, iterations, timeout)[1:] for seed in seeds])
+
+
+def latency_phase(sessions, workers, iterations, timeout):
+    ctx = multiprocessing.get_context("fork")
+    out = ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(list(range(sessions))[w::workers], iterations, timeout, out)) for w in range(min(workers, sessions))]
+    t = time.perf_counter()
+    for p in procs: p.start()
+    results = [r for _ in procs for r in out.get()]
+    wall = time.perf_counter() - t
+    for p in procs: p.join()
+    timings = [row for session_timings, _ in results for row in session_timings]
+    errors = [e for _, session_errors in results for e in session_errors]
+    return timings, errors, wall
+
+
+def memory_phase(sessions, timeout):
+    # Live sessions are kept alive, so (current - baseline) / sessions is what each one holds
+    run_session(-1, 1, timeout)  # warm process-wide caches first
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    alive = [run_session(1000 + s, 1, timeout)[0] for s in range(sessions)]
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_session = (current - baseline) / max(1, len(alive))
+    return per_session, peak - baseline
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent AppTest load test for the CCK Command Center")
+    parser.add_argument("--sessions", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=2, help="scenario passes per session")
+    parser.add_argument("--memory-sessions", type=int, default=4, help="sessions measured under tracemalloc (0 to skip)")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--p95-budget-ms", type=float, default=None, help="exit non-zero when overall p95 exceeds this")
+    args = parser.parse_args()
+
+    timings, errors, wall = latency_phase(args.sessions, args.workers, args.iterations, args.timeout)
+    print(f"{args.sessions} sessions x {args.iterations} passes on {args.workers} workers: {len(timings)} reruns in {wall:.1f}s ({len(timings) / wall:.1f} reruns/s)")
+    print(f"{'step':<20} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    by_step = {}
+    for label, ms in timings: by_step.setdefault(label, []).append(ms)
+    for label, ms in by_step.items():
+        print(f"{label:<20} {len(ms):>5} {percentiles(ms)[0]:>9.1f} {percentiles(ms)[1]:>9.1f} {percentiles(ms)[2]:>9.1f}")
+    p50, p95, worst = percentiles([ms for label, ms in timings if label != "login"])
+    print(f"{'all reruns':<20} {len(timings) - args.sessions:>5} {p50:>9.1f} {p95:>9.1f} {worst:>9.1f}")
+
+    if args.memory_sessions:
+        per_session, peak = memory_phase(args.memory_sessions, args.timeout)
+        print(f"memory: {per_session / 1024:,.0f} KiB per live session (tracemalloc, {args.memory_sessions} sessions), peak +{peak / 1024 / 1024:,.1f} MiB")
+
+    if errors:
+        print(f"{len(errors)} script errors, first: {errors[0]}")
+    if errors or (args.p95_budget_ms and p95 > args.p95_budget_ms):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import functools
+import os
+
+# --- LOGO ---
+# One logo for the screen and the PDF. Looked up next to this file, not in the working directory,
+# so the batch CLI finds it when run from anywhere; None falls back to the text mark.
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+LOGO_NAMES = ("CCK_Logo.png", "logo.png")
+
+
+@functools.lru_cache(maxsize=1)
+def logo_path():
+    return next((path for path in (os.path.join(APP_DIR, name) for name in LOGO_NAMES) if os.path.exists(path)), None)
+
+
+@functools.lru_cache(maxsize=1)
+def logo_bytes():
+    # Read once per process
+    path = logo_path()
+    if path is None: return None
+    with open(path, "rb") as f: return f.read()
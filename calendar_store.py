@@ -0,0 +1,270 @@
+import bisect
+import calendar as _calendar
+import datetime
+import hashlib
+import itertools
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing
+
+# --- CALENDAR EVENT STORE ---
+# One-off events sit in a date-sorted index, so a week or month is a bisect range lookup.
+# Recurring events are expanded for the requested range only: plain DAILY / WEEKLY / MONTHLY rules
+# arithmetically, anything with BYDAY, BYMONTHDAY, BYSETPOS etc. through dateutil, minus EXDATEs and
+# plus RDATEs. Imports and exports .ics through the `ics` package; an event whose rule can't be
+# expanded is left out and reported rather than imported wrong. Imported events are written to a
+# SQLite file when the store has a path, so they survive restarts.
+TIMEZONE = "US/Eastern"
+ICS_TZID = "America/New_York"  # the IANA name calendar clients expect for TIMEZONE
+FREQS = ("DAILY", "WEEKLY", "MONTHLY")  # expanded without dateutil when the rule has no BY* parts
+SIMPLE_PARTS = {"FREQ", "INTERVAL", "UNTIL", "COUNT", "WKST"}
+SUB_DAILY = ("HOURLY", "MINUTELY", "SECONDLY")
+EVENT_TYPES = ("product", "operational", "entertainment", "major-event")
+
+
+def _parse_time(text):
+    for fmt in ("%I:%M %p", "%I %p", "%H:%M"):
+        try: return datetime.datetime.strptime(text.strip(), fmt).time()
+        except ValueError: pass
+    return None
+
+
+def _format_time(t):
+    return t.strftime("%I:%M %p").lstrip("0") if t else ""
+
+
+class CalendarEvent:
+    def __init__(self, title, date, start=None, end=None, type="operational", rrule=None, uid=None):
+        self.title, self.date, self.type = title, date, type
+        self.start, self.end = start, end
+        # {"freq": "WEEKLY", "interval": 1, "until": date | None, "count": int | None}, plus for imported events
+        # "rule": the RRULE text when it needs dateutil, and "exdates" / "rdates": [date]
+        self.rrule = rrule
+        self.uid = uid or hashlib.sha1(f"{title}|{date}|{start}".encode()).hexdigest()[:16] + "@cck"
+        self._rule = None  # parsed dateutil rule, built on first use
+
+    @property
+    def time_label(self):
+        if self.start and self.end: return f"{_format_time(self.start)} - {_format_time(self.end)}"
+        return _format_time(self.start) or "All Day"
+
+    def occurrences(self, first, last):
+        # Dates of this event within [first, last]
+        if not self.rrule:
+            if first <= self.date <= last: yield self.date
+            return
+        days = self._expanded(first, last) if self.rrule.get("rule") else self._arithmetic(first, last)
+        rdates = [d for d in self.rrule.get("rdates") or () if first <= d <= last]
+        if rdates: days = sorted(set(days).union(rdates))
+        skip = set(self.rrule.get("exdates") or ())
+        for day in days:
+            if day not in skip: yield day
+
+    def _expanded(self, first, last):
+        if self._rule is None:
+            from dateutil.rrule import rrulestr
+            self._rule = rrulestr(self.rrule["rule"], dtstart=datetime.datetime.combine(self.date, self.start or datetime.time.min), ignoretz=True)
+        hits = self._rule.between(datetime.datetime.combine(first, datetime.time.min), datetime.datetime.combine(last, datetime.time.max), inc=True)
+        return sorted({dt.date() for dt in hits})
+
+    def _arithmetic(self, first, last):
+        freq, interval = self.rrule["freq"], max(1, int(self.rrule.get("interval") or 1))
+        until, count = self.rrule.get("until"), self.rrule.get("count")
+        last = min(last, until) if until else last
+        if freq == "MONTHLY":
+            # Months too short for the day (e.g. the 31st) are skipped and don't count toward COUNT
+            emitted = 0
+            for n in itertools.count(0, interval):
+                y, m = divmod(self.date.month - 1 + n, 12)
+                y, m = self.date.year + y, m + 1
+                if datetime.date(y, m, 1) > last: return
+                if self.date.day <= _calendar.monthrange(y, m)[1]:
+                    emitted += 1
+                    if count and emitted > count: return
+                    day = datetime.date(y, m, self.date.day)
+                    if first <= day <= last: yield day
+            return
+        step = interval * (7 if freq == "WEEKLY" else 1)
+        # Jump straight to the first occurrence on or after `first`
+        k = max(0, -(-(first - self.date).days // step))
+        if count: last = min(last, self.date + datetime.timedelta(days=step * (count - 1)))
+        day = self.date + datetime.timedelta(days=step * k)
+        while day <= last:
+            yield day
+            day += datetime.timedelta(days=step)
+
+
+def _event_row(ev):
+    return (ev.uid, ev.title, ev.date.isoformat(), ev.start.isoformat() if ev.start else None,
+            ev.end.isoformat() if ev.end else None, ev.type, json.dumps(ev.rrule, default=datetime.date.isoformat))
+
+
+def _row_event(uid, title, date, start, end, type, rrule):
+    rrule = json.loads(rrule)
+    if rrule:
+        if rrule.get("until"): rrule["until"] = datetime.date.fromisoformat(rrule["until"])
+        for key in ("exdates", "rdates"):
+            if rrule.get(key): rrule[key] = [datetime.date.fromisoformat(d) for d in rrule[key]]
+    return CalendarEvent(title, datetime.date.fromisoformat(date), datetime.time.fromisoformat(start) if start else None,
+                         datetime.time.fromisoformat(end) if end else None, type, rrule, uid)
+
+
+class EventStore:
+    def __init__(self, events=(), path=None):
+        # events: the standing schedule (not persisted); path: SQLite file for imported events
+        self._lock = threading.Lock()
+        self._dates, self._single, self._recurring, self._uids = [], [], [], set()
+        self.path = path
+        for ev in events: self.add(ev, persist=False)
+        for ev in self._saved(): self.add(ev, persist=False)
+
+    def _db(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=10)
+        db.execute("""CREATE TABLE IF NOT EXISTS events (uid TEXT PRIMARY KEY, title TEXT, date TEXT, start TEXT,
+                      "end" TEXT, type TEXT, rrule TEXT)""")
+        return db
+
+    def _saved(self):
+        if not self.path: return []
+        with closing(self._db()) as db:
+            return [_row_event(*row) for row in db.execute('SELECT uid, title, date, start, "end", type, rrule FROM events')]
+
+    def add(self, event, persist=True):
+        # Returns False for an event that's already in the store (same UID)
+        with self._lock:
+            if event.uid in self._uids: return False
+            if persist and self.path:
+                with closing(self._db()) as db, db: db.execute("INSERT OR IGNORE INTO events VALUES (?, ?, ?, ?, ?, ?, ?)", _event_row(event))
+            self._uids.add(event.uid)
+            if event.rrule:
+                self._recurring.append(event)
+            else:
+                i = bisect.bisect_right(self._dates, event.date)
+                self._dates.insert(i, event.date)
+                self._single.insert(i, event)
+            return True
+
+    def __len__(self):
+        return len(self._single) + len(self._recurring)
+
+    def between(self, first, last):
+        # {date: [events sorted by start time]} for every day in [first, last]
+        days = {first + datetime.timedelta(days=i): [] for i in range((last - first).days + 1)}
+        with self._lock:
+            lo, hi = bisect.bisect_left(self._dates, first), bisect.bisect_right(self._dates, last)
+            for ev in self._single[lo:hi]: days[ev.date].append(ev)
+            for ev in self._recurring:
+                for day in ev.occurrences(first, last): days[day].append(ev)
+        for evs in days.values(): evs.sort(key=lambda e: e.start or datetime.time.min)
+        return days
+
+    def week(self, any_day):
+        monday = any_day - datetime.timedelta(days=any_day.weekday())
+        return self.between(monday, monday + datetime.timedelta(days=6))
+
+    def month(self, year, month):
+        # Full Monday-to-Sunday weeks covering the month
+        first = datetime.date(year, month, 1)
+        last = datetime.date(year, month, _calendar.monthrange(year, month)[1])
+        return self.between(first - datetime.timedelta(days=first.weekday()), last + datetime.timedelta(days=6 - last.weekday()))
+
+    # --- ICS IMPORT / EXPORT ---
+    def to_ics(self):
+        import ics
+        from ics.grammar.parse import ContentLine
+
+        cal = ics.Calendar()
+        with self._lock: events = self._single + self._recurring
+        for ev in events:
+            ie = ics.Event(name=ev.title, uid=ev.uid)
+            if ev.start:
+                # Wall-clock times with a TZID, so a standing 9 AM stays 9 AM across DST in other calendars
+                for name, t in (("DTSTART", ev.start), ("DTEND", ev.end)):
+                    if t: ie.extra.append(ContentLine(name=name, params={"TZID": [ICS_TZID]},
+                                                      value=f"{datetime.datetime.combine(ev.date, t):%Y%m%dT%H%M%S}"))
+            else:
+                ie.begin = ev.date.isoformat(); ie.make_all_day()
+            ie.categories = {ev.type}
+            if ev.rrule:
+                rule = ev.rrule.get("rule") or f"FREQ={ev.rrule['freq']};INTERVAL={ev.rrule.get('interval') or 1}"
+                if not ev.rrule.get("rule"):
+                    if ev.rrule.get("until"): rule += f";UNTIL={ev.rrule['until']:%Y%m%d}"
+                    if ev.rrule.get("count"): rule += f";COUNT={ev.rrule['count']}"
+                ie.extra.append(ContentLine(name="RRULE", value=rule))
+                for name in ("EXDATE", "RDATE"):
+                    for d in ev.rrule.get(name.lower() + "s") or ():
+                        if ev.start: ie.extra.append(ContentLine(name=name, params={"TZID": [ICS_TZID]}, value=f"{datetime.datetime.combine(d, ev.start):%Y%m%dT%H%M%S}"))
+                        else: ie.extra.append(ContentLine(name=name, params={"VALUE": ["DATE"]}, value=f"{d:%Y%m%d}"))
+            cal.events.add(ie)
+        return cal.serialize()
+
+    def import_ics(self, text):
+        # -> (events added, [(title, reason)] for events left out). Raises if the file isn't a calendar.
+        import ics
+
+        added, rejected = 0, []
+        for ie in ics.Calendar(text).events:
+            begin = ie.begin if ie.all_day else ie.begin.to(TIMEZONE)
+            start = None if ie.all_day else begin.time()
+            end = ie.end.to(TIMEZONE).time() if ie.has_end() and not ie.all_day and ie.end != ie.begin else None
+            ev_type = next((c for c in ie.categories if c in EVENT_TYPES), "operational")
+            event = CalendarEvent(ie.name or "Untitled", begin.date(), start, end, ev_type, None, ie.uid)
+            try:
+                event.rrule = _parse_rrule(ie)
+                if event.rrule and event.rrule.get("rule"): event._expanded(event.date, event.date)  # parse it now
+            except (ValueError, TypeError, OverflowError) as e:
+                rejected.append((event.title, f"unsupported repeat rule ({e})"))
+                continue
+            added += self.add(event)
+        return added, rejected
+
+
+def _ics_dates(ie, name):
+    # EXDATE / RDATE values -> local dates; UTC and TZID times are converted to TIMEZONE
+    import arrow
+    from dateutil import tz as dateutil_tz
+
+    dates = set()
+    for line in (l for l in ie.extra if l.name == name):
+        if line.params.get("VALUE") == ["PERIOD"]: raise ValueError(f"{name} periods")
+        # A TZID dateutil doesn't know (e.g. Outlook's "Eastern Standard Time") is read as local time
+        tz = dateutil_tz.gettz((line.params.get("TZID") or [TIMEZONE])[0]) or dateutil_tz.gettz(TIMEZONE)
+        for value in filter(None, (v.strip() for v in line.value.split(","))):
+            if len(value) == 8:
+                dates.add(datetime.datetime.strptime(value, "%Y%m%d").date())
+            else:
+                moment = datetime.datetime.strptime(value[:15], "%Y%m%dT%H%M%S")
+                dates.add(arrow.get(moment, tzinfo="UTC" if value.endswith("Z") else tz).to(TIMEZONE).date())
+    return sorted(dates)
+
+
+def _parse_rrule(ie):
+    # Raises ValueError for rules the store can't expand
+    line = next((l for l in ie.extra if l.name == "RRULE"), None)
+    if line is None: return None
+    parts = dict(p.split("=", 1) for p in line.value.upper().split(";") if "=" in p)
+    freq = parts.get("FREQ")
+    if not freq: raise ValueError("no FREQ")
+    if freq in SUB_DAILY: raise ValueError(f"repeats {freq.lower()}")
+    until = parts.get("UNTIL")
+    rrule = {
+        "freq": freq, "interval": int(parts.get("INTERVAL", 1)),
+        "until": datetime.datetime.strptime(until[:8], "%Y%m%d").date() if until else None,
+        "count": int(parts["COUNT"]) if "COUNT" in parts else None,
+    }
+    # Anything past FREQ / INTERVAL / UNTIL / COUNT (BYDAY, BYMONTHDAY, BYSETPOS, YEARLY...) goes to dateutil
+    if freq not in FREQS or not set(parts) <= SIMPLE_PARTS: rrule["rule"] = line.value
+    exdates, rdates = _ics_dates(ie, "EXDATE"), _ics_dates(ie, "RDATE")
+    if exdates: rrule["exdates"] = exdates
+    if rdates: rrule["rdates"] = rdates
+    return rrule
+
+
+def weekly(title, weekday, time_text, type, anchor=datetime.date(2026, 1, 5)):
+    # Standing weekly event; anchor is a Monday, weekday 0 = Monday
+    start, _, end = time_text.partition(" - ")
+    return CalendarEvent(title, anchor + datetime.timedelta(days=weekday), _parse_time(start), _parse_time(end) if end else None,
+                         type, {"freq": "WEEKLY", "interval": 1, "until": None, "count": None})
@@ -0,0 +1,93 @@
+import functools
+import hashlib
+import json
+import os
+import sys
+import threading
+import weakref
+
+import numpy as np
+
+# --- INGREDIENT / RECIPE CATALOG ---
+# Loaded once per process from a versioned JSON file and shared by every session. Names are
+# interned and mapped to dense integer IDs; costs, prices and ounces live in flat NumPy arrays,
+# with each recipe's ingredient lines addressed by CSR offsets (recipe r owns lines
+# offsets[r]:offsets[r + 1] of line_ingredients / line_ounces).
+CATALOG_VERSION = 1
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", f"catalog_v{CATALOG_VERSION}.json")
+
+
+class Catalog:
+    def __init__(self, spec, fingerprint=""):
+        if spec.get("version") != CATALOG_VERSION:
+            raise ValueError(f"catalog version {spec.get('version')!r}, expected {CATALOG_VERSION}")
+        self.fingerprint = fingerprint
+        # Package, beverage, tax and card-fee rates that differ from quote_engine's house rates
+        self.pricing = spec.get("pricing", {})
+
+        self.ingredients = tuple(sys.intern(name.strip()) for name in spec["ingredients"])
+        self.ing_index = {name: i for i, name in enumerate(self.ingredients)}
+        self.unit_costs = np.fromiter(spec["ingredients"].values(), dtype=float, count=len(self.ingredients))
+        # Costs are per ounce unless the ingredient is counted ("each"), e.g. dough balls
+        units = {k.strip(): v for k, v in spec.get("units", {}).items()}
+        self.units = tuple(units.get(name, "oz") for name in self.ingredients)
+
+        # Menu order first, then any recipe that has no retail price yet
+        menu = spec["menu"]
+        self.menu = tuple(sys.intern(name) for name in menu)
+        self.recipes = self.menu + tuple(sys.intern(r) for r in spec["recipes"] if r not in menu)
+        self.recipe_index = {name: i for i, name in enumerate(self.recipes)}
+        self.prices = np.array([menu.get(r, np.nan) for r in self.recipes], dtype=float)
+
+        # Lines naming an ingredient the catalog doesn't list are dropped, i.e. they cost $0
+        lines = [[(self.ing_index[i.strip()], oz) for i, oz in spec["recipes"].get(r, {}).items() if i.strip() in self.ing_index]
+                 for r in self.recipes]
+        self.offsets = np.zeros(len(self.recipes) + 1, dtype=np.int32)
+        np.cumsum([len(l) for l in lines], out=self.offsets[1:])
+        flat = [line for l in lines for line in l]
+        self.line_ingredients = np.array([i for i, _ in flat], dtype=np.int32)
+        self.line_ounces = np.array([oz for _, oz in flat], dtype=float)
+
+    def ids(self, names):
+        # Unknown names map to -1
+        return np.array([self.ing_index.get(n, -1) for n in names], dtype=np.int32)
+
+    def cost(self, quantities):
+        # {ingredient: units} -> total cost; unknown ingredients cost $0
+        ids, qty = self.ids(quantities), np.fromiter(quantities.values(), dtype=float, count=len(quantities))
+        known = ids >= 0
+        return float(qty[known] @ self.unit_costs[ids[known]])
+
+    def recipe_lines(self, recipe):
+        r = self.recipe_index[recipe]
+        lo, hi = self.offsets[r], self.offsets[r + 1]
+        return self.line_ingredients[lo:hi], self.line_ounces[lo:hi]
+
+    def ounce_matrix(self):
+        # Dense recipes x ingredients ounces (repeated lines add up)
+        m = np.zeros((len(self.recipes), len(self.ingredients)))
+        rows = np.repeat(np.arange(len(self.recipes)), np.diff(self.offsets))
+        np.add.at(m, (rows, self.line_ingredients), self.line_ounces)
+        return m
+
+
+def load_catalog(path=CATALOG_PATH):
+    with open(path, "rb") as f:
+        raw = f.read()
+    return Catalog(json.loads(raw), hashlib.sha1(raw).hexdigest())
+
+
+# Identical catalog files (e.g. two locations on the same menu) resolve to one shared Catalog
+_shared = weakref.WeakValueDictionary()
+_shared_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=8)
+def _load_cached(path, mtime):
+    catalog = load_catalog(path)
+    with _shared_lock: return _shared.setdefault(catalog.fingerprint, catalog)
+
+
+def get_catalog(path=CATALOG_PATH):
+    # One stat per call; an edited catalog file is picked up without a restart
+    return _load_cached(path, os.path.getmtime(path))
@@ -0,0 +1,165 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+
+import pandas as pd
+
+from sheets import SNAPSHOT_DIR, append_rows, get_connection, get_mirror, normalize_header
+
+# --- WRITE-BEHIND EXPENSE QUEUE ---
+# A Log Expense submit is one local SQLite insert. A background worker drains the journal into the
+# Expenses worksheet in batched appends, backing off when Google refuses. Every entry carries an
+# idempotency key: a double submit is ignored locally, and before every append the worker checks the
+# sheet's "Entry ID" column, so an append that landed before a failure or a restart isn't written
+# twice. The worksheet must have that column; without it nothing is sent and stats() says why.
+JOURNAL_DB = os.path.join(SNAPSHOT_DIR, "expense_journal.sqlite")
+WORKSHEET = "Expenses"
+BATCH_SIZE, LINGER = 200, 2.0
+KEY_COLUMN = "entry id"
+
+
+def new_entry_key():
+    return uuid.uuid4().hex
+
+
+class MissingKeyColumn(Exception):
+    pass
+
+
+def _backoff(attempts):
+    return min(300.0, 5.0 * 2 ** (attempts - 1))
+
+
+class ExpenseQueue:
+    def __init__(self, db_path=JOURNAL_DB, worksheet=WORKSHEET, conn=None, mirror=None):
+        self.db_path, self.worksheet, self.conn = db_path, worksheet, conn
+        self.mirror = mirror or get_mirror(None, worksheet)
+        self.error = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._worker = None
+        with closing(self._db()) as db, db:
+            db.execute("""CREATE TABLE IF NOT EXISTS journal (
+                key TEXT PRIMARY KEY, row TEXT NOT NULL, created REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0, next_try REAL NOT NULL DEFAULT 0, flushed_at REAL)""")
+            db.execute("CREATE INDEX IF NOT EXISTS journal_pending ON journal (flushed_at, next_try)")
+
+    def _db(self):
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        db = sqlite3.connect(self.db_path, timeout=10)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def enqueue(self, row, key=None):
+        # row: {"Date": ..., "Item": ..., "Cost": ..., ...} in sheet header spelling.
+        # Returns False when this key is already journaled.
+        key = key or new_entry_key()
+        with self._lock, closing(self._db()) as db, db:
+            added = db.execute("INSERT OR IGNORE INTO journal (key, row, created) VALUES (?, ?, ?)",
+                               (key, json.dumps(row, default=str), time.time())).rowcount
+        self.start()
+        self._wake.set()
+        return bool(added)
+
+    def pending(self):
+        # Unflushed entries as a frame with normalized headers, for read-through
+        with self._lock, closing(self._db()) as db:
+            rows = db.execute("SELECT key, row FROM journal WHERE flushed_at IS NULL ORDER BY created").fetchall()
+        df = pd.DataFrame([{**json.loads(row), "Entry ID": key} for key, row in rows])
+        df.columns = normalize_header(df.columns)
+        return df
+
+    def stats(self):
+        with self._lock, closing(self._db()) as db:
+            pending, failing = db.execute("SELECT COUNT(*), COALESCE(SUM(attempts > 0), 0) FROM journal WHERE flushed_at IS NULL").fetchone()
+        return {"pending": pending, "failing": failing, "error": self.error}
+
+    # --- BACKGROUND FLUSH ---
+    def start(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(timeout=30)
+            self._wake.clear()
+            # Let a burst of submits pile up so they go out as one append
+            time.sleep(LINGER)
+            while self.flush() == BATCH_SIZE: pass
+
+    def _due(self):
+        with self._lock, closing(self._db()) as db:
+            return db.execute("SELECT key, row, attempts FROM journal WHERE flushed_at IS NULL AND next_try <= ? ORDER BY created LIMIT ?",
+                              (time.time(), BATCH_SIZE)).fetchall()
+
+    def _mark(self, keys, flushed=None, attempts=None):
+        with self._lock, closing(self._db()) as db, db:
+            if flushed:
+                db.executemany("UPDATE journal SET flushed_at = ? WHERE key = ?", [(flushed, k) for k in keys])
+            else:
+                db.executemany("UPDATE journal SET attempts = ?, next_try = ? WHERE key = ?",
+                               [(a + 1, time.time() + _backoff(a + 1), k) for k, a in zip(keys, attempts)])
+
+    def flush(self):
+        due = self._due()
+        if not due: return 0
+        conn = self.conn or get_connection()
+        try:
+            # One tail read: the sheet's header order, and which keys already landed (a retry after a
+            # failed append, or an append that went out just before the process died)
+            self.mirror.refresh(conn)
+            header = self.mirror.header
+            if KEY_COLUMN not in normalize_header(header):
+                raise MissingKeyColumn(f"the {self.worksheet} sheet needs an 'Entry ID' column before entries can be sent")
+            landed = set(self.mirror.data[KEY_COLUMN].dropna().astype(str)) if KEY_COLUMN in self.mirror.data.columns else set()
+            done = [k for k, _, _ in due if k in landed]
+            if done: self._mark(done, flushed=time.time())
+            due = [d for d in due if d[0] not in landed]
+            rows = []
+            for key, row, _ in due:
+                values = {str(k).strip().lower(): v for k, v in json.loads(row).items()}
+                values[KEY_COLUMN] = key
+                rows.append({h: values.get(str(h).strip().lower(), "") for h in header})
+            if rows: append_rows(conn, self.worksheet, rows)
+        except Exception as e:
+            self.error = e
+            self._mark([k for k, _, _ in due], attempts=[a for _, _, a in due])
+            return 0
+        self.error = None
+        self._mark([k for k, _, _ in due], flushed=time.time())
+        self.mirror.invalidate()
+        return len(due)
+
+    def split(self, sync=True):
+        # (mirrored sheet rows, journal rows not on the sheet yet); sync=False serves the mirror as is
+        synced, queued = self.mirror.get(self.conn) if sync else self.mirror.peek(), self.pending()
+        if not queued.empty and KEY_COLUMN in synced.columns:
+            queued = queued[~queued[KEY_COLUMN].isin(synced[KEY_COLUMN].astype(str))]
+        return synced, queued
+
+    def expenses(self):
+        # Read-through: the mirrored sheet plus anything still waiting in the journal
+        synced, queued = self.split()
+        return synced if queued.empty else pd.concat([synced, queued], ignore_index=True)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue():
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            try: conn = get_connection()
+            except Exception: conn = None
+            _queue = ExpenseQueue(conn=conn)
+            _queue.start()
+        return _queue
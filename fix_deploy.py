@@ -31,7 +31,12 @@ new_code = """import streamlit as st
 import pandas as pd
 import plotly.express as px
 from datetime import datetime
-from streamlit_gsheets import GSheetsConnection
+from ledger import build_ledger
+from sheets import fetch_all, get_mirror
+from expense_queue import MissingKeyColumn, get_queue, new_entry_key
+from profiling import finish_rerun, profiled, start_rerun
+from analytics import GRAINS, get_rollups
+from memo import memo
 
 # --- CONFIG & STYLE ---
 st.set_page_config(page_title="Custom Crust HQ", layout="wide", page_icon="🍕")
@@ -43,28 +48,47 @@ st.markdown(\"\"\"
 \"\"\", unsafe_allow_html=True)
 
 # --- DATA LOADING ---
-def clean_currency(value):
-    if pd.isna(value) or value == "": return 0.0
-    if isinstance(value, (int, float)): return float(value)
-    s = str(value).replace('$', '').replace(',', '').strip()
-    try: return float(s) if s else 0.0
-    except: return 0.0
+SHEET_TIMEOUTS = {"Assets": 6.0, "Expenses": 8.0}
 
+@profiled("load_data")
 def load_data():
-    try:
-        conn = st.connection("gsheets", type=GSheetsConnection)
-        assets = conn.read(worksheet="Assets", ttl=0).to_dict('records')
-        expenses = conn.read(worksheet="Expenses", ttl=0).to_dict('records')
-        # Normalize keys to lowercase
-        assets = [{k.strip().lower(): v for k, v in row.items()} for row in assets]
-        expenses = [{k.strip().lower(): v for k, v in row.items()} for row in expenses]
-        return assets, expenses
-    except:
-        return [], []
+    # Both sheets sync in parallel from their local SQLite mirrors (only rows appended since the last
+    # sync are fetched). Expenses read through the write-behind queue so unsent entries show up right
+    # away. A sheet that fails or times out falls back to its last mirrored rows; errors say which.
+    mirrors = {name: get_mirror(None, name) for name in SHEET_TIMEOUTS}
+    data, errors = fetch_all({"Assets": mirrors["Assets"].get, "Expenses": lambda: get_queue().expenses()},
+                             timeout=SHEET_TIMEOUTS, fallbacks={name: m.peek for name, m in mirrors.items()})
+    for name, m in mirrors.items():
+        if m.error is not None: errors.setdefault(name, m.error)
+    return data["Assets"], data["Expenses"], errors
+
+@profiled("rollups")
+def load_rollups():
+    # Folds only the mirror rows synced since the last rerun (a full mirror reload rebuilds); queued
+    # entries are laid over a per-rerun view, since they'll arrive through the mirror once flushed
+    synced, queued = get_queue().split(sync=False)
+    rollups = get_rollups()
+    rollups.update(synced, generation=get_mirror(None, "Expenses").full_at)
+    return rollups.snapshot(queued)
+
+@memo(max_entries=32)
+def category_pie(cat_items):
+    df = pd.DataFrame(list(cat_items), columns=['Category', 'Cost'])
+    return px.pie(df, values='Cost', names='Category', hole=0.4)
+
+@memo(max_entries=64)
+def trend_chart(trend):
+    long = trend.rename_axis("Period").reset_index().melt(id_vars="Period", var_name="Series", value_name="Cost")
+    return px.bar(long, x="Period", y="Cost", color="Series")
+
+def sheet_warning(errors, *names):
+    for name in names:
+        if name in errors: st.warning(f"⚠️ {name} sheet unavailable ({errors[name]}). Showing the last synced data.")
 
 # --- MAIN APP ---
 def main():
-    assets, expenses = load_data()
+    start_rerun("dashboard")
+    assets, expenses, errors = load_data()
     
     st.sidebar.title("🍕 Custom Crust HQ")
     menu = st.sidebar.radio("Navigate", ["📊 Dashboard", "📝 Log Expenses", "📅 Planner", "🧾 Invoices", "🏦 Assets"])
@@ -72,31 +96,13 @@ def main():
     # --- DASHBOARD ---
     if menu == "📊 Dashboard":
         st.title("🚀 Business Command Center")
+        sheet_warning(errors, "Assets", "Expenses")
         
-        liquid = 0.0
-        live_balances = {}
-        for a in assets:
-            atype = str(a.get('type', '')).lower()
-            if any(x in atype for x in ['liquid', 'bank', 'cash']):
-                name = a.get('account name') or a.get('name') or 'Unknown'
-                bal = clean_currency(a.get('balance', 0))
-                live_balances[name] = bal
-                liquid += bal
-
-        total_exp = 0.0
-        cat_data = {}
-        for e in expenses:
-            cost = clean_currency(e.get('cost', 0))
-            if cost > 0:
-                total_exp += cost
-                c = e.get('category', 'Other')
-                cat_data[c] = cat_data.get(c, 0) + cost
-                # Deduct from bank
-                method = str(e.get('payment method', '')).lower()
-                for bank in live_balances:
-                    if bank.lower() in method:
-                        live_balances[bank] -= cost
-                        liquid -= cost
+        # Every figure below reads the pre-aggregated rollups, never the raw expense rows
+        rollups = load_rollups()
+        ledger = build_ledger(assets, rollups.compact())
+        liquid, live_balances = ledger["liquid"], ledger["live_balances"]
+        total_exp, cat_data = ledger["total_exp"], ledger["cat_data"]
 
         c1, c2, c3 = st.columns(3)
         c1.metric("💰 Cash Available", f"${liquid:,.2f}")
@@ -107,18 +113,35 @@ def main():
         with col1:
             st.subheader("Expenses by Category")
             if cat_data:
-                df = pd.DataFrame(list(cat_data.items()), columns=['Category', 'Cost'])
-                fig = px.pie(df, values='Cost', names='Category', hole=0.4)
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(category_pie(tuple(sorted(cat_data.items()))), use_container_width=True)
             else: st.info("No data yet.")
         
         with col2:
             st.subheader("Live Balances")
             st.dataframe(live_balances)
 
+        st.subheader("Spending Trends")
+        t1, t2, t3 = st.columns(3)
+        grain = t1.radio("Period", list(GRAINS), index=1, horizontal=True, key="trend_grain")
+        dim = t2.radio("Split by", ["category", "account"], format_func=str.title, horizontal=True, key="trend_dim")
+        span = t3.selectbox("Show", ["Last 12", "Last 52", "All"], key="trend_span")
+        if cat_data:
+            trend = rollups.trend(grain, dim, None if span == "All" else int(span.split()[1]))
+            st.plotly_chart(trend_chart(trend), use_container_width=True)
+
+            compare, current, previous = rollups.compare(grain, dim)
+            label = {"Daily": "Today", "Weekly": "This Week", "Monthly": "This Month"}[grain]
+            st.caption(f"{label} (from {current:%b %d, %Y}) vs. the {grain.lower()} period before (from {previous:%b %d, %Y})")
+            m1, m2 = st.columns(2)
+            now_total, prev_total = compare["Current"].sum(), compare["Previous"].sum()
+            m1.metric(label, f"${now_total:,.2f}", f"${now_total - prev_total:,.2f}", delta_color="inverse")
+            m2.metric("Previous", f"${prev_total:,.2f}")
+            st.dataframe(compare.style.format({"Current": "${:,.2f}", "Previous": "${:,.2f}", "Change": "${:+,.2f}", "Change %": "{:+.1f}%"}, na_rep="—"), use_container_width=True)
+
     # --- LOG EXPENSES ---
     elif menu == "📝 Log Expenses":
         st.title("📝 Log Expense")
+        sheet_warning(errors, "Assets")
         with st.form("entry"):
             c1, c2 = st.columns(2)
             item = c1.text_input("Item")
@@ -126,12 +149,22 @@ def main():
             c3, c4 = st.columns(2)
             cat = c3.selectbox("Category", ["Inventory", "Labor", "Rent", "Other"])
             
-            banks = ["Cash"] + [a.get('account name') for a in assets if 'account name' in a]
+            banks = ["Cash"] + (assets['account name'].dropna().tolist() if 'account name' in assets.columns else [])
             pay = c4.selectbox("Payment Method", banks)
             
             if st.form_submit_button("Save"):
+                # One idempotency key per entry; it only rotates once the journal has taken the row
+                key = st.session_state.setdefault("expense_key", new_entry_key())
+                row = {"Date": datetime.now().strftime("%Y-%m-%d"), "Item": item, "Cost": cost, "Category": cat, "Payment Method": pay}
+                get_queue().enqueue(row, key=key)
+                st.session_state.expense_key = new_entry_key()
                 st.success(f"Saved: {item} (${cost})")
 
+        stats = get_queue().stats()
+        if stats["pending"]:
+            st.caption(f"⏳ {stats['pending']} expense(s) queued for Google Sheets" + (" (retrying)" if stats["failing"] else ""))
+        if isinstance(stats["error"], MissingKeyColumn): st.error(f"Expenses are not being sent: {stats['error']}.")
+
     # --- PLANNER ---
     elif menu == "📅 Planner":
         st.title("📅 Event Planner")
@@ -149,8 +182,11 @@ def main():
     # --- ASSETS ---
     elif menu == "🏦 Assets":
         st.title("🏦 Asset Viewer")
+        sheet_warning(errors, "Assets")
         st.dataframe(assets)
 
+    finish_rerun(menu)
+
 if __name__ == "__main__":
     main()
 """
@@ -0,0 +1,87 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from quote_engine import engine_for
+
+# --- INVENTORY PLANNER ---
+# Turns quoted events into a purchase order. Each event's pies are spread over its selected menu
+# items (or, when none are picked, the pizzas its package covers), giving an events x recipes mix; one matrix
+# multiply with the catalog's recipes x ingredients ounces yields every event's ingredient demand.
+# Demand for the delivery window is compared with on-hand stock to size the US Foods order.
+KIDS_PREFIX = "Kids"
+DELIVERY_TITLE = "US Foods"
+DELIVERY_WEEKDAY = 1  # Tuesday, when the calendar has no delivery on it
+OZ_PER_LB = 16.0
+
+
+def _mark(catalog, names_per_event):
+    # one list of menu names per event -> events x recipes 0/1 matrix
+    marks = np.zeros((len(names_per_event), len(catalog.recipes)))
+    picks = pd.Series(list(names_per_event), dtype=object).explode().map(catalog.recipe_index).dropna()
+    marks[picks.index.to_numpy(dtype=int), picks.to_numpy(dtype=int)] = 1.0
+    return marks
+
+
+def mix_matrix(catalog, pizzas, adult_pies, kid_pies, adult_tiers=None):
+    # pizzas: one list of menu names per event -> pies of each recipe per event (events x recipes)
+    n = len(pizzas)
+    priced = ~np.isnan(catalog.prices)
+    kids = np.array([r.startswith(KIDS_PREFIX) for r in catalog.recipes]) & priced
+    chosen = _mark(catalog, pizzas)
+    # House mix when nothing is picked: the adult pizzas the event's package covers (the whole menu if
+    # it isn't limited, or if none of its pizzas are on this catalog), and every kids pizza
+    adult = priced & ~kids
+    tiers = list(adult_tiers) if adult_tiers is not None else [None] * n
+    house = _mark(catalog, [engine_for(catalog).covered_pizzas(t) or () for t in tiers]) * adult
+    house[house.sum(axis=1) == 0] = adult
+
+    mix = np.zeros_like(chosen)
+    for group, pies, default in ((adult, adult_pies, house), (kids, kid_pies, np.broadcast_to(kids, chosen.shape))):
+        if not group.any(): continue
+        weights = chosen * group
+        unpicked = weights.sum(axis=1) == 0
+        weights[unpicked] = default[unpicked]
+        mix += weights / weights.sum(axis=1, keepdims=True) * np.asarray(pies, dtype=float)[:, None]
+    return mix
+
+
+def event_demand(catalog, events):
+    # events: rows as produced by batch_quotes.normalize_events -> ingredient demand per event
+    if not len(events): return np.zeros((0, len(catalog.ingredients)))
+    q = engine_for(catalog).quote(events["adults"].to_numpy(), events["kids"].to_numpy(), events["adult_tier"].to_numpy())
+    mix = mix_matrix(catalog, events["selected_pizzas"], q["adult_pies"], q["kid_pies"], events["adult_tier"])
+    return mix @ catalog.ounce_matrix()
+
+
+def delivery_window(store, today):
+    # [next delivery, the one after) from the calendar's US Foods entries, else the next two Tuesdays
+    days = store.between(today, today + datetime.timedelta(days=21))
+    dates = [d for d, evs in days.items() if any(DELIVERY_TITLE.lower() in e.title.lower() for e in evs)]
+    if len(dates) < 2:
+        first = today + datetime.timedelta(days=(DELIVERY_WEEKDAY - today.weekday()) % 7)
+        dates = [first, first + datetime.timedelta(days=7)]
+    return dates[0], dates[1]
+
+
+def in_window(events, start, end, include_undated=True):
+    dates = pd.to_datetime(events["event_date"], errors="coerce", format="mixed").dt.normalize()
+    inside = (dates >= pd.Timestamp(start)) & (dates < pd.Timestamp(end))
+    return events[inside | (dates.isna() & include_undated)] if len(events) else events
+
+
+def order_list(catalog, demand, on_hand=None, safety_pct=0.0):
+    # demand: per-ingredient totals (ounces, or counts for "each" items); on_hand: {ingredient: qty}
+    on_hand = np.array([(on_hand or {}).get(name, 0.0) for name in catalog.ingredients], dtype=float)
+    par = demand * (1 + safety_pct / 100.0)
+    short = np.maximum(par - on_hand, 0.0)
+    each = np.array([u == "each" for u in catalog.units])
+    order_qty = np.where(each, np.ceil(short), np.ceil(short / OZ_PER_LB))
+    df = pd.DataFrame({
+        "Ingredient": catalog.ingredients, "Unit": catalog.units,
+        "Demand": demand, "On Hand": on_hand, "Par": par,
+        "Order Qty": order_qty, "Order Unit": np.where(each, "each", "lb"),
+        "Est. Cost": np.where(each, order_qty, order_qty * OZ_PER_LB) * catalog.unit_costs,
+    })
+    return df[(df["Demand"] > 0) | (df["On Hand"] > 0)].reset_index(drop=True)
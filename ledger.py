@@ -0,0 +1,64 @@
+import pandas as pd
+
+# --- EXPENSE / BALANCE LEDGER ---
+# Column-wise replacement for the per-cell clean_currency loop and the expenses x accounts
+# substring scan in the dashboard. Payment methods are matched against accounts once per
+# distinct method string, then every total comes out of a groupby.
+LIQUID_TYPES = ("liquid", "bank", "cash")
+
+
+def normalize_columns(df):
+    return df.rename(columns=lambda c: str(c).strip().lower())
+
+
+def parse_currency(values):
+    # "$1,234.50" / 1234.5 / "" / NaN -> float, 0.0 when unparseable
+    s = pd.Series(values)
+    numeric = pd.to_numeric(s, errors="coerce")
+    text = s.astype("string").str.replace(r"[$,\s]", "", regex=True)
+    return numeric.fillna(pd.to_numeric(text, errors="coerce")).fillna(0.0).astype(float)
+
+
+def _col(df, name, default):
+    return df[name] if name in df.columns else pd.Series(default, index=df.index)
+
+
+def account_balances(assets):
+    if assets.empty: return pd.DataFrame({"account": pd.Series(dtype=str), "balance": pd.Series(dtype=float)})
+    atype = _col(assets, "type", "").astype("string").fillna("").str.lower()
+    liquid = assets[atype.str.contains("|".join(LIQUID_TYPES), regex=True)]
+    blank = lambda c: _col(liquid, c, None).replace("", None)
+    names = blank("account name").fillna(blank("name")).fillna("Unknown").astype(str)
+    return pd.DataFrame({"account": names.to_numpy(), "balance": parse_currency(_col(liquid, "balance", 0)).to_numpy()})
+
+
+def method_lookup(methods, accounts):
+    # distinct lowercased payment method -> accounts whose name appears in it
+    lowered = [(a, a.lower()) for a in accounts]
+    return {m: [a for a, al in lowered if al in m] for m in methods}
+
+
+def build_ledger(assets, expenses):
+    accounts = account_balances(assets)
+    # Later rows win for a repeated account name, but every row counts toward cash on hand
+    live_balances = accounts.groupby("account", sort=False)["balance"].last()
+    liquid = accounts["balance"].sum()
+
+    if expenses.empty:
+        return {"liquid": liquid, "live_balances": live_balances.to_dict(), "total_exp": 0.0, "cat_data": {}}
+
+    cost = parse_currency(_col(expenses, "cost", 0))
+    paid = expenses.assign(cost=cost.to_numpy())[cost.to_numpy() > 0]
+    category = _col(paid, "category", "Other").fillna("Other")
+    cat_data = paid["cost"].groupby(category, sort=False).sum()
+
+    methods = _col(paid, "payment method", "").astype("string").fillna("").str.lower()
+    lookup = method_lookup(methods.unique(), live_balances.index)
+    charged = pd.DataFrame({"account": methods.map(lookup).to_numpy(), "cost": paid["cost"].to_numpy()}).explode("account").dropna()
+    deductions = charged.groupby("account")["cost"].sum()
+    live_balances = live_balances.sub(deductions, fill_value=0.0).reindex(live_balances.index)
+
+    return {
+        "liquid": liquid - deductions.sum(), "live_balances": live_balances.to_dict(),
+        "total_exp": paid["cost"].sum(), "cat_data": cat_data.to_dict(),
+    }
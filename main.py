@@ -1,452 +1,471 @@
-let me give you my code then you fix it and give it back to me to paste. 
-
 import streamlit as st
-import pandas as pd
-import math
+import functools
+import io
 import os
 import datetime
-from streamlit_gsheets import GSheetsConnection
-from fpdf import FPDF  
 
-import arrow
+# Only what the PIN gate needs; the heavy modules are imported after sign-in (section 3)
+import warmup
+from branding import logo_bytes
+from memo import memo, register as register_dependency, stats as memo_stats
+from profiling import finish_rerun, profiled, recent as recent_timings, start_rerun, timed
+from templates import QUICK_LINKS_HTML, calendar_html, page_style_html, quote_html, vault_html
+from tenants import SESSION_KEY as TENANT_KEY, authenticate, current as current_tenant, locations
 
 # --- 1. CONFIGURATION & SECURITY ---
 st.set_page_config(page_title="CCK Command Center", layout="wide", page_icon="🍕")
-SHEET_URL = "https://docs.google.com/spreadsheets/d/1yqbd35J140KWT7ui8Ggqn68_OfGXb1wofViJRcSgZBU/edit"
+start_rerun()
+# First run in this process: import and prime everything in the background while the gate renders
+warmup.start()
+VAULT_PAGE_SIZES = [24, 48, 96]
 
-# *** YOUR MASTER PIN CODE ***
-ACCESS_PIN = "CCK2026!"
+# Locations, their PINs, sheets and catalogs: data/tenants.json (tenants.py)
+# Optional admin PIN (env CCK_ADMIN_PIN); unlocks the app plus the performance panel
+ADMIN_PIN = os.environ.get("CCK_ADMIN_PIN")
 
 # --- 2. LUXURY CSS (Matching the CCK Website) ---
-st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Montserrat:wght@300;400;600&family=Playfair+Display:ital,wght@0,400;0,600;1,400&display=swap');
-
-    .stApp {
-        background-color: #121212;
-        font-family: 'Montserrat', sans-serif;
-        color: #f5f5f5;
-    }
-    
-    /* Hide Streamlit junk */
-    section[data-testid="stSidebar"], [data-testid="stHeaderAction"] {display: none !important;}
-    .block-container {padding-top: 2rem; padding-bottom: 5rem;}
-    
-    /* Typography */
-    h1, h2, h3 {font-family: 'Playfair Display', serif; color: #c5a059;}
-    h4, h5, p, label {font-family: 'Montserrat', sans-serif; color: #e6edf3;}
-    
-    /* Tabs */
-    .stTabs [data-baseweb="tab-list"] {justify-content: center; gap: 30px; border-bottom: 1px solid rgba(197, 160, 89, 0.2);}
-    .stTabs [data-baseweb="tab"] {background-color: transparent; color: #b0b0b0; font-weight: 600; font-size: 1.1rem;}
-    .stTabs [aria-selected="true"] {color: #c5a059 !important; border-bottom: 2px solid #c5a059 !important;}
-    
-    /* Quick Links Container */
-    .quick-links-container {
-        display: flex; justify-content: center; align-items: center;
-        gap: 30px; padding-bottom: 30px; border-bottom: 1px solid rgba(197, 160, 89, 0.2);
-        margin-bottom: 30px; margin-top: -10px; flex-wrap: wrap;
-    }
-    .quick-link-card {
-        background-color: #1a1a1a; border: 1px solid rgba(197, 160, 89, 0.3);
-        border-radius: 8px; padding: 15px 30px; text-align: center;
-        text-decoration: none; color: #f5f5f5; font-weight: 600; letter-spacing: 1px;
-        transition: all 0.3s ease; display: flex; flex-direction: column; align-items: center; gap: 10px;
-        min-width: 160px;
-    }
-    .quick-link-card:hover {
-        transform: translateY(-4px); border-color: #c5a059; color: #c5a059;
-        box-shadow: 0 4px 15px rgba(197, 160, 89, 0.15);
-    }
-    
-    /* The Vault Grid */
-    .vault-grid {
-        display: grid; grid-template-columns: repeat(auto-fill, minmax(220px, 1fr)); gap: 20px; padding-top: 20px;
-    }
-    .doc-card {
-        background-color: #1a1a1a; border: 1px solid #333; border-radius: 8px;
-        padding: 30px 20px; text-align: center; text-decoration: none; color: #f5f5f5;
-        transition: all 0.3s ease; display: flex; flex-direction: column; align-items: center; gap: 15px;
-    }
-    .doc-card:hover {
-        border-color: #c5a059; transform: translateY(-3px); background-color: #1e1e1e;
-    }
-    .doc-card svg {fill: none; stroke: #c5a059; width: 45px; height: 45px; stroke-width: 1.5;}
-    .doc-title {font-family: 'Montserrat', sans-serif; font-weight: 600; font-size: 1rem; color: #f5f5f5;}
-    
-    /* Sleek Quoter UI & Login */
-    .quote-box, .login-box {
-        background-color: #1a1a1a; border: 1px solid rgba(197, 160, 89, 0.3);
-        border-radius: 8px; padding: 30px; margin-bottom: 20px;
-    }
-    .login-box {max-width: 400px; margin: 100px auto; text-align: center;}
-    .quote-header {font-family: 'Playfair Display', serif; font-size: 1.8rem; color: #c5a059; border-bottom: 1px solid #333; padding-bottom: 10px; margin-bottom: 20px;}
-    .quote-row {display: flex; justify-content: space-between; margin-bottom: 12px; font-size: 1.1rem; color: #e6edf3;}
-    .quote-row.total {font-weight: bold; font-size: 1.5rem; color: #c5a059; border-top: 1px solid #333; padding-top: 15px; margin-top: 15px;}
-    .quote-row.profit {color: #238636; font-weight: 600; font-size: 1.2rem;}
-    
-    /* Form Elements */
-    div[data-testid="stForm"] {background-color: #1a1a1a; border: 1px solid #333;}
-    .stDataFrame {border: 1px solid rgba(197, 160, 89, 0.3) !important; border-radius: 8px !important;}
-    </style>
-""", unsafe_allow_html=True)
+# Lives in static/app.css; see templates.page_style_html
+with timed("css"): st.markdown(page_style_html(), unsafe_allow_html=True)
 
 # --- SECURITY GATE ---
 if "authenticated" not in st.session_state:
-    st.session_state.authenticated = False
+    st.session_state.authenticated = False
 
 if not st.session_state.authenticated:
-    st.markdown("""
-        <div class="login-box">
-            <h2 style="margin-bottom: 10px;">Restricted Access</h2>
-            <p style="color: #b0b0b0; font-size: 0.9rem; margin-bottom: 30px;">Custom Crust Kitchen Internal Portal</p>
-        </div>
-    """, unsafe_allow_html=True)
-    
-    col1, col2, col3 = st.columns([1, 1, 1])
-    with col2:
-        pin_input = st.text_input("Enter PIN", type="password", placeholder="••••••••")
-        if st.button("Unlock Command Center", use_container_width=True):
-            if pin_input == ACCESS_PIN:
-                st.session_state.authenticated = True
-                st.rerun()
-            else:
-                st.error("Invalid PIN. Access Denied.")
-    st.stop()
-
-# --- 3. HARDCODED MASTER DATA ENGINE ---
-ingredients_data = pd.DataFrame([
-    ["10\" Dough Ball", 0.95], ["12\" Dough Ball", 1.25], ["14\" Dough Ball", 1.85],
-    ["House Pizza Sauce", 0.04], ["Buffalo Sauce", 0.13], ["Mike's Hot Honey", 0.61],
-    ["Grande Mozzarella", 0.23], ["Fresh Mozzarella", 0.38], ["Ricotta Cheese", 0.28],
-    ["Blue Cheese Crumbles", 0.25],
-    ["Premium Sliced Pepperoni", 0.36], ["Fontanini Sausage", 0.37], ["Candied Bacon", 0.25],
-    ["Diced Ham", 0.22], ["Diced Chicken", 0.28], 
-    ["Fresh Tomatoes", 0.09], ["Green Peppers", 0.05], ["Onion", 0.02],
-    ["Black Olives", 0.06], ["Sliced Garlic", 0.19], ["Drained Pineapple", 0.05]
-], columns=["Ingredient", "Cost"])
-
-ing_dict = {row['Ingredient'].strip(): float(row['Cost']) for index, row in ingredients_data.iterrows()}
-
-recipes_data = pd.DataFrame([
-    ["The Plain Jane", "14\" Dough Ball", 1], ["The Plain Jane", "House Pizza Sauce", 8], ["The Plain Jane", "Grande Mozzarella", 13],
-    ["The Premium Pepperoni", "14\" Dough Ball", 1], ["The Premium Pepperoni", "House Pizza Sauce", 8], ["The Premium Pepperoni", "Grande Mozzarella", 12], ["The Premium Pepperoni", "Premium Sliced Pepperoni", 4.5],
-    ["The Carnivore", "14\" Dough Ball", 1], ["The Carnivore", "House Pizza Sauce", 7], ["The Carnivore", "Grande Mozzarella", 10], ["The Carnivore", "Premium Sliced Pepperoni", 3], ["The Carnivore", "Fontanini Sausage", 4], ["The Carnivore", "Candied Bacon", 3], ["The Carnivore", "Mike's Hot Honey", 1],
-    ["The Velvet Sting", "14\" Dough Ball", 1], ["The Velvet Sting", "House Pizza Sauce", 8], ["The Velvet Sting", "Grande Mozzarella", 10], ["The Velvet Sting", "Premium Sliced Pepperoni", 3], ["The Velvet Sting", "Ricotta Cheese", 3], ["The Velvet Sting", "Mike's Hot Honey", 1],
-    ["The Springfield Classic", "14\" Dough Ball", 1], ["The Springfield Classic", "House Pizza Sauce", 8], ["The Springfield Classic", "Grande Mozzarella", 8], ["The Springfield Classic", "Fresh Mozzarella", 4], ["The Springfield Classic", "Fresh Tomatoes", 3],
-    ["The Bianco Veggie", "14\" Dough Ball", 1], ["The Bianco Veggie", "Sliced Garlic", 1], ["The Bianco Veggie", "Grande Mozzarella", 8], ["The Bianco Veggie", "Ricotta Cheese", 5], ["The Bianco Veggie", "Green Peppers", 4], ["The Bianco Veggie", "Black Olives", 3],
-    ["The Buffalo Soldier", "14\" Dough Ball", 1], ["The Buffalo Soldier", "Buffalo Sauce", 5], ["The Buffalo Soldier", "Grande Mozzarella", 9], ["The Buffalo Soldier", "Diced Chicken", 7], ["The Buffalo Soldier", "Blue Cheese Crumbles", 2],
-    ["Custom (Standard Toppings)", "14\" Dough Ball", 1], ["Custom (Standard Toppings)", "House Pizza Sauce", 8], ["Custom (Standard Toppings)", "Grande Mozzarella", 12], ["Custom (Standard Toppings)", "Green Peppers", 3], ["Custom (Standard Toppings)", "Onion", 3],
-    ["Custom (Premium Toppings)", "14\" Dough Ball", 1], ["Custom (Premium Toppings)", "House Pizza Sauce", 8], ["Custom (Premium Toppings)", "Grande Mozzarella", 12], ["Custom (Premium Toppings)", "Premium Sliced Pepperoni", 3], ["Custom (Premium Toppings)", "Ricotta Cheese", 3],
-    ["Kids Cheese", "12\" Dough Ball", 1], ["Kids Cheese", "House Pizza Sauce", 4.5], ["Kids Cheese", "Grande Mozzarella", 7],
-    ["Kids Pepperoni", "12\" Dough Ball", 1], ["Kids Pepperoni", "House Pizza Sauce", 4.5], ["Kids Pepperoni", "Grande Mozzarella", 7], ["Kids Pepperoni", "Premium Sliced Pepperoni", 1.5],
-    ["Kids 2-Topping", "12\" Dough Ball", 1], ["Kids 2-Topping", "House Pizza Sauce", 4.5], ["Kids 2-Topping", "Grande Mozzarella", 7], ["Kids 2-Topping", "Green Peppers", 1], ["Kids 2-Topping", "Onion", 1]
-], columns=["Recipe", "Ingredient", "Ounces"])
-
-menu_prices = {
-    "The Plain Jane": 17.00, "The Premium Pepperoni": 23.00, "The Carnivore": 26.00, "The Velvet Sting": 24.00, 
-    "The Springfield Classic": 22.00, "The Bianco Veggie": 24.00, "The Buffalo Soldier": 24.00, "Custom (Standard Toppings)": 24.00,
-    "Custom (Premium Toppings)": 28.00, "Kids Cheese": 10.00, "Kids Pepperoni": 12.00, "Kids 2-Topping": 14.00
-}
+    st.markdown("""
+        <div class="login-box">
+            <h2 style="margin-bottom: 10px;">Restricted Access</h2>
+            <p style="color: #b0b0b0; font-size: 0.9rem; margin-bottom: 30px;">Custom Crust Kitchen Internal Portal</p>
+        </div>
+    """, unsafe_allow_html=True)
+    
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col2:
+        sites = locations()
+        site = st.selectbox("Location", list(sites), format_func=sites.get) if len(sites) > 1 else next(iter(sites))
+        pin_input = st.text_input("Enter PIN", type="password", placeholder="••••••••")
+        if st.button("Unlock Command Center", use_container_width=True):
+            if authenticate(site, pin_input) or (ADMIN_PIN and pin_input == ADMIN_PIN):
+                st.session_state.authenticated = True
+                st.session_state[TENANT_KEY] = site
+                st.session_state.is_admin = bool(ADMIN_PIN) and pin_input == ADMIN_PIN
+                st.rerun()
+            else:
+                st.error("Invalid PIN. Access Denied.")
+    st.stop()
+
+# --- 3. APP MODULES ---
+# Usually already imported by warmup.start(); altair, arrow and fpdf load inside the code that uses them
+import pandas as pd
+import numpy as np
+
+from batch_quotes import export_zip_bytes, normalize_events
+from inventory import delivery_window, event_demand, in_window, order_list
+from pizza_optimizer import pareto_builds
+from quote_engine import engine_for, pie_counts
+from recipe_engine import get_engine
+from sheets import prefetch
+
+# --- MASTER DATA ---
+# Ingredient costs, recipes, menu prices and package rates come from the location's catalog file
+# (catalog.py), loaded once per process and shared by every session at that location
+tenant = current_tenant()
+catalog = tenant.catalog
+pricing = engine_for(catalog)
 
 # --- 4. DATA HELPERS ---
-def load_gsheets():
-    try:
-        conn = st.connection("gsheets", type=GSheetsConnection)
-        return conn.read(spreadsheet=SHEET_URL, worksheet="Vault_Index", ttl=600)
-    except: 
-        return pd.DataFrame()
-
-# --- 5. PDF GENERATOR ---
-def generate_pdf_quote(client_name, event_date, event_address, event_desc, printable_items, event_fee, menu_ext_fee, gross_subtotal, discount_amount, discount_pct, tax_amount, cc_fee_amount, final_quote, adult_pies, kid_pies, adult_tier, adults, kids, selected_pizzas):
-    pdf = FPDF()
-    pdf.add_page()
-    gold, black, gray = (197, 160, 89), (30, 30, 30), (100, 100, 100)
-    
-    logo_path = "logo.png" if os.path.exists("logo.png") else ("CCK_Logo.png" if os.path.exists("CCK_Logo.png") else None)
-    if logo_path:
-        pdf.image(logo_path, x=(pdf.w - 30) / 2, y=10, w=30)
-        pdf.ln(35) 
-    else:
-        pdf.ln(15)
-        
-    pdf.set_font("Arial", 'B', 24); pdf.set_text_color(*gold); pdf.cell(0, 12, "CUSTOM CRUST KITCHEN", ln=True, align='C')
-    pdf.set_font("Arial", 'B', 12); pdf.set_text_color(*gray); pdf.cell(0, 8, "CATERING ESTIMATE", ln=True, align='C')
-    pdf.line(10, pdf.get_y() + 5, 200, pdf.get_y() + 5); pdf.ln(10)
-    
-    pdf.set_font("Arial", 'B', 12); pdf.set_text_color(*black); pdf.cell(0, 8, "EVENT DETAILS", ln=True)
-    pdf.set_font("Arial", '', 11); pdf.set_text_color(*gray)
-    pdf.cell(0, 6, f"Client: {client_name}", ln=True); pdf.cell(0, 6, f"Date: {event_date}", ln=True)
-    pdf.cell(0, 6, f"Headcount: {adults} Adults, {kids} Kids", ln=True)
-    pdf.cell(0, 6, f"Location: {event_address}", ln=True); pdf.cell(0, 6, f"Event Notes: {event_desc}", ln=True); pdf.ln(10)
-    
-    pdf.set_font("Arial", 'B', 14); pdf.set_text_color(*black); pdf.cell(0, 10, "ORDER SUMMARY", ln=True)
-    pdf.set_font("Arial", '', 12); pdf.set_text_color(*black)
-    for item in printable_items:
-        pdf.cell(140, 8, item["desc"], 0, 0); pdf.cell(50, 8, f"${item['total']:,.2f}", 0, 1, 'R')
-    pdf.ln(8)
-    
-    if len(printable_items) > 0:
-        pdf.set_font("Arial", 'B', 11); pdf.set_text_color(*black); pdf.cell(0, 8, "PACKAGE DETAILS & EXCLUSIONS:", ln=True)
-        pdf.set_font("Arial", '', 10); pdf.set_text_color(*gray)
-        if "Classic" in adult_tier: pdf.cell(0, 6, "- Classic Package Includes: The Plain Jane, The Premium Pepperoni, & The Bianco Veggie.", ln=True)
-        else: pdf.cell(0, 6, "- Premium Package Includes: Full Signature Pizza Menu.", ln=True)
-        
-        if len(selected_pizzas) > 0:
-            pdf.set_font("Arial", 'B', 10); pdf.set_text_color(*black)
-            pdf.cell(0, 6, "Selected Event Pizzas:", ln=True)
-            pdf.set_font("Arial", '', 10); pdf.set_text_color(*gray)
-            pizzas_str = ", ".join(selected_pizzas)
-            pdf.multi_cell(0, 6, f"- {pizzas_str}")
-            
-        pdf.cell(0, 6, "- Exclusions: Calzones are exclusively for retail service and are not included in catering.", ln=True); pdf.ln(8)
-    
-    pdf.set_font("Arial", 'B', 14); pdf.set_text_color(*black); pdf.cell(0, 10, "FINANCIALS", ln=True); pdf.set_font("Arial", '', 12)
-    pdf.cell(140, 8, "Food & Beverage Subtotal", 0, 0); pdf.cell(50, 8, f"${gross_subtotal:,.2f}", 0, 1, 'R')
-    if discount_amount > 0:
-        pdf.set_text_color(200, 50, 50); pdf.cell(140, 8, f"Discount ({discount_pct}%)", 0, 0); pdf.cell(50, 8, f"-${discount_amount:,.2f}", 0, 1, 'R'); pdf.set_text_color(*black)
-    pdf.cell(140, 8, "Setup / Travel Fee", 0, 0); pdf.cell(50, 8, f"${event_fee:,.2f}", 0, 1, 'R')
-    if menu_ext_fee > 0:
-        pdf.cell(140, 8, "Menu Extension Fee", 0, 0); pdf.cell(50, 8, f"${menu_ext_fee:,.2f}", 0, 1, 'R')
-    if tax_amount > 0: pdf.cell(140, 8, "MA Meals Tax (7.0%)", 0, 0); pdf.cell(50, 8, f"${tax_amount:,.2f}", 0, 1, 'R')
-    if cc_fee_amount > 0: pdf.cell(140, 8, "Credit Card Fee (2.29%)", 0, 0); pdf.cell(50, 8, f"${cc_fee_amount:,.2f}", 0, 1, 'R')
-    pdf.line(10, pdf.get_y() + 2, 200, pdf.get_y() + 2); pdf.ln(5)
-    
-    pdf.set_font("Arial", 'B', 16); pdf.set_text_color(*gold)
-    pdf.cell(140, 10, "ESTIMATED TOTAL", 0, 0); pdf.cell(50, 10, f"${final_quote:,.2f}", 0, 1, 'R')
-    
-    pdf.ln(25); pdf.set_font("Arial", 'I', 10); pdf.set_text_color(*gray)
-    pdf.multi_cell(0, 6, "Thank you for choosing Custom Crust Kitchen! This document is an estimate to give you an accurate idea of costs. Final pricing may adjust based on exact headcount, menu alterations, or specific event requirements.", align='C')
-    try: return bytes(pdf.output()) 
-    except: return pdf.output(dest='S').encode('latin-1') 
+# Derived values are memoized (memo.py); anything computed from the catalog is keyed on its fingerprint
+register_dependency("catalog", lambda: current_tenant().catalog.fingerprint)
+
+@memo(deps=("catalog",))
+def cached_quote(*args):
+    return engine_for(current_tenant().catalog).price(*args)
+
+@memo(deps=("catalog",))
+def builder_cost(items):
+    return current_tenant().catalog.cost(dict(items))
+
+@memo(deps=("catalog",), max_entries=256)
+def optimized_builds(fixed, ranges, price, target_margin):
+    return pareto_builds(current_tenant().catalog, dict(fixed), dict(ranges), price, target_margin)
+
+@memo(deps=("catalog",), scope="session", max_entries=8)
+def menu_reprice(price_sheet_bytes):
+    # Per session: the supplier sheet is this user's upload
+    engine = get_engine(current_tenant().catalog)
+    return engine.reprice(engine.cost_vector(pd.read_csv(io.BytesIO(price_sheet_bytes))) if price_sheet_bytes else engine.unit_costs)
+
+@memo(deps=("catalog",))
+def shock_sweep(pct):
+    sweep_df = get_engine(current_tenant().catalog).sweep_frame(pct)
+    return sweep_df[(sweep_df != 0).any(axis=1)]
+
+@memo(deps=("catalog",))
+def sensitivity_frame(adults_lo, adults_hi, max_discount, **fixed):
+    engine = engine_for(current_tenant().catalog)
+    return pd.DataFrame(engine.sensitivity_grid(np.arange(adults_lo, adults_hi + 1, 5), list(engine.adult_tiers), np.arange(0, max_discount + 1, 5), **fixed))
+
+@memo(deps=("catalog",), scope="session", max_entries=16)
+def window_demand(events_bytes, quote_row, start, end, include_undated):
+    engine = engine_for(current_tenant().catalog)
+    rows, bad = normalize_events(pd.read_csv(io.BytesIO(events_bytes)), engine) if events_bytes else ([], [])
+    if quote_row: rows += normalize_events(pd.DataFrame([dict(quote_row)]), engine)[0]
+    events = in_window(pd.DataFrame(rows, columns=["client_name", "event_date", "adults", "kids", "adult_tier", "selected_pizzas"]), start, end, include_undated)
+    return len(events), event_demand(current_tenant().catalog, events).sum(axis=0), bad
+
+def bad_rows_warning(bad):
+    if bad: st.warning(f"⚠️ Skipped {len(bad)} row(s) that couldn't be read: " + "; ".join(f"line {line}: {problem}" for line, problem in bad[:10]) + (" …" if len(bad) > 10 else ""))
+
+def today_eastern():
+    try:
+        import arrow
+        return arrow.now('US/Eastern').date()
+    except: return datetime.date.today()
+
+@profiled("generate_pdf_quote")
+def pdf_quote(*args):
+    from quote_pdf import generate_pdf_quote
+    return generate_pdf_quote(*args)
+
+@profiled("load_gsheets")
+def load_gsheets(tenant):
+    return tenant.vault.get()
+
+# --- 5. TAB ROUTER ---
+def tab_router(labels):
+    try:
+        tabs = st.tabs(labels, key="active_tab", on_change="rerun")
+        return [(tab, tab.open) for tab in tabs]
+    except TypeError:
+        # Older Streamlit without lazy tabs: session_state-driven selector instead
+        active = st.radio("Section", labels, horizontal=True, key="active_tab", label_visibility="collapsed")
+        body = st.container()
+        return [(body, label == active) for label in labels]
+
+def lazy_expander(label, key):
+    # Expander whose body only runs while it's open (always runs on Streamlit without lazy expanders)
+    try:
+        exp = st.expander(label, key=key, on_change="rerun")
+        return exp, bool(exp.open)
+    except TypeError:
+        return st.expander(label), True
+
+def keep_widget_state(prefix):
+    # Streamlit drops state for widgets that aren't drawn in a run; re-pinning keeps hidden tab inputs
+    if not prefix: return
+    for k in [k for k in st.session_state if isinstance(k, str) and k.startswith(prefix)]:
+        st.session_state[k] = st.session_state[k]
+
+# --- TAB 1: CALENDAR ---
+def render_calendar():
+    st.write("##")
+    store = tenant.event_store
+    today = today_eastern()
+
+    c_view, c_prev, c_today, c_next = st.columns([3, 1, 1, 1])
+    view = c_view.radio("View", ["Week", "Month"], horizontal=True, key="calendar_view", label_visibility="collapsed")
+    st.session_state.setdefault("calendar_offset", 0)
+    if c_prev.button("◀ Prev", use_container_width=True): st.session_state.calendar_offset -= 1
+    if c_today.button("Today", use_container_width=True): st.session_state.calendar_offset = 0
+    if c_next.button("Next ▶", use_container_width=True): st.session_state.calendar_offset += 1
+    offset = st.session_state.calendar_offset
+
+    if view == "Week":
+        anchor = today + datetime.timedelta(weeks=offset)
+        days = store.week(anchor)
+        monday = min(days)
+        title = "Current Week" if offset == 0 else f"Week of {monday:%b} {monday.day}, {monday.year}"
+        in_range = lambda d: True
+    else:
+        y, m = divmod(today.month - 1 + offset, 12)
+        year, month = today.year + y, m + 1
+        days = store.month(year, month)
+        title = datetime.date(year, month, 1).strftime("%B %Y")
+        in_range = lambda d: d.month == month
+
+    st.markdown(f"<h3 style='text-align: center; color: #c5a059; margin-bottom: 0;'>{title}</h3>", unsafe_allow_html=True)
+    # NATIVE UI RENDER
+    cells = tuple((d.strftime("%a"), str(d.day), not in_range(d), tuple((e.title, e.time_label, e.type) for e in evs)) for d, evs in days.items())
+    st.markdown(calendar_html(cells, month_view=view == "Month"), unsafe_allow_html=True)
+
+    with st.expander("📆 Import / Export .ics"):
+        ics_file = st.file_uploader("Import Calendar (.ics)", type="ics", key="ics_upload")
+        if ics_file and st.session_state.get("ics_imported") != ics_file.file_id:
+            st.session_state.ics_imported = ics_file.file_id
+            try:
+                added, rejected = store.import_ics(ics_file.getvalue().decode("utf-8-sig"))
+            except Exception as e:
+                st.error(f"Couldn't read {ics_file.name} as a calendar: {e}")
+            else:
+                st.success(f"Imported {added} new events.")
+                if rejected:
+                    st.warning(f"⚠️ Left out {len(rejected)} event(s) whose repeat rule can't be shown correctly: "
+                               + "; ".join(f"{title}: {reason}" for title, reason in rejected[:10]) + (" …" if len(rejected) > 10 else ""))
+        st.download_button(label="📤 Export Calendar (.ics)", data=store.to_ics, file_name="CCK_Calendar.ics", mime="text/calendar", use_container_width=True)
+
+# --- TAB 2: EVENT QUOTER ---
+def render_quoter():
+    st.write("##")
+    c_in, c_out = st.columns([1, 1.5], gap="large")
+    with c_in:
+        st.markdown("<h3 style='margin-bottom: 20px;'>1. Event Details</h3>", unsafe_allow_html=True)
+        c_client1, c_client2 = st.columns(2)
+        client_name = c_client1.text_input("Client Name *", placeholder="e.g. Bruno Kreusch", key="quote_client_name")
+        event_date = c_client2.text_input("Event Date *", placeholder="e.g. June 18th", key="quote_event_date")
+        c_client3, c_client4 = st.columns(2)
+        event_address = c_client3.text_input("Event Address *", placeholder="e.g. 123 Main St, Saugus, MA", key="quote_event_address")
+        event_desc = c_client4.text_input("Event Notes/Type *", placeholder="e.g. Birthday Buffet in Driveway", key="quote_event_desc")
+
+        st.markdown("<h3 style='margin-bottom: 10px; margin-top: 20px;'>2. Guest Count & Logistics</h3>", unsafe_allow_html=True)
+        c_g, c_k, c_f = st.columns(3)
+        adults = c_g.number_input("Est. Adults", min_value=1, value=40, step=5, key="quote_adults")
+        kids = c_k.number_input("Est. Kids", min_value=0, value=10, step=5, key="quote_kids")
+        event_fee = c_f.number_input("Setup Fee ($)", min_value=0.0, value=150.0, step=25.0, key="quote_event_fee")
+        adult_pies, kid_pies = pie_counts(adults, kids)
+        st.info(f"💡 **Prep Guide:** You will need to prep ~**{adult_pies} adult pies** and **{kid_pies} kids pies**.")
+
+        st.markdown("<h3 style='margin-bottom: 10px; margin-top: 20px;'>3. Food Packages & Menu Selection</h3>", unsafe_allow_html=True)
+        c_food1, c_food2 = st.columns(2)
+        adult_tier = c_food1.selectbox("Adult Package", list(pricing.adult_tiers), key="quote_adult_tier")
+        kid_tier = c_food2.selectbox("Kids Package", [f"Standard (${pricing.kid_food_price:g}/head)"], key="quote_kid_tier")
+        selected_pizzas = st.multiselect("Select Event Pizzas (Will appear on contract)", list(catalog.menu), key="quote_selected_pizzas")
+
+        st.markdown("<h3 style='margin-bottom: 10px; margin-top: 20px;'>4. Beverages & Fees</h3>", unsafe_allow_html=True)
+        c_b1, c_b2 = st.columns(2)
+        add_adult_bevs = c_b1.checkbox(f"Adult Bev Package (${pricing.adult_bev_price:.2f}/adult)", value=True, key="quote_adult_bevs")
+        add_kid_bevs = c_b2.checkbox(f"Kids Bev Package (${pricing.kid_bev_price:.2f}/kid)", value=True, key="quote_kid_bevs")
+        c_t, c_d, c_c = st.columns(3)
+        apply_tax = c_t.checkbox(f"Add {pricing.tax_label}", value=True, key="quote_apply_tax")
+        apply_cc = c_c.checkbox("Add CC Fee", value=False, key="quote_apply_cc")
+        discount_pct = c_d.number_input("Discount (%)", value=0.0, step=5.0, key="quote_discount_pct")
+        menu_ext_fee = st.number_input("Menu Extension Fee ($)", min_value=0.0, value=0.0, step=25.0, key="quote_menu_ext_fee")
+
+    with c_out:
+        q = cached_quote(adults, kids, adult_tier, add_adult_bevs, add_kid_bevs, apply_tax, apply_cc, discount_pct, event_fee, menu_ext_fee)
+        printable_items = q["printable_items"]
+        gross_subtotal, discount_amount, tax_amount, cc_fee_amount = q["gross_subtotal"], q["discount_amount"], q["tax_amount"], q["cc_fee_amount"]
+        final_quote, profit, margin = q["final_quote"], q["profit"], q["margin"]
+
+        order_items = tuple((item["label"], item["total"]) for item in printable_items)
+        st.markdown(quote_html(order_items, gross_subtotal, discount_amount, event_fee, menu_ext_fee, apply_tax, tax_amount, apply_cc, cc_fee_amount, final_quote, profit, margin, pricing.tax_line, pricing.cc_fee_line), unsafe_allow_html=True)
+
+        if len(printable_items) > 0 and client_name and event_date and event_address:
+            # Rendered only when the button is clicked (and memoized in quote_pdf)
+            pdf_bytes = functools.partial(pdf_quote, client_name, event_date, event_address, event_desc, printable_items, event_fee, menu_ext_fee, gross_subtotal, discount_amount, discount_pct, tax_amount, cc_fee_amount, final_quote, adult_pies, kid_pies, adult_tier, adults, kids, selected_pizzas, pricing.covered_pizzas(adult_tier), pricing.tax_line, pricing.cc_fee_line)
+            st.download_button(label="📄 Download Official PDF", data=pdf_bytes, file_name=f"CCK_Estimate_{client_name}.pdf", mime="application/pdf", use_container_width=True)
+
+    with st.expander("📦 Batch Export (CSV of events → ZIP of estimates)"):
+        st.caption("Columns: client, date, address, notes, adults, kids, tier, adult_bevs, kid_bevs, tax, cc_fee, discount, setup_fee, menu_ext_fee, pizzas (separated by ;). Missing columns use the form defaults.")
+        batch_csv = st.file_uploader("Events CSV", type="csv", key="batch_csv")
+        if batch_csv:
+            batch_df = pd.read_csv(batch_csv)
+            batch_rows, bad = normalize_events(batch_df, pricing)
+            bad_rows_warning(bad)
+            st.download_button(label=f"🗜️ Download {len(batch_rows)} Estimates (ZIP)", data=functools.partial(export_zip_bytes, batch_df, engine=pricing), file_name="CCK_Estimates.zip", mime="application/zip", use_container_width=True)
+
+    sens_box, sens_open = lazy_expander("📈 Sensitivity Grid (headcount × package × discount)", key="sensitivity_open")
+    if sens_open:
+        with sens_box:
+            c_s1, c_s2, c_s3 = st.columns(3)
+            sens_lo, sens_hi = c_s1.slider("Adults Range", min_value=10, max_value=500, value=(10, 500), step=5, key="quote_sens_adults")
+            sens_disc = c_s2.slider("Max Discount (%)", min_value=0, max_value=50, value=25, step=5, key="quote_sens_discount")
+            sens_metric = c_s3.selectbox("Show", ["final_quote", "profit", "margin"], format_func=lambda m: {"final_quote": "Final Quote ($)", "profit": "Net Profit ($)", "margin": "Margin (%)"}[m], key="quote_sens_metric")
+            st.caption("Kids, beverages, tax, CC fee and fees are taken from the form above.")
+            grid = sensitivity_frame(sens_lo, sens_hi, sens_disc, kids=kids, add_adult_bevs=add_adult_bevs, add_kid_bevs=add_kid_bevs,
+                                     apply_tax=apply_tax, apply_cc=apply_cc, event_fee=event_fee, menu_ext_fee=menu_ext_fee)
+            import altair as alt
+            heatmap = alt.Chart(grid).mark_rect().encode(
+                x=alt.X("discount_pct:O", title="Discount (%)"), y=alt.Y("adults:O", title="Adults", sort="descending"),
+                color=alt.Color(f"{sens_metric}:Q", title=None, scale=alt.Scale(scheme="goldorange")),
+                tooltip=["adults", "adult_tier", "discount_pct", alt.Tooltip("final_quote", format="$,.2f"), alt.Tooltip("profit", format="$,.2f"), alt.Tooltip("margin", format=".1f")],
+            ).properties(width=220, height=max(200, 6 * grid["adults"].nunique())).facet(column=alt.Column("adult_tier:N", title=None))
+            st.altair_chart(heatmap)
+
+# --- TAB 3: PIZZA BUILDER ---
+CRUSTS = ["10\" Dough Ball", "12\" Dough Ball", "14\" Dough Ball"]
+SAUCES = ["None", "House Pizza Sauce", "Buffalo Sauce"]
+CHEESES = ["Grande Mozzarella", "Fresh Mozzarella", "Ricotta Cheese"]
+TOPPINGS = ["Premium Sliced Pepperoni", "Fontanini Sausage", "Candied Bacon", "Mike's Hot Honey"]
+
+def render_pizza_builder():
+    st.write("##")
+    mode = st.radio("Mode", ["Single Pie", "Optimizer"], horizontal=True, label_visibility="collapsed", key="builder_mode")
+    c1, c2 = st.columns([1.2, 1], gap="large")
+    with c1:
+        base = st.selectbox("Crust Base", CRUSTS, key="builder_base")
+        sauce = st.selectbox("Sauce", SAUCES, key="builder_sauce")
+        sauce_oz = st.number_input("Sauce Amount (oz)", value=8.0, step=0.5, key="builder_sauce_oz") if sauce != "None" else 0.0
+        fixed = {base: 1.0, **({sauce: sauce_oz} if sauce != "None" else {})}
+        target_margin = st.slider("Target Margin (%)", 50, 95, 80, key="builder_target_margin")
+        if mode == "Optimizer":
+            price = st.number_input("Retail Price ($)", value=float(catalog.prices[catalog.recipe_index["Custom (Premium Toppings)"]]), step=1.0, key="builder_price")
+            picks = st.multiselect("Candidate Cheeses & Toppings", CHEESES + TOPPINGS, default=["Grande Mozzarella"], key="builder_candidates")
+            # Ounce ranges per candidate; every move reruns the (memoized) search
+            ranges = {p: st.slider(f"{p} (oz)", 0.0, 16.0, (8.0, 14.0) if p in CHEESES else (0.0, 5.0), step=0.5, key=f"builder_range_{p}") for p in picks}
+        else:
+            cheeses = st.multiselect("Cheeses", CHEESES, key="builder_cheeses")
+            cheese_oz = {ch: st.number_input(f"{ch} (oz)", value=10.0, step=0.5, key=f"builder_oz_{ch}") for ch in cheeses}
+            toppings = st.multiselect("Toppings", TOPPINGS, key="builder_toppings")
+            topping_oz = {t: st.number_input(f"{t} (oz)", value=3.0, step=0.5, key=f"builder_oz_{t}") for t in toppings}
+    with c2:
+        if mode == "Optimizer":
+            builds, info = optimized_builds(tuple(fixed.items()), tuple(ranges.items()), price, target_margin)
+            st.markdown(f"""<div class="quote-box" style="margin-top: 20px;">
+<div class="quote-row"><span>Food Cost Budget ({target_margin}% margin)</span> <span>${info['budget']:.2f}</span></div>
+<div class="quote-row"><span>Crust &amp; Sauce</span> <span>${info['base_cost']:.2f}</span></div>
+<div class="quote-row total"><span>Pareto Builds</span> <span>{len(builds)} of {info['within_budget']:,} in budget ({info['searched']:,} searched)</span></div></div>""", unsafe_allow_html=True)
+            if builds.empty:
+                st.warning("No build fits the budget. Lower the minimums, raise the price or relax the margin.")
+            else:
+                import altair as alt
+                frontier = alt.Chart(builds).mark_line(point=True, color="#d4af37").encode(
+                    x=alt.X("Food Cost:Q", title="Food Cost ($)", scale=alt.Scale(zero=False)), y=alt.Y("Topping oz:Q", title="Cheese & Topping (oz)", scale=alt.Scale(zero=False)),
+                    tooltip=list(builds.columns))
+                st.altair_chart(frontier, use_container_width=True)
+        else:
+            total_cost = builder_cost(tuple({**fixed, **cheese_oz, **topping_oz}.items()))
+            st.markdown(f"""<div class="quote-box" style="margin-top: 20px;">
+<div class="quote-row"><span>Total Raw Food Cost</span> <span>${total_cost:.2f}</span></div>
+<div class="quote-row total" style="color: #238636;"><span>Suggested Price ({target_margin}% Margin)</span> <span>${total_cost / (1 - target_margin / 100) if total_cost > 0 else 0.0:.2f}</span></div></div>""", unsafe_allow_html=True)
+    if mode == "Optimizer" and not builds.empty:
+        money = {"Food Cost": "${:,.2f}", "Price @ Target": "${:,.2f}", "Margin %": "{:.1f}%"}
+        st.dataframe(builds.style.format(money), use_container_width=True, hide_index=True)
+
+# --- TAB 4: RECIPE MARGINS ---
+def render_recipe_margins():
+    st.write("##")
+    engine = get_engine(catalog)
+    margin_view = st.radio("View", ["Single Item", "Whole Menu"], horizontal=True, label_visibility="collapsed", key="margins_view")
+    if margin_view == "Single Item":
+        selected_pie = st.selectbox("Select Menu Item", list(catalog.menu), key="margins_selected_pie")
+        costed = engine.lookup(selected_pie)
+        cost, price = costed["cost"], costed["price"]
+
+        c1, c2, c3 = st.columns(3)
+        c1.markdown(f"<div class='quote-box' style='text-align:center;'><div>RETAIL PRICE</div><div style='font-size: 2rem;'>${price:,.2f}</div></div>", unsafe_allow_html=True)
+        c2.markdown(f"<div class='quote-box' style='text-align:center;'><div>FOOD COST</div><div style='font-size: 2rem; color: #da3633;'>${cost:,.2f}</div></div>", unsafe_allow_html=True)
+        c3.markdown(f"<div class='quote-box' style='text-align:center;'><div>PROFIT MARGIN</div><div style='font-size: 2rem; color: #238636;'>{costed['margin']:.1f}%</div></div>", unsafe_allow_html=True)
+    else:
+        price_sheet = st.file_uploader("Supplier Price Sheet (CSV: Ingredient, Cost)", type="csv")
+        menu_df = menu_reprice(price_sheet.getvalue() if price_sheet else b"")
+        st.dataframe(menu_df.set_index("Recipe").style.format({"Price": "${:,.2f}", "Food Cost": "${:,.2f}", "New Food Cost": "${:,.2f}", "Margin %": "{:.1f}%", "New Margin %": "{:.1f}%", "Margin Δ (pts)": "{:+.1f}"}), use_container_width=True)
+
+        st.markdown("<h3 style='margin-top: 20px;'>Price Shock Sweep</h3>", unsafe_allow_html=True)
+        shock_pct = st.slider("Shock Size (±%)", min_value=1, max_value=50, value=10, key="margins_shock_pct")
+        sweep_df = shock_sweep(shock_pct)
+        st.caption(f"Margin change (pts) on each menu item if one ingredient rises {shock_pct}%. A {shock_pct}% drop mirrors these values.")
+        st.dataframe(sweep_df.style.format("{:+.2f}"), use_container_width=True)
+
+# --- TAB 5: INVENTORY PLANNER ---
+def render_inventory():
+    st.write("##")
+    today = today_eastern()
+    start, end = delivery_window(tenant.event_store, today)
+    st.markdown(f"<h3 style='margin-bottom: 10px;'>Order for the {start:%a %b} {start.day} delivery</h3>", unsafe_allow_html=True)
+    st.caption(f"Covers events from {start:%b} {start.day} up to the next delivery on {end:%b} {end.day}.")
+
+    c_src, c_opt = st.columns([2, 1])
+    events_csv = c_src.file_uploader("Upcoming Events CSV (same columns as Batch Export)", type="csv", key="planner_csv")
+    with_quote = c_opt.checkbox("Include the Event Quoter's current quote", value=True, key="inventory_with_quote")
+    include_undated = c_opt.checkbox("Include events without a date", value=True, key="inventory_undated")
+    safety_pct = c_opt.slider("Safety Stock (%)", min_value=0, max_value=50, value=10, step=5, key="inventory_safety_pct")
+
+    ss = st.session_state
+    quote_row = (("client", ss.get("quote_client_name", "")), ("date", ss.get("quote_event_date", "")),
+                 ("adults", ss.get("quote_adults", 40)), ("kids", ss.get("quote_kids", 10)), ("tier", ss.get("quote_adult_tier", "Classic")),
+                 ("pizzas", ";".join(ss.get("quote_selected_pizzas", [])))) if with_quote else ()
+    n_events, demand, bad = window_demand(events_csv.getvalue() if events_csv else b"", quote_row, start, end, include_undated)
+    bad_rows_warning(bad)
+
+    st.markdown("<h3 style='margin-top: 20px;'>On-Hand Stock</h3>", unsafe_allow_html=True)
+    stock = pd.DataFrame({"Ingredient": catalog.ingredients, "Unit": catalog.units,
+                          "On Hand": [st.session_state.get("inventory_on_hand", {}).get(n, 0.0) for n in catalog.ingredients]})
+    stock = st.data_editor(stock, disabled=["Ingredient", "Unit"], hide_index=True, use_container_width=True)
+    st.session_state.inventory_on_hand = dict(zip(stock["Ingredient"], stock["On Hand"].fillna(0.0)))
+
+    orders = order_list(catalog, demand, st.session_state.inventory_on_hand, safety_pct)
+    st.markdown(f"<h3 style='margin-top: 20px;'>US Foods Order ({n_events} events)</h3>", unsafe_allow_html=True)
+    st.dataframe(orders.style.format({"Demand": "{:,.1f}", "On Hand": "{:,.1f}", "Par": "{:,.1f}", "Order Qty": "{:,.0f}", "Est. Cost": "${:,.2f}"}), hide_index=True, use_container_width=True)
+    to_order = orders[orders["Order Qty"] > 0]
+    c_total, c_dl = st.columns([2, 1])
+    c_total.metric("Estimated Order Cost", f"${to_order['Est. Cost'].sum():,.2f}")
+    c_dl.download_button("🧾 Download Order List (CSV)", data=to_order[["Ingredient", "Order Qty", "Order Unit"]].to_csv(index=False),
+                         file_name=f"CCK_USFoods_Order_{start:%Y-%m-%d}.csv", mime="text/csv", use_container_width=True)
+
+# --- TAB 6: THE VAULT ---
+def render_vault():
+    st.write("##")
+    vault_df = load_gsheets(tenant)
+    if vault_df.empty: return
+    index = tenant.vault_index(vault_df)
+    c_search, c_size = st.columns([4, 1])
+    query = c_search.text_input("Search documents", key="vault_query", placeholder="Search SOPs, invoices...", label_visibility="collapsed")
+    per_page = c_size.selectbox("Per page", VAULT_PAGE_SIZES, key="vault_per_page", label_visibility="collapsed")
+    hits = index.search(query)
+    pages = max(1, -(-len(hits) // per_page))
+    # A new search starts back on page 1
+    if st.session_state.get("vault_last_query") != query: st.session_state.vault_page = 1
+    st.session_state.vault_last_query = query
+    if st.session_state.get("vault_page", 1) > pages: st.session_state.vault_page = pages
+    st.markdown(vault_html(index.page(hits, st.session_state.get("vault_page", 1) - 1, per_page)), unsafe_allow_html=True)
+    c_info, c_page = st.columns([4, 1])
+    c_info.caption(f"{len(hits):,} of {len(index):,} documents")
+    if pages > 1: c_page.number_input("Page", 1, pages, key="vault_page", label_visibility="collapsed")
+
+# --- ADMIN: PERFORMANCE PANEL ---
+def render_admin_panel(record):
+    box, is_open = lazy_expander("🛠️ Admin · Performance", key="admin_panel_open")
+    if not is_open: return
+    with box:
+        st.session_state.profiling = st.toggle("Profile reruns (this session)", value=st.session_state.get("profiling", False))
+        if record:
+            st.caption(f"Last rerun: {record['total_ms']:,.1f} ms on {record['page'] or '—'}")
+            st.dataframe(pd.DataFrame(record["sections"]).assign(name=lambda d: ["  " * k + n for k, n in zip(d["depth"], d["name"])])[["name", "ms"]], hide_index=True, use_container_width=True)
+        history = recent_timings()
+        if not history.empty:
+            st.caption(f"Recent sections ({history['ts'].nunique()} reruns in logs/timings.jsonl)")
+            summary = history.groupby("name")["ms"].describe(percentiles=[0.5, 0.95])[["count", "50%", "95%", "max"]]
+            st.dataframe(summary.sort_values("95%", ascending=False).style.format("{:,.1f}"), use_container_width=True)
+        memo_df = pd.DataFrame(memo_stats()).T
+        if not memo_df.empty:
+            st.caption("Memo cache (process-wide)")
+            st.dataframe(memo_df.style.format({"hits": "{:,.0f}", "misses": "{:,.0f}", "hit_rate": "{:.0%}"}), use_container_width=True)
+
+TABS = [
+    ("📅 Calendar", render_calendar, "calendar_"),
+    ("🎫 Event Quoter", render_quoter, "quote_"),
+    ("🍕 Pizza Builder", render_pizza_builder, "builder_"),
+    ("📖 Recipe Margins", render_recipe_margins, "margins_"),
+    ("📦 Inventory", render_inventory, "inventory_"),
+    ("🗄️ The Vault", render_vault, "vault_"),
+]
 
 # --- 6. MAIN APP ---
 def main():
-    vault_df = load_gsheets()
-
-    c_left, c_logo, c_right = st.columns([5, 1, 5])
-    with c_logo:
-        if os.path.exists("CCK_Logo.png"): st.image("CCK_Logo.png", use_container_width=True)
-        elif os.path.exists("logo.png"): st.image("logo.png", use_container_width=True)
-        else: st.markdown("<h1 style='text-align: center; font-size: 3.5rem; margin-bottom: 0;'>CCK</h1>", unsafe_allow_html=True)
-            
-    st.markdown("<p style='text-align: center; color: #b0b0b0; letter-spacing: 2px; text-transform: uppercase; margin-bottom: 40px;'>Command Center</p>", unsafe_allow_html=True)
-
-    quick_links_html = """<div class="quick-links-container">
-<a href="https://www3.usfoods.com/order" target="_blank" class="quick-link-card"><svg width="35" height="35" viewBox="0 0 24 24" fill="none" stroke="#c5a059" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M21 16V8a2 2 0 0 0-1-1.73l-7-4a2 2 0 0 0-2 0l-7 4A2 2 0 0 0 3 8v8a2 2 0 0 0 1 1.73l7 4a2 2 0 0 0 2 0l7-4A2 2 0 0 0 21 16z"></path><polyline points="3.27 6.96 12 12.01 20.73 6.96"></polyline><line x1="12" y1="22.08" x2="12" y2="12"></line></svg>US Foods</a>
-<a href="https://qbo.intuit.com" target="_blank" class="quick-link-card"><svg width="35" height="35" viewBox="0 0 24 24" fill="none" stroke="#c5a059" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><rect x="2" y="3" width="20" height="14" rx="2" ry="2"></rect><line x1="8" y1="21" x2="16" y2="21"></line><line x1="12" y1="17" x2="12" y2="21"></line></svg>QuickBooks</a>
-</div>"""
-    st.markdown(quick_links_html, unsafe_allow_html=True)
-
-    tabs = st.tabs(["📅 Calendar", "🎫 Event Quoter", "🍕 Pizza Builder", "📖 Recipe Margins", "🗄️ The Vault"])
-
-    # --- TAB 1: CALENDAR ---
-    with tabs[0]:
-        st.write("##")
-        
-        st.markdown(f"<h3 style='text-align: center; color: #c5a059; margin-bottom: 0;'>Current Week</h3>", unsafe_allow_html=True)
-                
-        # --- HARDCODED SCHEDULE ---
-        try:
-            today = arrow.now('US/Eastern')
-            start_of_week = today.shift(days=-today.weekday()).floor('day')
-            
-            week_days = []
-            for i in range(7):
-                day_obj = start_of_week.shift(days=i)
-                week_days.append({
-                    "day_name": day_obj.format("ddd"),
-                    "day_num": day_obj.format("D")
-                })
-        except:
-            week_days = [
-                {"day_name": "Mon", "day_num": "8"}, {"day_name": "Tue", "day_num": "9"},
-                {"day_name": "Wed", "day_num": "10"}, {"day_name": "Thu", "day_num": "11"},
-                {"day_name": "Fri", "day_num": "12"}, {"day_name": "Sat", "day_num": "13"},
-                {"day_name": "Sun", "day_num": "14"},
-            ]
-
-        # Your exact events hardcoded securely
-        events = [
-            {"day": "Tue", "title": "US Foods Delivery", "time": "9:00 AM", "type": "product"},
-            {"day": "Wed", "title": "Adjust Gas Regulator", "time": "11:00 AM", "type": "operational"},
-            {"day": "Wed", "title": "Karaoke Session", "time": "7:00 PM", "type": "entertainment"},
-            {"day": "Thu", "title": "SOFT LUNCH OPENING", "time": "11:00 AM - 4:00 PM", "type": "major-event"},
-        ]
-
-        # NATIVE UI RENDER 
-        calendar_html = """
-        <style>
-        .weekly-calendar-grid { display: grid; grid-template-columns: repeat(7, 1fr); gap: 15px; margin-top: 10px;}
-        .calendar-day { background-color: #1a1a1a; border: 1px solid #333; border-radius: 6px; padding: 15px; min-height: 200px; display: flex; flex-direction: column;}
-        .calendar-day:hover { border-color: #c5a059; }
-        .day-header { font-size: 0.9rem; text-transform: uppercase; color: #b0b0b0; font-weight: 600; margin-bottom: 15px; display: flex; justify-content: space-between; align-items: center;}
-        .day-number { font-size: 1.4rem; color: #f5f5f5;}
-        .event-card { font-size: 0.8rem; padding: 10px; border-radius: 4px; font-weight: 600; margin-bottom: 8px; line-height: 1.4;}
-        .event-card .time { font-size: 0.7rem; font-weight: 400; color: rgba(255, 255, 255, 0.7); display: block; margin-top: 4px;}
-        .product { background-color: #2c3e50; border-left: 3px solid #3498db; }
-        .operational { background-color: #27ae60; border-left: 3px solid #2ecc71; }
-        .entertainment { background-color: #8e44ad; border-left: 3px solid #9b59b6; }
-        .major-event { background-color: rgba(197, 160, 89, 0.2); color: #c5a059; border-left: 3px solid #c5a059; }
-        </style>
-        
-        <div style="background-color: #121212; border: 1px solid rgba(197, 160, 89, 0.3); border-radius: 8px; padding: 30px;">
-        """
-        
-        calendar_html += '<div class="weekly-calendar-grid">'
-
-        for wd in week_days:
-            day_name = wd["day_name"]
-            day_num = wd["day_num"]
-            day_events = [e for e in events if e["day"] == day_name]
-            
-            calendar_html += f'<div class="calendar-day"><div class="day-header">{day_name} <span class="day-number">{day_num}</span></div>'
-            for ev in day_events:
-                calendar_html += f'<div class="event-card {ev["type"]}">{ev["title"]}<span class="time">{ev["time"]}</span></div>'
-            calendar_html += '</div>'
-            
-        calendar_html += '</div></div>'
-        st.markdown(calendar_html, unsafe_allow_html=True)
-
-    # --- TAB 2: EVENT QUOTER ---
-    with tabs[1]:
-        st.write("##")
-        c_in, c_out = st.columns([1, 1.5], gap="large")
-        with c_in:
-            st.markdown("<h3 style='margin-bottom: 20px;'>1. Event Details</h3>", unsafe_allow_html=True)
-            c_client1, c_client2 = st.columns(2)
-            client_name = c_client1.text_input("Client Name *", placeholder="e.g. Bruno Kreusch")
-            event_date = c_client2.text_input("Event Date *", placeholder="e.g. June 18th")
-            c_client3, c_client4 = st.columns(2)
-            event_address = c_client3.text_input("Event Address *", placeholder="e.g. 123 Main St, Saugus, MA")
-            event_desc = c_client4.text_input("Event Notes/Type *", placeholder="e.g. Birthday Buffet in Driveway")
-            
-            st.markdown("<h3 style='margin-bottom: 10px; margin-top: 20px;'>2. Guest Count & Logistics</h3>", unsafe_allow_html=True)
-            c_g, c_k, c_f = st.columns(3)
-            adults = c_g.number_input("Est. Adults", min_value=1, value=40, step=5)
-            kids = c_k.number_input("Est. Kids", min_value=0, value=10, step=5)
-            event_fee = c_f.number_input("Setup Fee ($)", min_value=0.0, value=150.0, step=25.0)
-            adult_pies, kid_pies = math.ceil((adults * 3) / 6), math.ceil((kids * 2) / 8) if kids > 0 else 0
-            st.info(f"💡 **Prep Guide:** You will need to prep ~**{adult_pies} adult pies** and **{kid_pies} kids pies**.")
-            
-            st.markdown("<h3 style='margin-bottom: 10px; margin-top: 20px;'>3. Food Packages & Menu Selection</h3>", unsafe_allow_html=True)
-            c_food1, c_food2 = st.columns(2)
-            adult_tier = c_food1.selectbox("Adult Package", ["Classic ($17/head)", "Premium ($22/head)"])
-            kid_tier = c_food2.selectbox("Kids Package", ["Standard ($10/head)"])
-            selected_pizzas = st.multiselect("Select Event Pizzas (Will appear on contract)", list(menu_prices.keys()))
-            
-            st.markdown("<h3 style='margin-bottom: 10px; margin-top: 20px;'>4. Beverages & Fees</h3>", unsafe_allow_html=True)
-            c_b1, c_b2 = st.columns(2)
-            add_adult_bevs = c_b1.checkbox(f"Adult Bev Package ($5.00/adult)", value=True)
-            add_kid_bevs = c_b2.checkbox(f"Kids Bev Package ($3.00/kid)", value=True)
-            c_t, c_d, c_c = st.columns(3)
-            apply_tax = c_t.checkbox("Add MA Meals Tax", value=True)
-            apply_cc = c_c.checkbox("Add CC Fee", value=False)
-            discount_pct = c_d.number_input("Discount (%)", value=0.0, step=5.0)
-            menu_ext_fee = st.number_input("Menu Extension Fee ($)", min_value=0.0, value=0.0, step=25.0)
-
-        with c_out:
-            printable_items, order_lines = [], ""
-            adult_food_price = 17.00 if "Classic" in adult_tier else 22.00
-            kid_food_price = 10.00
-            food_revenue = (adults * adult_food_price) + (kids * kid_food_price)
-            
-            if adults > 0:
-                order_lines += f'<div class="quote-row"><span>Adult Food Pkg</span> <span>${(adults * adult_food_price):,.2f}</span></div>\n'
-                printable_items.append({"desc": f"Adult Food Package", "total": (adults * adult_food_price)})
-            if kids > 0:
-                order_lines += f'<div class="quote-row"><span>Kids Food Pkg</span> <span>${(kids * kid_food_price):,.2f}</span></div>\n'
-                printable_items.append({"desc": f"Kids Food Package", "total": (kids * kid_food_price)})
-
-            beverage_revenue, beverage_cost = 0.0, 0.0
-            if add_adult_bevs and adults > 0:
-                beverage_revenue += adults * 5.00; beverage_cost += adults * 1.50 
-                order_lines += f'<div class="quote-row"><span>Adult Bev Pkg</span> <span>${adults * 5.00:,.2f}</span></div>\n'
-                printable_items.append({"desc": f"Adult Beverage Package", "total": adults * 5.00})
-            if add_kid_bevs and kids > 0:
-                beverage_revenue += kids * 3.00; beverage_cost += kids * 1.00 
-                order_lines += f'<div class="quote-row"><span>Kids Bev Pkg</span> <span>${kids * 3.00:,.2f}</span></div>\n'
-                printable_items.append({"desc": f"Kids Beverage Package", "total": kids * 3.00})
-
-            gross_subtotal = food_revenue + beverage_revenue
-            discount_amount = gross_subtotal * (discount_pct / 100.0)
-            taxable_amount = (gross_subtotal - discount_amount) + event_fee + menu_ext_fee
-            tax_amount = (taxable_amount * 0.07) if apply_tax else 0.0
-            cc_fee_amount = ((taxable_amount + tax_amount) * 0.0229) if apply_cc else 0.0
-            final_quote = taxable_amount + tax_amount + cc_fee_amount
-            total_internal_cost = ((adult_pies * 4.00) + (kid_pies * 2.00)) + beverage_cost
-            profit = taxable_amount - total_internal_cost
-            margin = (profit / taxable_amount) * 100 if taxable_amount > 0 else 0.0
-
-            quote_html = f"""<div class="quote-box"><div class="quote-header">Custom Catering Proposal</div>
-<div style="color: #b0b0b0; margin-bottom: 15px; font-weight: 600;">ORDER SUMMARY</div>{order_lines}
-<div class="quote-row"><span>Food & Beverage Subtotal</span> <span>${gross_subtotal:,.2f}</span></div>"""
-            if discount_amount > 0: quote_html += f'\n<div class="quote-row" style="color: #da3633;"><span>Discount</span> <span>-${discount_amount:,.2f}</span></div>'
-            quote_html += f'\n<div class="quote-row"><span>Setup / Travel Fee</span> <span>${event_fee:,.2f}</span></div>'
-            if menu_ext_fee > 0: quote_html += f'\n<div class="quote-row"><span>Menu Extension Fee</span> <span>${menu_ext_fee:,.2f}</span></div>'
-            if apply_tax: quote_html += f'\n<div class="quote-row"><span>MA Meals Tax (7.0%)</span> <span>${tax_amount:,.2f}</span></div>'
-            if apply_cc: quote_html += f'\n<div class="quote-row"><span>Credit Card Fee (2.29%)</span> <span>${cc_fee_amount:,.2f}</span></div>'
-            quote_html += f"""\n<div class="quote-row total"><span>Total Client Quote</span> <span>${final_quote:,.2f}</span></div>
-<div style="margin-top: 20px; padding: 15px; background-color: #121212; border-radius: 6px; border-left: 4px solid #c5a059;">
-<div class="quote-row profit" style="margin-bottom: 0;"><span>Projected Net Profit</span> <span>${profit:,.2f} ({margin:.1f}%)</span></div></div></div>"""
-            st.markdown(quote_html, unsafe_allow_html=True)
-            
-            if len(printable_items) > 0 and client_name and event_date and event_address:
-                pdf_bytes = generate_pdf_quote(client_name, event_date, event_address, event_desc, printable_items, event_fee, menu_ext_fee, gross_subtotal, discount_amount, discount_pct, tax_amount, cc_fee_amount, final_quote, adult_pies, kid_pies, adult_tier, adults, kids, selected_pizzas)
-                st.download_button(label="📄 Download Official PDF", data=pdf_bytes, file_name=f"CCK_Estimate_{client_name}.pdf", mime="application/pdf", use_container_width=True)
-
-    # --- TAB 3: PIZZA BUILDER ---
-    with tabs[2]:
-        st.write("##")
-        c1, c2 = st.columns([1.2, 1], gap="large")
-        with c1:
-            base = st.selectbox("Crust Base", ["10\" Dough Ball", "12\" Dough Ball", "14\" Dough Ball"])
-            sauce = st.selectbox("Sauce", ["None", "House Pizza Sauce", "Buffalo Sauce"])
-            sauce_oz = st.number_input("Sauce Amount (oz)", value=8.0, step=0.5) if sauce != "None" else 0.0
-            cheeses = st.multiselect("Cheeses", ["Grande Mozzarella", "Fresh Mozzarella", "Ricotta Cheese"])
-            cheese_oz = {ch: st.number_input(f"{ch} (oz)", value=10.0, step=0.5) for ch in cheeses}
-            toppings = st.multiselect("Toppings", ["Premium Sliced Pepperoni", "Fontanini Sausage", "Candied Bacon", "Mike's Hot Honey"])
-            topping_oz = {t: st.number_input(f"{t} (oz)", value=3.0, step=0.5) for t in toppings}
-        with c2:
-            total_cost = ing_dict.get(base, 0.0)
-            if sauce != "None": total_cost += sauce_oz * ing_dict.get(sauce, 0.0)
-            for ch, oz in cheese_oz.items(): total_cost += oz * ing_dict.get(ch, 0.0)
-            for t, oz in topping_oz.items(): total_cost += oz * ing_dict.get(t, 0.0)
-            st.markdown(f"""<div class="quote-box" style="margin-top: 20px;">
-<div class="quote-row"><span>Total Raw Food Cost</span> <span>${total_cost:.2f}</span></div>
-<div class="quote-row total" style="color: #238636;"><span>Suggested Price (80% Margin)</span> <span>${total_cost / 0.20 if total_cost > 0 else 0.0:.2f}</span></div></div>""", unsafe_allow_html=True)
-
-    # --- TAB 4: RECIPE MARGINS ---
-    with tabs[3]:
-        st.write("##")
-        selected_pie = st.selectbox("Select Menu Item", list(menu_prices.keys()))
-        df_recipe = recipes_data[recipes_data['Recipe'] == selected_pie].copy()
-        
-        df_recipe['Ingredient'] = df_recipe['Ingredient'].astype(str)
-        safe_ing_df = ingredients_data.copy()
-        safe_ing_df['Ingredient'] = safe_ing_df['Ingredient'].astype(str)
-        
-        merged_recipe = pd.merge(df_recipe, safe_ing_df, on="Ingredient", how="left")
-        merged_recipe['Cost'] = pd.to_numeric(merged_recipe['Cost']).fillna(0.0)
-        merged_recipe['Line Cost'] = merged_recipe['Ounces'] * merged_recipe['Cost']
-        
-        cost = merged_recipe['Line Cost'].sum()
-        price = menu_prices[selected_pie]
-        
-        c1, c2, c3 = st.columns(3)
-        c1.markdown(f"<div class='quote-box' style='text-align:center;'><div>RETAIL PRICE</div><div style='font-size: 2rem;'>${price:,.2f}</div></div>", unsafe_allow_html=True)
-        c2.markdown(f"<div class='quote-box' style='text-align:center;'><div>FOOD COST</div><div style='font-size: 2rem; color: #da3633;'>${cost:,.2f}</div></div>", unsafe_allow_html=True)
-        c3.markdown(f"<div class='quote-box' style='text-align:center;'><div>PROFIT MARGIN</div><div style='font-size: 2rem; color: #238636;'>{((price-cost)/price)*100:.1f}%</div></div>", unsafe_allow_html=True)
-
-    # --- TAB 5: THE VAULT ---
-    with tabs[4]:
-        st.write("##")
-        if not vault_df.empty:
-            vault_html = '<div class="vault-grid">'
-            for index, row in vault_df.iterrows():
-                name, link = row.get('document name') or row.get('name') or "Doc", row.get('link') or row.get('url') or "#"
-                vault_html += f'<a href="{link}" target="_blank" class="doc-card"><div class="doc-title">{name}</div></a>'
-            st.markdown(vault_html + '</div>', unsafe_allow_html=True)
+    # Warm the Vault index in the background on a session's first run, so a cold start after the app
+    # wakes overlaps the Google round trip with rendering instead of stalling the Vault tab
+    if "vault_prefetched" not in st.session_state:
+        st.session_state.vault_prefetched = True
+        prefetch(functools.partial(load_gsheets, tenant))
+    c_left, c_logo, c_right = st.columns([5, 1, 5])
+    with c_logo:
+        logo = logo_bytes()
+        if logo: st.image(logo, use_container_width=True)
+        else: st.markdown("<h1 style='text-align: center; font-size: 3.5rem; margin-bottom: 0;'>CCK</h1>", unsafe_allow_html=True)
+            
+    st.markdown(f"<p style='text-align: center; color: #b0b0b0; letter-spacing: 2px; text-transform: uppercase; margin-bottom: 40px;'>Command Center · {tenant.name}</p>", unsafe_allow_html=True)
+
+    st.markdown(QUICK_LINKS_HTML, unsafe_allow_html=True)
+
+    # Only the open tab's body runs; hidden tabs just keep their widget values alive
+    for (label, render, state_prefix), (tab, is_open) in zip(TABS, tab_router([t[0] for t in TABS])):
+        if is_open:
+            with tab, timed(f"tab:{label}"): render()
+        else:
+            keep_widget_state(state_prefix)
+
+    record = finish_rerun(st.session_state.get("active_tab"))
+    if st.session_state.get("is_admin"): render_admin_panel(record)
 
 if __name__ == "__main__":
-    main()
+    main()
@@ -0,0 +1,96 @@
+import collections
+import functools
+import hashlib
+import pickle
+import threading
+import time
+
+import streamlit as st
+
+# --- MEMOIZATION LAYER ---
+# @memo(scope="global") puts a pure function behind st.cache_data, shared by every session.
+# @memo(scope="session") keeps user-specific results (uploads, form state) in st.session_state.
+# Either way the key includes the current version of each named dependency ("catalog", ...), so
+# when master data changes only the entries that depend on it miss; the stale ones age out
+# through max_entries / ttl. Hit/miss counters are process-wide and readable with stats().
+SESSION_KEY = "_memo_cache"
+
+_versions = {}   # dependency -> callable returning its current version token
+_bumps = collections.Counter()
+_stats = collections.defaultdict(lambda: {"hits": 0, "misses": 0})
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def register(dep, version_fn):
+    _versions[dep] = version_fn
+
+
+def invalidate(dep):
+    # Manual invalidation for dependencies without a natural version (e.g. a sheet that was written to)
+    with _lock: _bumps[dep] += 1
+
+
+def _dep_versions(deps):
+    return tuple((d, _versions[d]() if d in _versions else None, _bumps[d]) for d in deps)
+
+
+def _count(name, field):
+    with _lock: _stats[name][field] += 1
+
+
+def stats():
+    with _lock:
+        return {name: dict(s, hit_rate=s["hits"] / max(1, s["hits"] + s["misses"])) for name, s in _stats.items()}
+
+
+def reset_stats():
+    with _lock: _stats.clear()
+
+
+def _session_cache(name):
+    return st.session_state.setdefault(SESSION_KEY, {}).setdefault(name, collections.OrderedDict())
+
+
+def memo(deps=(), scope="global", ttl=None, max_entries=128):
+    def decorate(fn):
+        name = f"{fn.__module__}.{fn.__qualname__}"
+
+        if scope == "global":
+            def cached(dep_versions, *args, **kwargs):
+                _local.missed = True
+                return fn(*args, **kwargs)
+
+            # st.cache_data keys on the qualified name, so give each wrapped function its own
+            cached.__module__, cached.__qualname__ = fn.__module__, f"{fn.__qualname__}.<memo>"
+            cached = st.cache_data(ttl=ttl, max_entries=max_entries, show_spinner=False)(cached)
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                _local.missed = False
+                result = cached(_dep_versions(deps), *args, **kwargs)
+                _count(name, "misses" if _local.missed else "hits")
+                return result
+
+            wrapper.clear = cached.clear
+            return wrapper
+
+        @functools.wraps(fn)
+        def session_wrapper(*args, **kwargs):
+            cache = _session_cache(name)
+            key = hashlib.sha1(pickle.dumps((name, _dep_versions(deps), args, sorted(kwargs.items())))).hexdigest()
+            hit = cache.get(key)
+            now = time.time()
+            if hit is not None and (ttl is None or now - hit[0] < ttl):
+                cache.move_to_end(key)
+                _count(name, "hits")
+                return hit[1]
+            _count(name, "misses")
+            value = fn(*args, **kwargs)
+            cache[key] = (now, value)
+            cache.move_to_end(key)
+            while len(cache) > max_entries: cache.popitem(last=False)
+            return value
+
+        return session_wrapper
+    return decorate
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+# --- PIZZA BUILD OPTIMIZER ---
+# Searches the portion space of a custom pie: every candidate cheese/topping gets a grid of ounces
+# between its min and max, the grids are crossed into one (builds x ingredients) array and costed
+# with a single matrix-vector product. Builds over the food-cost budget (retail price at the target
+# margin) are dropped, and of the rest only the Pareto set survives: no other build is both cheaper
+# and heavier on toppings. The grid is coarsened so the cross product stays under MAX_BUILDS.
+MAX_BUILDS = 200_000
+STEP_OZ = 0.5
+
+
+def portion_grid(ranges, step=STEP_OZ, max_builds=MAX_BUILDS):
+    # ranges: [(min_oz, max_oz)] -> one array of ounces per ingredient
+    full = [np.arange(lo, hi + step / 2, step) if hi > lo else np.array([float(lo)]) for lo, hi in ranges]
+    per_axis = max(2, int(max_builds ** (1 / max(1, len(full)))))
+    # Evenly thinned, snapped to the step and always keeping both ends of each range
+    return [g if len(g) <= per_axis else np.unique(np.round(np.linspace(g[0], g[-1], per_axis) / step) * step) for g in full]
+
+
+def pareto_builds(catalog, fixed, ranges, price, target_margin, step=STEP_OZ, max_builds=MAX_BUILDS):
+    # fixed: {ingredient: units} always on the pie (crust, sauce); ranges: {ingredient: (min_oz, max_oz)}
+    names = list(ranges)
+    base_cost = catalog.cost(fixed) if fixed else 0.0
+    budget = price * (1 - target_margin / 100.0)
+    ids = catalog.ids(names)
+    unit_costs = np.where(ids >= 0, catalog.unit_costs[ids], 0.0)
+
+    grids = portion_grid([ranges[n] for n in names], step, max_builds)
+    if names:
+        builds = np.stack(np.meshgrid(*grids, indexing="ij"), axis=-1).reshape(-1, len(names))
+    else:
+        builds = np.zeros((1, 0))
+    cost = base_cost + builds @ unit_costs
+    weight = builds.sum(axis=1)
+
+    ok = np.flatnonzero(cost <= budget + 1e-9)
+    # Cheapest first (heaviest first on ties); a build is on the frontier if it outweighs every cheaper one
+    order = ok[np.lexsort((-weight[ok], cost[ok]))]
+    w = weight[order]
+    frontier = order[w > np.maximum.accumulate(np.concatenate(([-np.inf], w[:-1])))]
+
+    df = pd.DataFrame(builds[frontier], columns=[f"{n} (oz)" for n in names])
+    df["Topping oz"] = weight[frontier]
+    df["Food Cost"] = cost[frontier]
+    df["Margin %"] = (price - cost[frontier]) / price * 100 if price > 0 else 0.0
+    df["Price @ Target"] = cost[frontier] / (1 - target_margin / 100.0) if target_margin < 100 else np.nan
+    return df.reset_index(drop=True), {"searched": len(builds), "within_budget": len(ok), "budget": budget, "base_cost": base_cost}
@@ -0,0 +1,106 @@
+import contextlib
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+from collections import deque
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# --- RERUN PROFILING ---
+# Opt-in: CCK_PROFILE=1 for every session, or the admin panel toggle for one. Each script run gets
+# a record of named, possibly nested, timed sections; finish_rerun() appends it as one JSON line
+# to a size-rotated log (logs/timings.jsonl) for offline analysis. With profiling off, timed()
+# costs one attribute lookup and one session_state read.
+LOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "timings.jsonl")
+LOG_MAX_BYTES, LOG_BACKUPS = 5 * 1024 * 1024, 5
+SESSION_FLAG = "profiling"
+
+_state = threading.local()
+
+
+def enabled():
+    if os.environ.get("CCK_PROFILE", "").lower() in ("1", "true", "yes"): return True
+    try: return bool(st.session_state.get(SESSION_FLAG))
+    except Exception: return False
+
+
+@functools.lru_cache(maxsize=1)
+def _logger():
+    os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
+    log = logging.getLogger("cck.profiling")
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    handler = logging.handlers.RotatingFileHandler(LOG_PATH, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(handler)
+    return log
+
+
+def _write(record):
+    try: _logger().info(json.dumps(record, default=str, ensure_ascii=False))
+    except Exception: pass
+
+
+def start_rerun(app="main"):
+    _state.record = {"ts": time.time(), "app": app, "sections": [], "t0": time.perf_counter(), "depth": 0} if enabled() else None
+
+
+@contextlib.contextmanager
+def timed(name):
+    rec = getattr(_state, "record", None)
+    if rec is None and not enabled():
+        yield
+        return
+    # Outside a profiled rerun (e.g. a download callback) the section is logged on its own
+    t = time.perf_counter()
+    if rec is not None: rec["depth"] += 1
+    try:
+        yield
+    finally:
+        ms = (time.perf_counter() - t) * 1000
+        if rec is not None:
+            rec["depth"] -= 1
+            rec["sections"].append({"name": name, "ms": round(ms, 3), "depth": rec["depth"]})
+        else:
+            _write({"ts": time.time(), "app": None, "page": None, "total_ms": round(ms, 3), "sections": [{"name": name, "ms": round(ms, 3), "depth": 0}]})
+
+
+def profiled(name):
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(name): return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def finish_rerun(page=None):
+    rec, _state.record = getattr(_state, "record", None), None
+    if rec is None: return None
+    try: session = get_script_run_ctx().session_id[:8]
+    except Exception: session = None
+    record = {"ts": rec["ts"], "app": rec["app"], "session": session, "page": page,
+              "total_ms": round((time.perf_counter() - rec["t0"]) * 1000, 3), "sections": rec["sections"]}
+    _write(record)
+    return record
+
+
+def recent(limit=500):
+    # The newest records from the current log file, as a flat (record, section) frame
+    import pandas as pd
+    try:
+        with open(LOG_PATH, encoding="utf-8") as f: lines = deque(f, maxlen=limit)
+    except OSError:
+        return pd.DataFrame(columns=["ts", "page", "total_ms", "name", "ms", "depth"])
+    rows = []
+    for line in lines:
+        try: rec = json.loads(line)
+        except ValueError: continue
+        for s in rec.get("sections", []):
+            rows.append({"ts": rec.get("ts"), "page": rec.get("page"), "total_ms": rec.get("total_ms"), **s})
+    return pd.DataFrame(rows, columns=["ts", "page", "total_ms", "name", "ms", "depth"])
@@ -0,0 +1,142 @@
+import math
+import weakref
+
+import numpy as np
+
+# --- EVENT QUOTE PRICING ---
+# The Event Quoter math, kept free of Streamlit so the batch exporter and benchmarks can run it too.
+# The constants below are the house rates; a catalog file can override any of them in an optional
+# "pricing" block (keys are the lowercase names, e.g. "tax_rate"), so each location quotes its own
+# packages, beverages, tax and card fee. engine_for(catalog) gives the engine for a location.
+ADULT_TIERS = {"Classic ($17/head)": 17.00, "Premium ($22/head)": 22.00}
+KID_FOOD_PRICE = 10.00
+ADULT_BEV_PRICE, ADULT_BEV_COST = 5.00, 1.50
+KID_BEV_PRICE, KID_BEV_COST = 3.00, 1.00
+ADULT_PIE_COST, KID_PIE_COST = 4.00, 2.00
+TAX_RATE, CC_FEE_RATE = 0.07, 0.0229
+TAX_LABEL = "MA Meals Tax"
+# Pizzas each package covers (keyed by the package name before its price); a package not listed
+# here covers the full signature menu
+PACKAGE_PIZZAS = {"Classic": ("The Plain Jane", "The Premium Pepperoni", "The Bianco Veggie")}
+RATES = ("adult_tiers", "kid_food_price", "adult_bev_price", "adult_bev_cost", "kid_bev_price", "kid_bev_cost",
+         "adult_pie_cost", "kid_pie_cost", "tax_rate", "cc_fee_rate", "tax_label", "package_pizzas")
+
+
+def pie_counts(adults, kids):
+    return math.ceil((adults * 3) / 6), math.ceil((kids * 2) / 8) if kids > 0 else 0
+
+
+def percent(rate):
+    # 0.07 -> "7.0%", 0.0229 -> "2.29%"
+    text = f"{round(rate * 100, 4):g}"
+    return f"{text}%" if "." in text else f"{text}.0%"
+
+
+def tier_name(adult_tier):
+    # "Classic ($17/head)" -> "Classic"
+    return str(adult_tier).split(" (")[0].strip()
+
+
+class QuoteEngine:
+    # Column-at-a-time pricing: every argument may be a scalar or a NumPy column and the results
+    # broadcast, so one call prices a single event or a whole season of them.
+    def __init__(self, pricing=None):
+        pricing = pricing or {}
+        unknown = set(pricing) - set(RATES)
+        if unknown: raise ValueError(f"unknown pricing keys: {', '.join(sorted(unknown))}")
+        for key in RATES: setattr(self, key, pricing.get(key, globals()[key.upper()]))
+        self.adult_tiers = {label: float(price) for label, price in self.adult_tiers.items()}
+        self.package_pizzas = {name: tuple(pies) for name, pies in self.package_pizzas.items()}
+        self._tier_names = [(tier_name(label), price) for label, price in self.adult_tiers.items()]
+        # Line labels on the on-screen quote and the PDF, so they always show the rates charged
+        self.tax_line = f"{self.tax_label} ({percent(self.tax_rate)})"
+        self.cc_fee_line = f"Credit Card Fee ({percent(self.cc_fee_rate)})"
+
+    def adult_food_price(self, adult_tier):
+        # Matched on the package name, so "Classic" and "Classic ($17/head)" price the same;
+        # an unknown package gets the last (top) tier's price
+        if isinstance(adult_tier, str):
+            return next((price for name, price in self._tier_names if name in adult_tier), self._tier_names[-1][1])
+        tiers = np.asarray(adult_tier, dtype=str)
+        price = np.full(tiers.shape, self._tier_names[-1][1])
+        for name, tier_price in reversed(self._tier_names[:-1]):
+            price = np.where(np.char.find(tiers, name) >= 0, tier_price, price)
+        return price
+
+    def covered_pizzas(self, adult_tier):
+        return next((pies for name, pies in self.package_pizzas.items() if name in str(adult_tier)), None)
+
+    def quote(self, adults, kids, adult_tier, add_adult_bevs=True, add_kid_bevs=True, apply_tax=True, apply_cc=False, discount_pct=0.0, event_fee=150.0, menu_ext_fee=0.0):
+        adults, kids = np.asarray(adults, dtype=float), np.asarray(kids, dtype=float)
+        adult_bevs = np.asarray(add_adult_bevs, dtype=bool) & (adults > 0)
+        kid_bevs = np.asarray(add_kid_bevs, dtype=bool) & (kids > 0)
+
+        adult_pies, kid_pies = np.ceil(adults * 3 / 6), np.ceil(kids * 2 / 8)
+        food_revenue = adults * self.adult_food_price(adult_tier) + kids * self.kid_food_price
+        beverage_revenue = np.where(adult_bevs, adults * self.adult_bev_price, 0.0) + np.where(kid_bevs, kids * self.kid_bev_price, 0.0)
+        beverage_cost = np.where(adult_bevs, adults * self.adult_bev_cost, 0.0) + np.where(kid_bevs, kids * self.kid_bev_cost, 0.0)
+
+        gross_subtotal = food_revenue + beverage_revenue
+        discount_amount = gross_subtotal * (np.asarray(discount_pct, dtype=float) / 100.0)
+        taxable_amount = (gross_subtotal - discount_amount) + event_fee + menu_ext_fee
+        tax_amount = np.where(apply_tax, taxable_amount * self.tax_rate, 0.0)
+        cc_fee_amount = np.where(apply_cc, (taxable_amount + tax_amount) * self.cc_fee_rate, 0.0)
+        final_quote = taxable_amount + tax_amount + cc_fee_amount
+        total_internal_cost = adult_pies * self.adult_pie_cost + kid_pies * self.kid_pie_cost + beverage_cost
+        profit = taxable_amount - total_internal_cost
+        with np.errstate(divide="ignore", invalid="ignore"):
+            margin = np.where(taxable_amount > 0, profit / taxable_amount * 100, 0.0)
+
+        return {
+            "adult_pies": adult_pies, "kid_pies": kid_pies,
+            "gross_subtotal": gross_subtotal, "discount_amount": discount_amount, "taxable_amount": taxable_amount,
+            "tax_amount": tax_amount, "cc_fee_amount": cc_fee_amount, "final_quote": final_quote,
+            "total_internal_cost": total_internal_cost, "profit": profit, "margin": margin,
+        }
+
+    def quote_frame(self, events):
+        # events: DataFrame with one column per quote() argument; returns the results as columns
+        return events.assign(**self.quote(**{k: events[k].to_numpy() for k in events.columns}))
+
+    def sensitivity_grid(self, adults, tiers, discounts, **fixed):
+        # Every adults x tier x discount combination in one broadcasted pass, flattened to columns
+        a = np.asarray(adults, dtype=float)[:, None, None]
+        t = np.asarray(tiers, dtype=str)[None, :, None]
+        d = np.asarray(discounts, dtype=float)[None, None, :]
+        shape = (a.shape[0], t.shape[1], d.shape[2])
+        q = self.quote(a, fixed.pop("kids", 0), t, discount_pct=d, **fixed)
+        grid = {"adults": a, "adult_tier": t, "discount_pct": d, "final_quote": q["final_quote"], "profit": q["profit"], "margin": q["margin"]}
+        return {k: np.broadcast_to(v, shape).ravel() for k, v in grid.items()}
+
+    def price(self, adults, kids, adult_tier, add_adult_bevs=True, add_kid_bevs=True, apply_tax=True, apply_cc=False, discount_pct=0.0, event_fee=150.0, menu_ext_fee=0.0):
+        # One event as plain Python numbers, plus the line items printed on the estimate
+        q = {k: v.item() for k, v in self.quote(adults, kids, adult_tier, add_adult_bevs, add_kid_bevs, apply_tax, apply_cc, discount_pct, event_fee, menu_ext_fee).items()}
+        q["adult_pies"], q["kid_pies"] = int(q["adult_pies"]), int(q["kid_pies"])
+
+        price = self.adult_food_price(adult_tier)
+        printable_items = []
+        if adults > 0: printable_items.append({"desc": "Adult Food Package", "label": "Adult Food Pkg", "total": adults * price})
+        if kids > 0: printable_items.append({"desc": "Kids Food Package", "label": "Kids Food Pkg", "total": kids * self.kid_food_price})
+        if add_adult_bevs and adults > 0: printable_items.append({"desc": "Adult Beverage Package", "label": "Adult Bev Pkg", "total": adults * self.adult_bev_price})
+        if add_kid_bevs and kids > 0: printable_items.append({"desc": "Kids Beverage Package", "label": "Kids Bev Pkg", "total": kids * self.kid_bev_price})
+        q["printable_items"] = printable_items
+        return q
+
+
+quote_engine = QuoteEngine()  # house rates
+_engines = weakref.WeakKeyDictionary()
+
+
+def engine_for(catalog):
+    # One engine per loaded catalog, built from its "pricing" block
+    engine = _engines.get(catalog)
+    if engine is None: engine = _engines[catalog] = QuoteEngine(catalog.pricing)
+    return engine
+
+
+def price_quote(adults, kids, adult_tier, add_adult_bevs=True, add_kid_bevs=True, apply_tax=True, apply_cc=False, discount_pct=0.0, event_fee=150.0, menu_ext_fee=0.0):
+    return quote_engine.price(adults, kids, adult_tier, add_adult_bevs, add_kid_bevs, apply_tax, apply_cc, discount_pct, event_fee, menu_ext_fee)
+
+
+def adult_food_price(adult_tier):
+    return quote_engine.adult_food_price(adult_tier)
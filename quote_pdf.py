@@ -0,0 +1,102 @@
+import functools
+import io
+
+from fpdf import FPDF
+
+from branding import logo_bytes, logo_path
+from quote_engine import quote_engine
+
+# --- PDF QUOTE GENERATOR ---
+# PDFs are only built when the download is actually requested, and memoized on the quote inputs.
+PDF_CACHE_SIZE = 64
+
+
+@functools.lru_cache(maxsize=1)
+def load_logo():
+    # The app logo (branding.logo_path), parsed once per process. PyFPDF 1.7 gets its image record
+    # pre-parsed; fpdf2 gets raw bytes
+    path = logo_path()
+    if path is None: return None, None
+    if hasattr(FPDF, "_parsepng"):
+        parse = FPDF()._parsepng if path.lower().endswith(".png") else FPDF()._parsejpg
+        return path, parse(path)
+    return path, logo_bytes()
+
+
+def generate_pdf_quote(client_name, event_date, event_address, event_desc, printable_items, event_fee, menu_ext_fee, gross_subtotal, discount_amount, discount_pct, tax_amount, cc_fee_amount, final_quote, adult_pies, kid_pies, adult_tier, adults, kids, selected_pizzas, covered_pizzas=None,
+                      tax_line=quote_engine.tax_line, cc_fee_line=quote_engine.cc_fee_line):
+    # covered_pizzas: what the adult package includes (None: the full menu); tax_line / cc_fee_line
+    # label the charges at the location's rates
+    items = tuple((item["desc"], item["total"]) for item in printable_items)
+    return _render_pdf_quote(client_name, event_date, event_address, event_desc, items, event_fee, menu_ext_fee, gross_subtotal, discount_amount, discount_pct, tax_amount, cc_fee_amount, final_quote, adult_pies, kid_pies, adult_tier, adults, kids, tuple(selected_pizzas), tuple(covered_pizzas or ()), tax_line, cc_fee_line)
+
+
+@functools.lru_cache(maxsize=PDF_CACHE_SIZE)
+def _render_pdf_quote(client_name, event_date, event_address, event_desc, printable_items, event_fee, menu_ext_fee, gross_subtotal, discount_amount, discount_pct, tax_amount, cc_fee_amount, final_quote, adult_pies, kid_pies, adult_tier, adults, kids, selected_pizzas, covered_pizzas, tax_line, cc_fee_line):
+    pdf = FPDF()
+    pdf.add_page()
+    gold, black, gray = (197, 160, 89), (30, 30, 30), (100, 100, 100)
+    
+    logo_path, logo_info = load_logo()
+    if logo_path:
+        if isinstance(logo_info, dict):
+            pdf.images[logo_path] = dict(logo_info, i=len(pdf.images) + 1)
+            pdf.image(logo_path, x=(pdf.w - 30) / 2, y=10, w=30)
+        else:
+            pdf.image(io.BytesIO(logo_info), x=(pdf.w - 30) / 2, y=10, w=30)
+        pdf.ln(35) 
+    else:
+        pdf.ln(15)
+        
+    pdf.set_font("Arial", 'B', 24); pdf.set_text_color(*gold); pdf.cell(0, 12, "CUSTOM CRUST KITCHEN", ln=True, align='C')
+    pdf.set_font("Arial", 'B', 12); pdf.set_text_color(*gray); pdf.cell(0, 8, "CATERING ESTIMATE", ln=True, align='C')
+    pdf.line(10, pdf.get_y() + 5, 200, pdf.get_y() + 5); pdf.ln(10)
+    
+    pdf.set_font("Arial", 'B', 12); pdf.set_text_color(*black); pdf.cell(0, 8, "EVENT DETAILS", ln=True)
+    pdf.set_font("Arial", '', 11); pdf.set_text_color(*gray)
+    pdf.cell(0, 6, f"Client: {client_name}", ln=True); pdf.cell(0, 6, f"Date: {event_date}", ln=True)
+    pdf.cell(0, 6, f"Headcount: {adults} Adults, {kids} Kids", ln=True)
+    pdf.cell(0, 6, f"Location: {event_address}", ln=True); pdf.cell(0, 6, f"Event Notes: {event_desc}", ln=True); pdf.ln(10)
+    
+    pdf.set_font("Arial", 'B', 14); pdf.set_text_color(*black); pdf.cell(0, 10, "ORDER SUMMARY", ln=True)
+    pdf.set_font("Arial", '', 12); pdf.set_text_color(*black)
+    for desc, total in printable_items:
+        pdf.cell(140, 8, desc, 0, 0); pdf.cell(50, 8, f"${total:,.2f}", 0, 1, 'R')
+    pdf.ln(8)
+    
+    if len(printable_items) > 0:
+        pdf.set_font("Arial", 'B', 11); pdf.set_text_color(*black); pdf.cell(0, 8, "PACKAGE DETAILS & EXCLUSIONS:", ln=True)
+        pdf.set_font("Arial", '', 10); pdf.set_text_color(*gray)
+        package = adult_tier.split(" (")[0]
+        if len(covered_pizzas) > 1: pdf.cell(0, 6, f"- {package} Package Includes: {', '.join(covered_pizzas[:-1])}, & {covered_pizzas[-1]}.", ln=True)
+        elif covered_pizzas: pdf.cell(0, 6, f"- {package} Package Includes: {covered_pizzas[0]}.", ln=True)
+        else: pdf.cell(0, 6, f"- {package} Package Includes: Full Signature Pizza Menu.", ln=True)
+        
+        if len(selected_pizzas) > 0:
+            pdf.set_font("Arial", 'B', 10); pdf.set_text_color(*black)
+            pdf.cell(0, 6, "Selected Event Pizzas:", ln=True)
+            pdf.set_font("Arial", '', 10); pdf.set_text_color(*gray)
+            pizzas_str = ", ".join(selected_pizzas)
+            pdf.multi_cell(0, 6, f"- {pizzas_str}")
+            
+        pdf.cell(0, 6, "- Exclusions: Calzones are exclusively for retail service and are not included in catering.", ln=True); pdf.ln(8)
+    
+    pdf.set_font("Arial", 'B', 14); pdf.set_text_color(*black); pdf.cell(0, 10, "FINANCIALS", ln=True); pdf.set_font("Arial", '', 12)
+    pdf.cell(140, 8, "Food & Beverage Subtotal", 0, 0); pdf.cell(50, 8, f"${gross_subtotal:,.2f}", 0, 1, 'R')
+    if discount_amount > 0:
+        pdf.set_text_color(200, 50, 50); pdf.cell(140, 8, f"Discount ({discount_pct}%)", 0, 0); pdf.cell(50, 8, f"-${discount_amount:,.2f}", 0, 1, 'R'); pdf.set_text_color(*black)
+    pdf.cell(140, 8, "Setup / Travel Fee", 0, 0); pdf.cell(50, 8, f"${event_fee:,.2f}", 0, 1, 'R')
+    if menu_ext_fee > 0:
+        pdf.cell(140, 8, "Menu Extension Fee", 0, 0); pdf.cell(50, 8, f"${menu_ext_fee:,.2f}", 0, 1, 'R')
+    if tax_amount > 0: pdf.cell(140, 8, tax_line, 0, 0); pdf.cell(50, 8, f"${tax_amount:,.2f}", 0, 1, 'R')
+    if cc_fee_amount > 0: pdf.cell(140, 8, cc_fee_line, 0, 0); pdf.cell(50, 8, f"${cc_fee_amount:,.2f}", 0, 1, 'R')
+    pdf.line(10, pdf.get_y() + 2, 200, pdf.get_y() + 2); pdf.ln(5)
+    
+    pdf.set_font("Arial", 'B', 16); pdf.set_text_color(*gold)
+    pdf.cell(140, 10, "ESTIMATED TOTAL", 0, 0); pdf.cell(50, 10, f"${final_quote:,.2f}", 0, 1, 'R')
+    
+    pdf.ln(25); pdf.set_font("Arial", 'I', 10); pdf.set_text_color(*gray)
+    pdf.multi_cell(0, 6, "Thank you for choosing Custom Crust Kitchen! This document is an estimate to give you an accurate idea of costs. Final pricing may adjust based on exact headcount, menu alterations, or specific event requirements.", align='C')
+    # PyFPDF 1.7 returns a latin-1 str for dest='S' (a bare output() prints to stdout); fpdf2 returns bytes
+    out = pdf.output(dest='S')
+    return out.encode('latin-1') if isinstance(out, str) else bytes(out)
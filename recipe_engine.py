@@ -0,0 +1,84 @@
+import collections
+import threading
+
+import numpy as np
+import pandas as pd
+
+# --- RECIPE COSTING ENGINE ---
+# Expands the catalog into a recipe x ingredient ounce matrix once and costs the whole menu with a single
+# matrix-vector product. The Recipe Margins tab only ever looks results up.
+
+
+class RecipeCostEngine:
+    def __init__(self, catalog):
+        self.ingredients, self.ing_index = list(catalog.ingredients), catalog.ing_index
+        self.recipes, self.recipe_index = list(catalog.recipes), catalog.recipe_index
+        self.unit_costs, self.prices = catalog.unit_costs, catalog.prices
+        self.ounces = catalog.ounce_matrix()
+
+        self.line_costs = self.ounces * self.unit_costs
+        self.food_costs = self.ounces @ self.unit_costs
+        self.margins = self._margins(self.food_costs)
+
+    def lookup(self, recipe):
+        i = self.recipe_index[recipe]
+        used = np.flatnonzero(self.ounces[i])
+        lines = pd.DataFrame({
+            "Ingredient": [self.ingredients[j] for j in used],
+            "Ounces": self.ounces[i, used],
+            "Cost": self.unit_costs[used],
+            "Line Cost": self.line_costs[i, used],
+        })
+        return {"price": self.prices[i], "cost": self.food_costs[i], "margin": self.margins[i], "lines": lines}
+
+    # --- WHAT-IF REPRICING ---
+    def _margins(self, food_costs):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.prices > 0, (self.prices - food_costs) / self.prices * 100, 0.0)
+
+    def cost_vector(self, price_sheet):
+        # Supplier sheet -> unit cost vector; ingredients missing from the sheet keep today's cost
+        cols = {c.strip().lower(): c for c in price_sheet.columns}
+        name_col = next((cols[c] for c in ("ingredient", "item", "name") if c in cols), price_sheet.columns[0])
+        cost_col = next((cols[c] for c in ("cost", "unit cost", "price") if c in cols), price_sheet.columns[-1])
+        idx = price_sheet[name_col].astype(str).str.strip().map(self.ing_index)
+        new_costs = pd.to_numeric(price_sheet[cost_col].astype(str).str.replace(r"[$,]", "", regex=True), errors="coerce")
+        hit = (idx.notna() & new_costs.notna()).to_numpy()
+        vector = self.unit_costs.copy()
+        vector[idx[hit].to_numpy(dtype=int)] = new_costs[hit].to_numpy(dtype=float)
+        return vector
+
+    def reprice(self, unit_costs):
+        food_costs = self.ounces @ unit_costs
+        margins = self._margins(food_costs)
+        return pd.DataFrame({
+            "Recipe": self.recipes, "Price": self.prices,
+            "Food Cost": self.food_costs, "New Food Cost": food_costs,
+            "Margin %": self.margins, "New Margin %": margins, "Margin Δ (pts)": margins - self.margins,
+        })
+
+    def sweep(self, pct, steps=5):
+        # shocks x ingredients x recipes: shocking ingredient i by s moves each recipe by s * line_cost[r, i]
+        shocks = np.linspace(-pct, pct, 2 * steps + 1) / 100.0
+        food_costs = self.food_costs + shocks[:, None, None] * self.line_costs.T[None, :, :]
+        return shocks * 100, self._margins(food_costs)
+
+    def sweep_frame(self, pct):
+        # Worst-case margin change per ingredient/recipe at the +pct% shock
+        shocks, margins = self.sweep(pct, steps=1)
+        return pd.DataFrame(margins[-1] - self.margins, index=self.ingredients, columns=self.recipes)
+
+
+# One engine per distinct catalog, so locations on the same menu share it; least recently used out
+MAX_ENGINES = 4
+_engines = collections.OrderedDict()
+_engines_lock = threading.Lock()
+
+
+def get_engine(catalog):
+    with _engines_lock:
+        if catalog.fingerprint not in _engines:
+            _engines[catalog.fingerprint] = RecipeCostEngine(catalog)
+            while len(_engines) > MAX_ENGINES: _engines.popitem(last=False)
+        _engines.move_to_end(catalog.fingerprint)
+        return _engines[catalog.fingerprint]
@@ -0,0 +1,451 @@
+import hashlib
+import io
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from contextlib import closing
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# --- GOOGLE SHEETS DATA LAYER ---
+# One shared connection per process. Worksheets are served from memory immediately and refreshed
+# in a background thread once stale (stale-while-revalidate). Every good fetch is snapshotted to disk
+# so a cold start or a Google outage still has last-known-good data to show.
+
+SNAPSHOT_DIR = os.environ.get("CCK_CACHE_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sheet_cache")
+# CCK_FAKE_SHEETS=1 serves built-in sample worksheets, or =<dir> serves <dir>/<worksheet>.csv, instead
+# of Google (offline runs and the load test). CCK_FAKE_SHEETS_LATENCY_MS adds a delay per read.
+FAKE_ENV = "CCK_FAKE_SHEETS"
+HTTP_TIMEOUT = (5, 30)  # seconds (connect, read) for gspread calls, so a hung request gives its thread back
+
+
+@st.cache_resource(show_spinner=False)
+def get_connection():
+    if os.environ.get(FAKE_ENV): return FakeConnection.from_env()
+    from streamlit_gsheets import GSheetsConnection  # pulls in gspread/google-auth; only needed online
+    return st.connection("gsheets", type=GSheetsConnection)
+
+
+@st.cache_resource(show_spinner=False)
+def get_gspread_client():
+    # (gspread client, default spreadsheet) from the service-account secrets; (None, None) for the
+    # public-URL setup, which can only download whole worksheets as CSV and can't write
+    secrets = dict(st.secrets.get("connections", {}).get("gsheets", {}))
+    if secrets.get("type") != "service_account": return None, None
+    import gspread
+    default = secrets.pop("spreadsheet", None)
+    secrets.pop("worksheet", None)
+    client = gspread.service_account_from_dict(secrets)
+    client.set_timeout(HTTP_TIMEOUT)
+    return client, default
+
+
+_worksheets = {}
+
+
+def open_worksheet(conn, spreadsheet, worksheet):
+    # gspread Worksheet (opened once per process), or None without service-account access
+    if isinstance(conn, FakeConnection): return conn.worksheet(worksheet)
+    client, default = get_gspread_client()
+    if client is None: return None
+    key = (spreadsheet or default, worksheet)
+    with _caches_lock: ws = _worksheets.get(key)
+    if ws is None:
+        # Opened outside the shared lock, so a slow spreadsheet doesn't hold up other locations' lookups;
+        # if two threads race, the first one stored wins
+        book = client.open_by_url(key[0]) if str(key[0]).startswith("http") else client.open_by_key(key[0])
+        ws = book.worksheet(worksheet)
+        with _caches_lock: ws = _worksheets.setdefault(key, ws)
+    return ws
+
+
+def _column(n):
+    # 1 -> "A", 27 -> "AA"
+    letters = ""
+    while n: n, rem = divmod(n - 1, 26); letters = chr(65 + rem) + letters
+    return letters
+
+
+def fetch_rows(conn, spreadsheet, worksheet, first_row=2, width=None):
+    # One request -> (header row, raw sheet rows from first_row on). Rows come back as lists of
+    # strings; blank rows inside the data are kept (as []) so callers can count real sheet rows.
+    ws = open_worksheet(conn, spreadsheet, worksheet)
+    if ws is None:
+        # Public-URL access: the CSV export is all or nothing, so one full download trimmed locally
+        raw = conn.read(spreadsheet=spreadsheet, worksheet=worksheet, ttl=0, header=None, dtype=str,
+                        keep_default_na=False, skip_blank_lines=False)
+        grid = raw.values.tolist()
+        return (grid[0] if grid else []), grid[first_row - 1:]
+    if first_row <= 2 or not width:
+        grid = ws.get_all_values()
+        return (grid[0] if grid else []), grid[first_row - 1:]
+    # Header row plus the rows past the high-water mark, in one values:batchGet
+    try:
+        head, tail = ws.batch_get(["1:1", f"A{first_row}:{_column(width)}"])
+    except Exception as e:
+        # A sheet grown only by append_rows ends at its last data row, so a range starting past it is
+        # a 400 "exceeds grid limits" rather than an empty result: nothing new, just read the header
+        if "exceeds grid limits" not in str(e): raise
+        head, tail = ws.batch_get(["1:1"])[0], []
+    return (list(head[0]) if head else []), [list(r) for r in tail]
+
+
+def _frame(header, rows):
+    columns = normalize_header(header)
+    width = len(columns)
+    df = pd.DataFrame([list(r[:width]) + [""] * (width - len(r)) for r in rows], columns=columns, dtype=object)
+    return df.replace("", None).dropna(how="all").reset_index(drop=True)
+
+
+def _snapshot_path(spreadsheet, worksheet):
+    key = hashlib.sha1(f"{spreadsheet}|{worksheet}".encode()).hexdigest()[:16]
+    return os.path.join(SNAPSHOT_DIR, f"{worksheet}-{key}.parquet")
+
+
+def save_snapshot(df, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    try: df.to_parquet(tmp, index=False)
+    except Exception: df.astype("string").to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def load_snapshot(path):
+    try: return pd.read_parquet(path), os.path.getmtime(path)
+    except Exception: return None, 0.0
+
+
+class SheetCache:
+    def __init__(self, spreadsheet, worksheet, max_age=600, cold_timeout=5.0):
+        self.spreadsheet, self.worksheet = spreadsheet, worksheet
+        self.max_age, self.cold_timeout = max_age, cold_timeout
+        self.path = _snapshot_path(spreadsheet, worksheet)
+        self.data, self.fetched_at, self.error = None, 0.0, None
+        self.retry_at = 0.0
+        self._lock = threading.Lock()
+        self._refresh_done = threading.Event()
+        self._refreshing = False
+
+    def _fetch(self, conn):
+        return conn.read(spreadsheet=self.spreadsheet, worksheet=self.worksheet, ttl=0)
+
+    def _failed(self, e):
+        # Keep serving last-known-good data and retry a minute later
+        self.error = e
+        self.retry_at = time.time() + min(60, self.max_age)
+
+    def _refresh(self, conn):
+        try:
+            df = self._fetch(conn)
+            with self._lock:
+                self.data, self.fetched_at, self.error = df, time.time(), None
+            try: save_snapshot(df, self.path)
+            except Exception: pass
+        except Exception as e:
+            with self._lock:
+                self._failed(e)
+        finally:
+            with self._lock:
+                self._refreshing = False
+            self._refresh_done.set()
+
+    def get(self):
+        with self._lock:
+            if self.data is None:
+                self.data, self.fetched_at = load_snapshot(self.path)
+            cold = self.data is None
+            now = time.time()
+            if now - self.fetched_at > self.max_age and now >= self.retry_at and not self._refreshing:
+                try:
+                    conn = get_connection()
+                    self._refreshing = True
+                    self._refresh_done.clear()
+                    threading.Thread(target=self._refresh, args=(conn,), daemon=True).start()
+                except Exception as e:
+                    self._failed(e)
+                    cold = False
+        # Only a cold start with no snapshot waits, and never longer than cold_timeout
+        if cold:
+            self._refresh_done.wait(self.cold_timeout)
+        with self._lock:
+            return self.data if self.data is not None else pd.DataFrame()
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_sheet(spreadsheet, worksheet, max_age=600):
+    with _caches_lock:
+        key = (spreadsheet, worksheet)
+        if key not in _caches:
+            _caches[key] = SheetCache(spreadsheet, worksheet, max_age=max_age)
+        return _caches[key]
+
+
+def drop_sheet(spreadsheet, worksheet):
+    # Frees a cached worksheet (e.g. when its location is unloaded); its disk snapshot stays
+    with _caches_lock: _caches.pop((spreadsheet, worksheet), None)
+
+
+# --- INCREMENTAL SHEET MIRROR ---
+# Append-only worksheets (Assets, Expenses) are mirrored into SQLite. A sync is one range request
+# for the header row plus the rows past the high-water mark (rows_seen counts raw sheet rows, blank
+# ones included, so it lines up with sheet row numbers). Headers are re-normalized, and the table
+# rebuilt, only when the header row changes; a periodic full reload picks up edits and deleted rows.
+# With public-URL access there are no range reads, so each sync is one full CSV download instead.
+MIRROR_DB = os.path.join(SNAPSHOT_DIR, "mirror.sqlite")
+
+
+def normalize_header(columns):
+    return [str(c).strip().lower() for c in columns]
+
+
+class SheetMirror:
+    def __init__(self, spreadsheet, worksheet, min_interval=30, full_every=3600, db_path=MIRROR_DB):
+        self.spreadsheet, self.worksheet = spreadsheet, worksheet
+        self.min_interval, self.full_every, self.db_path = min_interval, full_every, db_path
+        self.table = "ws_" + hashlib.sha1(f"{spreadsheet}|{worksheet}".encode()).hexdigest()[:16]
+        self.data, self.header, self.rows_seen = None, None, 0
+        self.synced_at, self.full_at, self.retry_at, self.error = 0.0, 0.0, 0.0, None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        db = sqlite3.connect(self.db_path)
+        db.execute("CREATE TABLE IF NOT EXISTS sheet_meta (name TEXT PRIMARY KEY, header TEXT, rows_seen INTEGER, full_at REAL)")
+        return db
+
+    def _load(self):
+        # Cold start: serve whatever the last sync left on disk
+        try:
+            with closing(self._db()) as db:
+                row = db.execute("SELECT header, rows_seen, full_at FROM sheet_meta WHERE name = ?", (self.table,)).fetchone()
+                if row:
+                    self.data = pd.read_sql(f'SELECT * FROM "{self.table}"', db)
+                    self.header, self.rows_seen, self.full_at = json.loads(row[0]), row[1], row[2]
+        except Exception:
+            self.data = None
+        if self.data is None: self.data = pd.DataFrame()
+
+    def _store(self, df, replace):
+        with closing(self._db()) as db, db:
+            if replace or not df.empty:
+                df.to_sql(self.table, db, if_exists="replace" if replace else "append", index=False)
+            db.execute("INSERT OR REPLACE INTO sheet_meta VALUES (?, ?, ?, ?)", (self.table, json.dumps(self.header), self.rows_seen, self.full_at))
+
+    def sync(self, conn, full=False):
+        full = full or self.header is None or time.time() - self.full_at > self.full_every
+        if not full:
+            header, rows = fetch_rows(conn, self.spreadsheet, self.worksheet, self.rows_seen + 2, len(self.header))
+            full = header != self.header
+        if full:
+            header, rows = fetch_rows(conn, self.spreadsheet, self.worksheet)
+        df = _frame(header, rows)
+        if full:
+            self.header, self.rows_seen, self.full_at = header, len(rows), time.time()
+            self._store(df, replace=True)
+            self.data = df
+        else:
+            self.rows_seen += len(rows)
+            self._store(df, replace=False)
+            if not df.empty: self.data = pd.concat([self.data, df], ignore_index=True)
+        self.synced_at, self.error = time.time(), None
+        return len(df)
+
+    def get(self, conn=None):
+        # A sync already in progress (possibly hung on the network) is not waited on: callers get the
+        # mirror as it stands, so late readers don't pile up on the lock and tie up the fetch pool
+        if not self._lock.acquire(blocking=False): return self.peek()
+        try:
+            if self.data is None: self._load()
+            now = time.time()
+            if now - self.synced_at > self.min_interval and now >= self.retry_at:
+                try: self.sync(conn or get_connection())
+                except Exception as e:
+                    # Keep serving the mirror and back off before asking Google again
+                    self.error, self.retry_at = e, now + 60
+            return self.data
+        finally:
+            self._lock.release()
+
+    def refresh(self, conn):
+        # Sync now, regardless of min_interval (used by writers that need the live header/keys)
+        with self._lock:
+            if self.data is None: self._load()
+            return self.sync(conn)
+
+    def peek(self):
+        # Whatever is mirrored right now, without syncing or waiting on a sync in progress
+        data = self.data
+        return data if data is not None else pd.DataFrame()
+
+    def invalidate(self):
+        # Force the next get() to sync, e.g. right after this app appended a row
+        with self._lock:
+            self.synced_at = self.retry_at = 0.0
+
+
+_mirrors = {}
+
+
+def get_mirror(spreadsheet, worksheet, min_interval=30):
+    with _caches_lock:
+        key = (spreadsheet, worksheet)
+        if key not in _mirrors:
+            _mirrors[key] = SheetMirror(spreadsheet, worksheet, min_interval=min_interval)
+        return _mirrors[key]
+
+
+# --- PARALLEL FETCH ---
+# Worksheet reads are network-bound, so a page that needs several issues them together on a shared
+# pool and pays for the slowest one instead of the sum. Each sheet has its own deadline; a sheet that
+# fails or runs late falls back on its own (last mirrored data) and the others are unaffected.
+_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="sheets")
+
+
+def _in_script_context(fn):
+    ctx = get_script_run_ctx()
+    def run():
+        if ctx is not None: add_script_run_ctx(threading.current_thread(), ctx)
+        return fn()
+    return run
+
+
+def prefetch(fn):
+    # Fire and forget, e.g. warming a sheet cache before its tab is opened
+    return _pool.submit(_in_script_context(fn))
+
+
+def fetch_all(loaders, timeout=8.0, fallbacks=None):
+    # {name: callable} -> ({name: DataFrame}, {name: exception}); timeout is seconds, or {name: seconds}
+    start = time.monotonic()
+    futures = {name: _pool.submit(_in_script_context(fn)) for name, fn in loaders.items()}
+    results, errors = {}, {}
+    for name, future in futures.items():
+        limit = timeout[name] if isinstance(timeout, dict) else timeout
+        try: results[name] = future.result(max(0.0, start + limit - time.monotonic()))
+        except FutureTimeout: errors[name] = TimeoutError(f"{name} took longer than {limit:g}s")
+        except Exception as e: errors[name] = e
+        if name in errors:
+            fallback = (fallbacks or {}).get(name)
+            try: results[name] = fallback() if fallback else pd.DataFrame()
+            except Exception: results[name] = pd.DataFrame()
+    return results, errors
+
+
+def append_rows(conn, worksheet, rows, spreadsheet=None):
+    # One API call per batch; rows are dicts in the sheet's column order
+    ws = open_worksheet(conn, spreadsheet, worksheet)
+    if ws is None: raise PermissionError("appending needs service-account access; the public-URL connection is read-only")
+    ws.append_rows([list(r.values()) for r in rows], value_input_option="USER_ENTERED")
+
+class FakeConnection:
+    # Offline stand-in for GSheetsConnection. Worksheets are DataFrames; read() goes through a CSV
+    # round trip like the public-URL export, worksheet() hands out FakeWorksheets for the values API,
+    # and every read is counted so callers can check how many API calls a sync cost.
+    def __init__(self, worksheets=None, latency=0.0):
+        self.worksheets = {k: v.copy() for k, v in (worksheets or {}).items()}
+        self.latency, self.reads = latency, 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        source, latency = os.environ.get(FAKE_ENV, "1"), float(os.environ.get(FAKE_ENV + "_LATENCY_MS", 0)) / 1000
+        if os.path.isdir(source):
+            return cls({f[:-4]: pd.read_csv(os.path.join(source, f)) for f in os.listdir(source) if f.endswith(".csv")}, latency)
+        return cls(sample_worksheets(), latency)
+
+    def read(self, spreadsheet=None, worksheet=None, ttl=None, **options):
+        if self.latency: time.sleep(self.latency)
+        with self._lock:
+            self.reads += 1
+            csv = self.worksheets[worksheet].to_csv(index=False)
+        return pd.read_csv(io.StringIO(csv), **options)
+
+    def worksheet(self, name):
+        if name not in self.worksheets: raise KeyError(name)
+        return FakeWorksheet(self, name)
+
+    def grid(self, worksheet):
+        # The sheet as the values API returns it: header + rows of strings, trailing blanks trimmed
+        if self.latency: time.sleep(self.latency)
+        with self._lock:
+            self.reads += 1
+            df = self.worksheets[worksheet]
+            rows = [["" if pd.isna(v) else str(v) for v in r] for r in df.itertuples(index=False)]
+        rows = [r[:max((i + 1 for i, v in enumerate(r) if v != ""), default=0)] for r in rows]
+        while rows and not rows[-1]: rows.pop()
+        return [[str(c) for c in df.columns]] + rows
+
+    def append(self, worksheet, rows):
+        # rows: lists in column order
+        with self._lock:
+            df = self.worksheets[worksheet]
+            self.worksheets[worksheet] = pd.concat([df, pd.DataFrame([r[:len(df.columns)] for r in rows], columns=df.columns)], ignore_index=True)
+
+    def update(self, spreadsheet=None, worksheet=None, data=None):
+        with self._lock:
+            self.worksheets[worksheet] = data.copy()
+        return data
+
+
+class FakeWorksheet:
+    # The slice of gspread's Worksheet API the mirror and the expense queue use
+    def __init__(self, conn, name):
+        self.conn, self.title = conn, name
+
+    def get_all_values(self):
+        return self.conn.grid(self.title)
+
+    def append_rows(self, rows, value_input_option=None):
+        self.conn.append(self.title, rows)
+
+    @property
+    def row_count(self):
+        # The grid fits the data exactly, as it does for a sheet that only grows through append_rows
+        return len(self.conn.worksheets[self.title]) + 1
+
+    def batch_get(self, ranges):
+        # One read for all ranges; supports "1:1" and "A<row>:<col>" forms. Like the API, a range
+        # starting below the grid is an error rather than an empty result.
+        grid, out = self.conn.grid(self.title), []
+        for a1 in ranges:
+            m = re.fullmatch(r"([A-Z]*)(\d*):([A-Z]*)(\d*)", a1)
+            first, last = int(m.group(2) or 1), int(m.group(4)) if m.group(4) else len(grid)
+            if first > self.row_count:
+                raise ValueError(f"Range ('{self.title}'!{a1}) exceeds grid limits. Max rows: {self.row_count}")
+            width = sum((ord(c) - 64) * 26 ** i for i, c in enumerate(reversed(m.group(3)))) or None
+            out.append([r[:width] for r in grid[first - 1:last]])
+        return out
+
+
+def sample_worksheets(docs=1200, expenses=2000, seed=0):
+    # Deterministic stand-ins for the real worksheets, sized like a busy season
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    kinds = np.array(["SOP", "Invoice", "Checklist", "Contract", "Menu"])
+    topics = np.array(["Oven", "Dough", "Closing", "Opening", "US Foods", "Catering", "Cleaning", "Truck"])
+    accounts = ["Chase Checking", "Amex Business", "Square Savings"]
+    return {
+        "Vault_Index": pd.DataFrame({
+            "Document Name": [f"{k} {t} {i}" for i, (k, t) in enumerate(zip(rng.choice(kinds, docs), rng.choice(topics, docs)))],
+            "Link": [f"https://drive.google.com/file/d/doc{i}" for i in range(docs)],
+        }),
+        "Assets": pd.DataFrame({"Account Name": accounts + ["Walk-in Cooler"], "Type": ["Bank", "Liquid", "Bank", "Equipment"],
+                                "Balance": ["$12,500.00", "$-1,820.55", "$4,000", "$8,000"]}),
+        "Expenses": pd.DataFrame({
+            "Date": pd.date_range("2026-01-01", periods=expenses, freq="3h").strftime("%Y-%m-%d"),
+            "Item": rng.choice(["Flour", "Mozzarella", "Boxes", "Propane", "Payroll", "Rent"], expenses),
+            "Cost": np.round(rng.gamma(2.0, 60.0, expenses), 2),
+            "Category": rng.choice(["Inventory", "Labor", "Rent", "Other"], expenses),
+            "Payment Method": rng.choice(accounts + ["Cash"], expenses),
+            "Entry ID": [f"seed{i}" for i in range(expenses)],
+        }),
+    }
@@ -0,0 +1,76 @@
+import functools
+import hashlib
+import html
+import os
+import re
+
+import streamlit as st
+
+# --- HTML/CSS TEMPLATE LAYER ---
+# Static fragments are compiled once per process; rendered fragments are cached on their inputs.
+# The stylesheet is served from static/ (browser-cached) so each rerun only sends a <link> tag.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+
+def minify_css(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};,])\s*", r"\1", css).strip()
+
+
+@functools.lru_cache(maxsize=1)
+def _stylesheet():
+    with open(os.path.join(STATIC_DIR, "app.css"), encoding="utf-8") as f:
+        css = minify_css(f.read())
+    return css, hashlib.sha1(css.encode()).hexdigest()[:10]
+
+
+def page_style_html():
+    css, version = _stylesheet()
+    try: static_serving = st.get_option("server.enableStaticServing")
+    except Exception: static_serving = False
+    if static_serving:
+        return f'<link rel="stylesheet" href="app/static/app.css?v={version}">'
+    return "<style>" + css.replace("url('fonts/", "url('app/static/fonts/") + "</style>"
+
+
+QUICK_LINKS_HTML = """<div class="quick-links-container">
+<a href="https://www3.usfoods.com/order" target="_blank" class="quick-link-card"><svg width="35" height="35" viewBox="0 0 24 24" fill="none" stroke="#c5a059" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M21 16V8a2 2 0 0 0-1-1.73l-7-4a2 2 0 0 0-2 0l-7 4A2 2 0 0 0 3 8v8a2 2 0 0 0 1 1.73l7 4a2 2 0 0 0 2 0l7-4A2 2 0 0 0 21 16z"></path><polyline points="3.27 6.96 12 12.01 20.73 6.96"></polyline><line x1="12" y1="22.08" x2="12" y2="12"></line></svg>US Foods</a>
+<a href="https://qbo.intuit.com" target="_blank" class="quick-link-card"><svg width="35" height="35" viewBox="0 0 24 24" fill="none" stroke="#c5a059" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><rect x="2" y="3" width="20" height="14" rx="2" ry="2"></rect><line x1="8" y1="21" x2="16" y2="21"></line><line x1="12" y1="17" x2="12" y2="21"></line></svg>QuickBooks</a>
+</div>"""
+
+
+@functools.lru_cache(maxsize=64)
+def calendar_html(cells, month_view=False):
+    # cells: ((day_name, day_num, muted, ((title, time_label, type), ...)), ...) in 7-day rows
+    parts = [f'<div class="calendar-frame{" calendar-month" if month_view else ""}"><div class="weekly-calendar-grid">']
+    for day_name, day_num, muted, events in cells:
+        parts.append(f'<div class="calendar-day{" muted" if muted else ""}"><div class="day-header">{day_name} <span class="day-number">{day_num}</span></div>')
+        parts.extend(f'<div class="event-card {html.escape(ev_type)}">{html.escape(title)}<span class="time">{html.escape(time)}</span></div>' for title, time, ev_type in events)
+        parts.append('</div>')
+    parts.append('</div></div>')
+    return "".join(parts)
+
+
+@functools.lru_cache(maxsize=128)
+def vault_html(docs):
+    # docs: ((name, link), ...) for one page of results
+    cards = "".join(f'<a href="{html.escape(link)}" target="_blank" class="doc-card"><div class="doc-title">{html.escape(name)}</div></a>' for name, link in docs)
+    return f'<div class="vault-grid">{cards}</div>'
+
+
+@functools.lru_cache(maxsize=256)
+def quote_html(order_items, gross_subtotal, discount_amount, event_fee, menu_ext_fee, apply_tax, tax_amount, apply_cc, cc_fee_amount, final_quote, profit, margin, tax_line, cc_fee_line):
+    # order_items: ((label, total), ...)
+    parts = ['<div class="quote-box"><div class="quote-header">Custom Catering Proposal</div>\n<div style="color: #b0b0b0; margin-bottom: 15px; font-weight: 600;">ORDER SUMMARY</div>']
+    parts.extend(f'<div class="quote-row"><span>{label}</span> <span>${total:,.2f}</span></div>\n' for label, total in order_items)
+    parts.append(f'\n<div class="quote-row"><span>Food & Beverage Subtotal</span> <span>${gross_subtotal:,.2f}</span></div>')
+    if discount_amount > 0: parts.append(f'\n<div class="quote-row" style="color: #da3633;"><span>Discount</span> <span>-${discount_amount:,.2f}</span></div>')
+    parts.append(f'\n<div class="quote-row"><span>Setup / Travel Fee</span> <span>${event_fee:,.2f}</span></div>')
+    if menu_ext_fee > 0: parts.append(f'\n<div class="quote-row"><span>Menu Extension Fee</span> <span>${menu_ext_fee:,.2f}</span></div>')
+    if apply_tax: parts.append(f'\n<div class="quote-row"><span>{html.escape(tax_line)}</span> <span>${tax_amount:,.2f}</span></div>')
+    if apply_cc: parts.append(f'\n<div class="quote-row"><span>{html.escape(cc_fee_line)}</span> <span>${cc_fee_amount:,.2f}</span></div>')
+    parts.append(f"""\n<div class="quote-row total"><span>Total Client Quote</span> <span>${final_quote:,.2f}</span></div>
+<div style="margin-top: 20px; padding: 15px; background-color: #121212; border-radius: 6px; border-left: 4px solid #c5a059;">
+<div class="quote-row profit" style="margin-bottom: 0;"><span>Projected Net Profit</span> <span>${profit:,.2f} ({margin:.1f}%)</span></div></div></div>""")
+    return "".join(parts)
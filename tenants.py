@@ -0,0 +1,104 @@
+import collections
+import json
+import os
+import threading
+
+import streamlit as st
+
+from calendar_store import EventStore, weekly
+
+# --- LOCATIONS (TENANTS) ---
+# Every kitchen is one entry in data/tenants.json (or the file named by CCK_TENANTS): its PIN,
+# Google Sheet, catalog file (menu prices plus package, beverage, tax and card-fee rates) and
+# standing calendar. A session picks its location at the PIN gate and keeps the id in
+# session_state. Each location's resources (calendar store, Vault sheet and search index) are built
+# on first use and shared read-only by that location's sessions; at most MAX_LOADED locations stay
+# loaded, least recently used first out. Catalogs are shared by fingerprint, so locations on the
+# same menu hold one copy, and each location has its own sheet cache and lock, so a slow sheet only
+# holds up its own sessions. The catalog, sheet and Vault modules are imported on first use so the
+# PIN gate can render without pandas or the Sheets client.
+TENANTS_PATH = os.environ.get("CCK_TENANTS") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "tenants.json")
+DATA_DIR = os.path.dirname(TENANTS_PATH)
+SESSION_KEY = "tenant"
+MAX_LOADED = 4
+VAULT_WORKSHEET = "Vault_Index"
+
+
+class Tenant:
+    def __init__(self, tenant_id, spec):
+        self.id, self.name, self.pin = tenant_id, spec["name"], spec["pin"]
+        self.sheet_url = spec["sheet_url"]
+        self.catalog_path = os.path.join(DATA_DIR, spec.get("catalog", "catalog_v1.json"))
+        self.schedule = [tuple(s) for s in spec.get("schedule", [])]
+        self._lock = threading.Lock()
+        self._store, self._index = None, (None, None)
+
+    @property
+    def catalog(self):
+        # One stat per call, so an edited catalog file is picked up (catalog.get_catalog)
+        from catalog import get_catalog
+        return get_catalog(self.catalog_path)
+
+    @property
+    def event_store(self):
+        # Standing weekly schedule plus anything imported from .ics (kept in the cache dir)
+        from sheets import SNAPSHOT_DIR
+        with self._lock:
+            if self._store is None:
+                self._store = EventStore([weekly(*s) for s in self.schedule], path=os.path.join(SNAPSHOT_DIR, f"calendar-{self.id}.sqlite"))
+            return self._store
+
+    @property
+    def vault(self):
+        from sheets import get_sheet
+        return get_sheet(self.sheet_url, VAULT_WORKSHEET, max_age=600)
+
+    def vault_index(self, df):
+        # The sheet cache hands back the same DataFrame until it refreshes, so identity is the cache key
+        from vault import VaultIndex
+        with self._lock:
+            if self._index[0] is not df: self._index = (df, VaultIndex(df))
+            return self._index[1]
+
+    def unload(self):
+        from sheets import drop_sheet
+        drop_sheet(self.sheet_url, VAULT_WORKSHEET)
+        with self._lock: self._store, self._index = None, (None, None)
+
+
+def load_specs(path=TENANTS_PATH):
+    with open(path, encoding="utf-8") as f:
+        spec = json.load(f)
+    if spec.get("version") != 1: raise ValueError(f"tenants file version {spec.get('version')!r}, expected 1")
+    return spec["tenants"]
+
+
+_specs = load_specs()
+_loaded = collections.OrderedDict()
+_loaded_lock = threading.Lock()
+
+
+def locations():
+    # {tenant id: display name}, in file order
+    return {tid: spec["name"] for tid, spec in _specs.items()}
+
+
+def authenticate(tenant_id, pin):
+    spec = _specs.get(tenant_id)
+    return spec is not None and pin == spec["pin"]
+
+
+def get_tenant(tenant_id):
+    with _loaded_lock:
+        tenant = _loaded.get(tenant_id)
+        if tenant is None:
+            tenant = _loaded[tenant_id] = Tenant(tenant_id, _specs[tenant_id])
+        _loaded.move_to_end(tenant_id)
+        evicted = [_loaded.popitem(last=False)[1] for _ in range(len(_loaded) - MAX_LOADED)]
+    for old in evicted: old.unload()
+    return tenant
+
+
+def current():
+    # The signed-in session's location (the first one before sign-in)
+    return get_tenant(st.session_state.get(SESSION_KEY) or next(iter(_specs)))
@@ -0,0 +1,27 @@
+import pandas as pd
+
+from analytics import ExpenseRollups
+
+
+def rows(*specs):
+    return pd.DataFrame([{"date": d, "cost": c, "category": "Inventory", "payment method": "Cash", "entry id": k} for d, c, k in specs])
+
+
+def test_weeks_run_monday_to_sunday():
+    r = ExpenseRollups()
+    r.update(rows(("2026-10-11", 1.0, "a"), ("2026-10-12", 2.0, "b"), ("2026-10-18", 4.0, "c")))
+    weekly = r.trend("Weekly", "category")["Inventory"]
+    assert weekly.to_dict() == {pd.Timestamp("2026-10-05"): 1.0, pd.Timestamp("2026-10-12"): 6.0}
+    compare, current, previous = r.compare("Weekly", "category", today="2026-10-14")
+    assert current == pd.Timestamp("2026-10-12") and compare.loc["Inventory", "Current"] == 6.0
+
+
+def test_pending_rows_are_an_overlay_not_folded():
+    r = ExpenseRollups()
+    synced = rows(("2026-10-12", 1.0, "a"))
+    r.update(synced, generation=1)
+    assert r.snapshot(rows(("2026-10-12", 10.0, "q"))).totals("category")["Inventory"] == 11.0
+    # The queued row lands on the sheet together with a row someone else appended
+    synced = pd.concat([synced, rows(("2026-10-12", 100.0, "x"), ("2026-10-12", 10.0, "q"))], ignore_index=True)
+    assert r.update(synced, generation=1) == 2
+    assert r.snapshot(rows()).totals("category")["Inventory"] == 111.0
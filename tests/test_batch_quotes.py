@@ -0,0 +1,11 @@
+import pandas as pd
+
+from batch_quotes import normalize_events
+
+
+def test_bad_cells_are_reported_not_raised():
+    events = pd.DataFrame({"client": ["Ann", "Bo", "Cy"], "adults": ["40", "forty", 25], "kids": [5, 3, -2],
+                           "setup_fee": ["$150", "150", "n/a"]})
+    rows, bad = normalize_events(events)
+    assert [(r["client_name"], r["adults"], r["event_fee"]) for r in rows] == [("Ann", 40, 150.0)]
+    assert bad == [(3, "bad adults 'forty'"), (4, "bad kids -2, setup_fee 'n/a'")]
@@ -0,0 +1,12 @@
+import os
+
+import branding
+import quote_pdf
+
+
+def test_logo_is_found_from_any_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    branding.logo_path.cache_clear(); branding.logo_bytes.cache_clear(); quote_pdf.load_logo.cache_clear()
+    path, parsed = quote_pdf.load_logo()
+    assert path == os.path.join(branding.APP_DIR, "logo.png")
+    assert parsed and branding.logo_bytes()
@@ -0,0 +1,66 @@
+import datetime
+
+from calendar_store import CalendarEvent, EventStore, weekly
+
+D = datetime.date
+
+
+def test_monthly_count_skips_short_months_without_using_them_up():
+    ev = CalendarEvent("Rent", D(2026, 1, 31), rrule={"freq": "MONTHLY", "interval": 1, "until": None, "count": 3})
+    assert list(ev.occurrences(D(2026, 1, 1), D(2026, 12, 31))) == [D(2026, 1, 31), D(2026, 3, 31), D(2026, 5, 31)]
+
+
+def test_imported_events_persist_but_schedule_does_not(tmp_path):
+    path = str(tmp_path / "calendar.sqlite")
+    rule = {"freq": "MONTHLY", "interval": 2, "until": D(2026, 12, 31), "count": None}
+    store = EventStore([weekly("Prep", 0, "9:00 AM", "operational")], path=path)
+    assert store.add(CalendarEvent("Festival", D(2026, 6, 6), datetime.time(11), datetime.time(19), "major-event"))
+    assert store.add(CalendarEvent("Tasting", D(2026, 1, 15), type="product", rrule=rule))
+
+    reopened = EventStore(path=path)
+    titles = {ev.title: ev for ev in reopened._single + reopened._recurring}
+    assert set(titles) == {"Festival", "Tasting"}
+    assert titles["Festival"].end == datetime.time(19) and titles["Tasting"].rrule == rule
+    assert not reopened.add(CalendarEvent("Festival", D(2026, 6, 6), datetime.time(11)))
+
+
+def test_ics_export_keeps_local_time_across_dst(tmp_path):
+    store = EventStore([weekly("Prep", 0, "9:00 AM", "operational")])
+    text = store.to_ics()
+    assert "DTSTART;TZID=America/New_York:20260105T090000" in text
+
+    copy = EventStore()
+    assert copy.import_ics(text) == (1, [])
+    summer = copy.between(D(2026, 7, 6), D(2026, 7, 6))
+    assert [(ev.title, ev.start) for ev in summer[D(2026, 7, 6)]] == [("Prep", datetime.time(9))]
+
+
+ICS = """BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:test
+BEGIN:VEVENT
+UID:standup@test
+SUMMARY:Standup
+DTSTART;TZID=America/New_York:20261005T090000
+RRULE:FREQ=WEEKLY;BYDAY=MO,WE,FR
+EXDATE;TZID=America/New_York:20261012T090000
+END:VEVENT
+BEGIN:VEVENT
+UID:pulse@test
+SUMMARY:Pulse
+DTSTART:20261005T130000Z
+RRULE:FREQ=HOURLY
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+def test_byday_and_exdate_are_expanded_and_persisted(tmp_path):
+    path = str(tmp_path / "calendar.sqlite")
+    added, rejected = EventStore(path=path).import_ics(ICS)
+    assert added == 1 and [title for title, _ in rejected] == ["Pulse"]
+
+    for store in (EventStore(path=path), EventStore()):
+        if not len(store): store.import_ics(EventStore(path=path).to_ics())  # and through an .ics round trip
+        days = store.between(D(2026, 10, 5), D(2026, 10, 18))
+        assert [d for d, evs in days.items() if evs] == [D(2026, 10, 5), D(2026, 10, 7), D(2026, 10, 9), D(2026, 10, 14), D(2026, 10, 16)]
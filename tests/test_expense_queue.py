@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+
+from expense_queue import ExpenseQueue, MissingKeyColumn
+from sheets import FakeConnection, SheetMirror
+
+ROW = {"Date": "2026-10-01", "Item": "Flour", "Cost": 42.5, "Category": "Inventory", "Payment Method": "Cash"}
+
+
+@pytest.fixture
+def make_queue(tmp_path, monkeypatch):
+    # No background worker: tests drive flush() themselves
+    monkeypatch.setattr(ExpenseQueue, "start", lambda self: None)
+
+    def make(conn):
+        mirror = SheetMirror(None, "Expenses", min_interval=0, db_path=str(tmp_path / "mirror.sqlite"))
+        return ExpenseQueue(db_path=str(tmp_path / "journal.sqlite"), conn=conn, mirror=mirror)
+    return make
+
+
+def sheet(with_key=True):
+    cols = list(ROW) + (["Entry ID"] if with_key else [])
+    return FakeConnection({"Expenses": pd.DataFrame(columns=cols)})
+
+
+def test_flush_appends_in_header_order_and_ignores_double_submits(make_queue):
+    conn = sheet()
+    queue = make_queue(conn)
+    assert queue.enqueue(ROW, key="k1") and not queue.enqueue(ROW, key="k1")
+    assert queue.flush() == 1
+    landed = conn.worksheets["Expenses"]
+    assert landed["Entry ID"].tolist() == ["k1"] and landed["Item"].tolist() == ["Flour"]
+    assert queue.stats()["pending"] == 0 and queue.flush() == 0
+
+
+def test_restart_after_unrecorded_append_does_not_duplicate(make_queue):
+    conn = sheet()
+    queue = make_queue(conn)
+    queue.enqueue(ROW, key="k1")
+    queue._mark = lambda *a, **k: None  # process dies before the journal records the flush
+    queue.flush()
+    restarted = make_queue(conn)
+    restarted.flush()
+    assert conn.worksheets["Expenses"]["Entry ID"].tolist() == ["k1"]
+    assert restarted.stats()["pending"] == 0
+
+
+def test_missing_key_column_sends_nothing(make_queue):
+    conn = sheet(with_key=False)
+    queue = make_queue(conn)
+    queue.enqueue(ROW, key="k1")
+    assert queue.flush() == 0
+    assert isinstance(queue.stats()["error"], MissingKeyColumn)
+    assert conn.worksheets["Expenses"].empty and queue.stats()["pending"] == 1
+
+
+def test_expenses_reads_through_pending_rows(make_queue):
+    queue = make_queue(sheet())
+    queue.enqueue(ROW, key="k1")
+    assert queue.expenses()["entry id"].tolist() == ["k1"]
+    queue.flush()
+    assert queue.expenses()["entry id"].tolist() == ["k1"]
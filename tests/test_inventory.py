@@ -0,0 +1,18 @@
+import os
+
+import numpy as np
+
+from catalog import get_catalog
+from inventory import mix_matrix
+from tenants import DATA_DIR
+
+
+def test_house_mix_follows_the_package():
+    catalog = get_catalog(os.path.join(DATA_DIR, "catalog_v1.json"))
+    mix = mix_matrix(catalog, [[], [], ["The Carnivore"]], [6, 6, 4], [0, 0, 0],
+                     ["Classic ($17/head)", "Premium ($22/head)", "Classic ($17/head)"])
+    served = lambda row: {r for r, pies in zip(catalog.recipes, mix[row]) if pies}
+    assert served(0) == {"The Plain Jane", "The Premium Pepperoni", "The Bianco Veggie"}
+    assert len(served(1)) > 3 and not any(r.startswith("Kids") for r in served(1))
+    assert served(2) == {"The Carnivore"}
+    np.testing.assert_allclose(mix.sum(axis=1), [6, 6, 4])
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ledger import build_ledger, normalize_columns
+
+
+def clean_currency(value):
+    # The dashboard's old per-cell parser, kept here as the reference
+    if pd.isna(value) or value == "": return 0.0
+    if isinstance(value, (int, float)): return float(value)
+    s = str(value).replace('$', '').replace(',', '').strip()
+    try: return float(s) if s else 0.0
+    except: return 0.0
+
+
+def old_ledger(assets, expenses):
+    # The dashboard's old row loop over to_dict('records')
+    assets = [{k.strip().lower(): v for k, v in row.items()} for row in assets.to_dict('records')]
+    expenses = [{k.strip().lower(): v for k, v in row.items()} for row in expenses.to_dict('records')]
+    liquid, live_balances = 0.0, {}
+    for a in assets:
+        atype = str(a.get('type', '')).lower()
+        if any(x in atype for x in ['liquid', 'bank', 'cash']):
+            name = a.get('account name') or a.get('name') or 'Unknown'
+            bal = clean_currency(a.get('balance', 0))
+            live_balances[name] = bal
+            liquid += bal
+    total_exp, cat_data = 0.0, {}
+    for e in expenses:
+        cost = clean_currency(e.get('cost', 0))
+        if cost > 0:
+            total_exp += cost
+            c = e.get('category', 'Other')
+            cat_data[c] = cat_data.get(c, 0) + cost
+            method = str(e.get('payment method', '')).lower()
+            for bank in live_balances:
+                if bank.lower() in method:
+                    live_balances[bank] -= cost
+                    liquid -= cost
+    return {"liquid": liquid, "live_balances": live_balances, "total_exp": total_exp, "cat_data": cat_data}
+
+
+ASSETS = pd.DataFrame({
+    "Account Name": ["Chase", "Amex", "Cash Box", "Oven", "Chase"],
+    " Type ": ["Bank", "Liquid", "cash", "Equipment", "bank"],
+    "Balance": ["$1,200.50", 300, "", "$9,000", "2,000"],
+})
+EXPENSES = pd.DataFrame({
+    "Item": ["flour", "cheese", "tip jar", "gas", "refund", "boxes", "odd"],
+    "Cost": ["$45.10", 12.5, "", "1,020", -30, "$7", "n/a"],
+    "Category": ["Inventory", "Inventory", "Other", "Rent", "Other", "Inventory", "Other"],
+    "Payment Method": ["Chase Debit", "amex", "Cash Box", "Chase / Amex split", "Chase", np.nan, "Chase"],
+})
+
+
+@pytest.mark.parametrize("expenses", [EXPENSES, EXPENSES.iloc[:0]], ids=["expenses", "no expenses"])
+def test_matches_the_old_row_loop(expenses):
+    new = build_ledger(normalize_columns(ASSETS), normalize_columns(expenses))
+    old = old_ledger(ASSETS, expenses)
+    assert new["liquid"] == pytest.approx(old["liquid"]) and new["total_exp"] == pytest.approx(old["total_exp"])
+    assert new["live_balances"] == pytest.approx(old["live_balances"])
+    assert new["cat_data"] == pytest.approx(old["cat_data"])
+    if len(expenses): assert new["live_balances"]["Amex"] == pytest.approx(300 - 12.5 - 1020)  # "Chase / Amex split" hits both
@@ -0,0 +1,46 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from catalog import get_catalog
+from pizza_optimizer import pareto_builds, portion_grid
+
+FIXED = {"14\" Dough Ball": 1.0, "House Pizza Sauce": 8.0}
+RANGES = {"Grande Mozzarella": (8.0, 14.0), "Premium Sliced Pepperoni": (0.0, 4.0), "Candied Bacon": (0.0, 3.0)}
+
+
+def test_frontier_is_exactly_the_non_dominated_builds_within_budget():
+    catalog = get_catalog()
+    df, stats = pareto_builds(catalog, FIXED, RANGES, price=24.0, target_margin=70.0)
+
+    # Brute force over the same 0.5 oz grid
+    grids = [np.arange(lo, hi + 0.25, 0.5) for lo, hi in RANGES.values()]
+    builds = []
+    for oz in itertools.product(*grids):
+        cost = catalog.cost({**FIXED, **dict(zip(RANGES, oz))})
+        if cost <= stats["budget"] + 1e-9: builds.append((cost, sum(oz), oz))
+    frontier = {oz for cost, weight, oz in builds
+                if not any((c <= cost and w >= weight) and (c < cost or w > weight) for c, w, _ in builds)}
+
+    got = {tuple(row) for row in df[[f"{n} (oz)" for n in RANGES]].to_numpy()}
+    assert got == frontier and len(frontier) > 1
+    assert stats["within_budget"] == len(builds) and stats["searched"] == np.prod([len(g) for g in grids])
+    assert (df["Food Cost"] <= stats["budget"] + 1e-9).all()
+    assert df["Food Cost"].is_monotonic_increasing and df["Topping oz"].is_monotonic_increasing
+
+
+def test_nothing_fits_a_budget_below_the_base_cost():
+    df, stats = pareto_builds(get_catalog(), FIXED, RANGES, price=3.0, target_margin=80.0)
+    assert df.empty and stats["within_budget"] == 0
+
+
+def test_portion_grid_thins_but_keeps_both_ends():
+    ranges = [(0.0, 20.0), (2.0, 9.5), (4.0, 4.0)]
+    grids = portion_grid(ranges, step=0.5, max_builds=100)
+    assert np.prod([len(g) for g in grids]) <= 100
+    for (lo, hi), g in zip(ranges, grids):
+        assert g[0] == lo and g[-1] == hi
+        assert np.all(np.diff(g) > 0) and np.allclose(g / 0.5, np.round(g / 0.5))
+    assert len(grids[0]) < 41 and len(grids[2]) == 1
+    assert [len(g) for g in portion_grid([(0.0, 2.0)], step=0.5, max_builds=100)] == [5]  # small grids are left alone
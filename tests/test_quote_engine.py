@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from catalog import get_catalog
+from quote_engine import QuoteEngine, engine_for, price_quote
+from templates import quote_html
+
+
+def test_catalog_pricing_matches_the_house_rates():
+    args = (40, 10, "Classic ($17/head)", True, True, True, True, 5.0, 150.0, 25.0)
+    assert engine_for(get_catalog()).price(*args) == price_quote(*args)
+
+
+def test_location_rates_override_the_house_rates():
+    engine = QuoteEngine({"adult_tiers": {"Classic ($19/head)": 19.0, "Deluxe ($30/head)": 30.0}, "tax_rate": 0.0625,
+                          "package_pizzas": {}})
+    q = engine.price(10, 0, "Deluxe ($30/head)", add_adult_bevs=False, event_fee=0.0)
+    assert q["gross_subtotal"] == 300.0 and q["tax_amount"] == pytest.approx(18.75)
+    np.testing.assert_array_equal(engine.adult_food_price(np.array(["Classic ($19/head)", "Deluxe ($30/head)"])), [19.0, 30.0])
+    assert engine.covered_pizzas("Classic ($19/head)") is None
+    with pytest.raises(ValueError): QuoteEngine({"tax": 0.05})
+
+
+def test_tax_and_card_fee_labels_follow_the_rates():
+    engine = QuoteEngine({"tax_rate": 0.0625, "tax_label": "NH Meals Tax", "cc_fee_rate": 0.03})
+    assert (engine.tax_line, engine.cc_fee_line) == ("NH Meals Tax (6.25%)", "Credit Card Fee (3.0%)")
+    q = engine.price(40, 10, "Classic ($17/head)", apply_cc=True)
+    html = quote_html((), q["gross_subtotal"], q["discount_amount"], 150.0, 0.0, True, q["tax_amount"], True, q["cc_fee_amount"],
+                      q["final_quote"], q["profit"], q["margin"], engine.tax_line, engine.cc_fee_line)
+    assert "NH Meals Tax (6.25%)" in html and "Credit Card Fee (3.0%)" in html and "MA Meals Tax" not in html
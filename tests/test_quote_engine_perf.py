@@ -0,0 +1,52 @@
+import timeit
+
+import numpy as np
+import pytest
+
+from quote_engine import ADULT_TIERS, price_quote, quote_engine
+
+# --- QUOTE ENGINE BENCHMARKS ---
+# Timed asserts on the quoting hot paths (marked `perf`, so they only run with CCK_PERF=1 — see
+# conftest.py). Each figure is the best of a few repeats. The equivalence check always runs.
+BUDGETS_MS = {"single quote": 0.25, "100k quotes (vectorized)": 150.0}
+N = 100_000
+
+
+def bench(fn, number, repeat=5):
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1000
+
+
+def season(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "adults": rng.integers(1, 500, n), "kids": rng.integers(0, 200, n),
+        "adult_tier": rng.choice(list(ADULT_TIERS), n),
+        "add_adult_bevs": rng.random(n) < 0.7, "add_kid_bevs": rng.random(n) < 0.7,
+        "apply_tax": rng.random(n) < 0.9, "apply_cc": rng.random(n) < 0.3,
+        "discount_pct": rng.choice([0.0, 5.0, 10.0, 15.0], n),
+        "event_fee": rng.choice([0.0, 150.0, 250.0], n), "menu_ext_fee": rng.choice([0.0, 25.0], n),
+    }
+
+
+@pytest.fixture(scope="module")
+def events():
+    return season(N)
+
+
+@pytest.mark.perf
+def test_single_quote_within_budget():
+    ms = bench(lambda: price_quote(40, 10, "Classic ($17/head)", discount_pct=5.0), number=2000)
+    assert ms <= BUDGETS_MS["single quote"], f"single quote took {ms:.4f} ms"
+
+
+@pytest.mark.perf
+def test_vectorized_season_within_budget(events):
+    ms = bench(lambda: quote_engine.quote(**events), number=1)
+    assert ms <= BUDGETS_MS["100k quotes (vectorized)"], f"100k quotes took {ms:.1f} ms ({N / ms * 1000:,.0f} quotes/s)"
+
+
+def test_vectorized_matches_single_quotes(events):
+    q = quote_engine.quote(**events)
+    for i in range(0, N, N // 50):
+        one = price_quote(**{k: v[i].item() for k, v in events.items()})
+        assert q["final_quote"][i] == pytest.approx(one["final_quote"]) and q["profit"][i] == pytest.approx(one["profit"])
@@ -0,0 +1,50 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from catalog import CATALOG_PATH, get_catalog
+from recipe_engine import RecipeCostEngine
+
+
+@pytest.fixture(scope="module")
+def spec():
+    with open(CATALOG_PATH, encoding="utf-8") as f: return json.load(f)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return RecipeCostEngine(get_catalog())
+
+
+def merged_cost(spec, recipe):
+    # The Recipe Margins tab's old per-recipe pd.merge, kept here as the reference
+    ingredients_data = pd.DataFrame({"Ingredient": list(spec["ingredients"]), "Cost": list(spec["ingredients"].values())})
+    recipes_data = pd.DataFrame([{"Recipe": r, "Ingredient": i, "Ounces": oz} for r, lines in spec["recipes"].items() for i, oz in lines.items()])
+    df_recipe = recipes_data[recipes_data['Recipe'] == recipe].copy()
+    df_recipe['Ingredient'] = df_recipe['Ingredient'].astype(str)
+    merged_recipe = pd.merge(df_recipe, ingredients_data, on="Ingredient", how="left")
+    merged_recipe['Cost'] = pd.to_numeric(merged_recipe['Cost']).fillna(0.0)
+    merged_recipe['Line Cost'] = merged_recipe['Ounces'] * merged_recipe['Cost']
+    return merged_recipe['Line Cost'].sum(), merged_recipe.set_index("Ingredient")["Line Cost"]
+
+
+def test_matrix_costs_match_the_per_recipe_merge(spec, engine):
+    for recipe in spec["recipes"]:
+        cost, lines = merged_cost(spec, recipe)
+        result = engine.lookup(recipe)
+        assert result["cost"] == pytest.approx(cost, rel=1e-12)
+        assert result["lines"].set_index("Ingredient")["Line Cost"].sort_index().to_dict() == pytest.approx(lines[lines > 0].sort_index().to_dict())
+        price = spec["menu"].get(recipe)
+        if price: assert result["margin"] == pytest.approx((price - cost) / price * 100)
+
+
+def test_cost_vector_skips_missing_and_unknown_rows(engine):
+    sheet = pd.DataFrame({"Item ": [" Grande Mozzarella", "Onion", "Truffle Oil", None, "Ricotta Cheese"],
+                          "Unit Cost": ["$0.30", "", "9.99", "1.00", "n/a"]})
+    vector = engine.cost_vector(sheet)
+    expected = engine.unit_costs.copy()
+    expected[engine.ing_index["Grande Mozzarella"]] = 0.30
+    np.testing.assert_array_equal(vector, expected)
+    assert engine.unit_costs[engine.ing_index["Grande Mozzarella"]] != 0.30  # the engine's own costs are untouched
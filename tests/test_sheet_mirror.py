@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sheets import FakeConnection, SheetMirror
+
+
+def expenses(n, start=0):
+    return pd.DataFrame({"Date": ["2026-10-01"] * n, "Item": [f"item {i}" for i in range(start, start + n)],
+                         "Cost": [float(i) for i in range(start, start + n)]})
+
+
+@pytest.fixture
+def conn():
+    return FakeConnection({"Expenses": expenses(3)})
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    return SheetMirror(None, "Expenses", min_interval=0, db_path=str(tmp_path / "mirror.sqlite"))
+
+
+def append(conn, df):
+    conn.worksheets["Expenses"] = pd.concat([conn.worksheets["Expenses"], df], ignore_index=True)
+
+
+def test_incremental_append_fetches_only_new_rows(conn, mirror):
+    mirror.sync(conn)
+    assert len(mirror.data) == 3 and conn.reads == 1
+    append(conn, expenses(2, start=3))
+    assert mirror.sync(conn) == 2
+    assert conn.reads == 2  # header and tail in one request
+    assert mirror.data["item"].tolist() == [f"item {i}" for i in range(5)]
+    assert mirror.sync(conn) == 0 and len(mirror.data) == 5
+
+
+def test_header_change_rebuilds(conn, mirror):
+    mirror.sync(conn)
+    conn.worksheets["Expenses"] = conn.worksheets["Expenses"].assign(Category="Inventory")
+    mirror.sync(conn)
+    assert list(mirror.data.columns) == ["date", "item", "cost", "category"]
+    assert mirror.data["category"].tolist() == ["Inventory"] * 3
+
+
+def test_full_reload_picks_up_edits_and_deletes(conn, mirror):
+    mirror.sync(conn)
+    conn.worksheets["Expenses"] = conn.worksheets["Expenses"].iloc[1:].assign(Item="edited")
+    mirror.sync(conn)
+    assert len(mirror.data) == 3  # incremental sync can't see edits
+    mirror.sync(conn, full=True)
+    assert mirror.data["item"].tolist() == ["edited", "edited"] and mirror.rows_seen == 2
+
+
+def test_blank_rows_do_not_shift_the_high_water_mark(conn, mirror):
+    blank = pd.DataFrame({"Date": [np.nan], "Item": [np.nan], "Cost": [np.nan]})
+    append(conn, pd.concat([blank, expenses(1, start=3)], ignore_index=True))
+    mirror.sync(conn)
+    assert len(mirror.data) == 4 and mirror.rows_seen == 5
+    append(conn, expenses(2, start=4))
+    assert mirror.sync(conn) == 2
+    assert mirror.data["item"].tolist() == [f"item {i}" for i in range(6)]
+
+
+def test_cold_start_resumes_from_disk(conn, mirror):
+    mirror.sync(conn)
+    append(conn, expenses(1, start=3))
+    restarted = SheetMirror(None, "Expenses", min_interval=0, db_path=mirror.db_path)
+    restarted.get(conn)
+    assert restarted.data["item"].tolist() == [f"item {i}" for i in range(4)]
+    assert conn.reads == 2
+
+
+def test_tail_read_past_the_grid_means_no_new_rows(conn, mirror):
+    mirror.sync(conn)
+    ws = conn.worksheet("Expenses")
+    with pytest.raises(ValueError, match="exceeds grid limits"): ws.batch_get(["1:1", f"A{ws.row_count + 1}:C"])
+    assert mirror.sync(conn) == 0 and mirror.error is None and len(mirror.data) == 3
+    append(conn, expenses(1, start=3))
+    assert mirror.sync(conn) == 1 and mirror.data["item"].tolist() == [f"item {i}" for i in range(4)]
+
+
+def test_get_does_not_wait_on_a_sync_in_progress(conn, mirror):
+    mirror.sync(conn)
+    append(conn, expenses(1, start=3))
+    with mirror._lock:  # a sync hung on the network
+        assert len(mirror.get(conn)) == 3 and conn.reads == 1
+    assert len(mirror.get(conn)) == 4
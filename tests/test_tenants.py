@@ -0,0 +1,22 @@
+import datetime
+
+import sheets
+import tenants
+from calendar_store import CalendarEvent
+
+
+def test_imported_events_survive_eviction(tmp_path, monkeypatch):
+    spec = {"name": "Test", "pin": "0000", "sheet_url": "https://example.invalid/sheet", "schedule": [["Prep", 0, "9:00 AM", "operational"]]}
+    monkeypatch.setattr(sheets, "SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(tenants, "_specs", {"a": dict(spec, name="A"), "b": dict(spec, name="B")})
+    monkeypatch.setattr(tenants, "_loaded", tenants.collections.OrderedDict())
+    monkeypatch.setattr(tenants, "MAX_LOADED", 1)
+
+    a = tenants.get_tenant("a")
+    a.event_store.add(CalendarEvent("Festival", datetime.date(2026, 6, 6), datetime.time(11)))
+    tenants.get_tenant("b")  # evicts "a"
+    assert "a" not in tenants._loaded
+
+    events = tenants.get_tenant("a").event_store.between(datetime.date(2026, 6, 6), datetime.date(2026, 6, 6))
+    assert [ev.title for ev in events[datetime.date(2026, 6, 6)]] == ["Festival"]
+    assert not tenants.get_tenant("b").event_store.between(datetime.date(2026, 6, 6), datetime.date(2026, 6, 6))[datetime.date(2026, 6, 6)]
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from vault import VaultIndex
+
+DOCS = pd.DataFrame({
+    "Document Name": ["Pizza Oven SOP", "US Foods Invoice March", "  ", None, "Oven Cleaning Checklist", "Invoice - Oven Repair"],
+    " Name ": [None, None, "Dough Recipe", None, "ignored", None],
+    "Link": ["https://a", "", None, "https://d", "https://e", " "],
+    "URL": [None, "https://b", None, None, None, "https://f"],
+})
+
+
+def test_prefix_and_multi_term_search():
+    index = VaultIndex(DOCS)
+    assert index.search("ov").tolist() == [0, 4, 5]
+    assert index.search("oven invoice").tolist() == [5]
+    assert index.search("INV  rep!").tolist() == [5]  # case and punctuation don't matter
+    assert index.search("oven pizza pizz").tolist() == [0]
+    assert index.search("ovens").tolist() == [] and index.search("zzz oven").tolist() == []
+
+
+def test_empty_query_lists_everything_in_sheet_order():
+    index = VaultIndex(DOCS)
+    np.testing.assert_array_equal(index.search(""), np.arange(6))
+    np.testing.assert_array_equal(index.search("  -- "), np.arange(6))
+    assert index.page(index.search(""), 1, 4) == (("Oven Cleaning Checklist", "https://e"), ("Invoice - Oven Repair", "https://f"))
+
+
+def test_blank_or_missing_name_and_link_fall_back():
+    index = VaultIndex(DOCS)
+    assert index.names.tolist() == ["Pizza Oven SOP", "US Foods Invoice March", "Dough Recipe", "Doc", "Oven Cleaning Checklist", "Invoice - Oven Repair"]
+    assert index.links.tolist() == ["https://a", "https://b", "#", "https://d", "https://e", "https://f"]
+    bare = VaultIndex(pd.DataFrame({"Other": [1, 2]}))
+    assert bare.names.tolist() == ["Doc", "Doc"] and bare.links.tolist() == ["#", "#"] and bare.search("doc").tolist() == [0, 1]
+    assert len(VaultIndex(pd.DataFrame())) == 0 and VaultIndex(pd.DataFrame()).search("x").tolist() == []
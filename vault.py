@@ -0,0 +1,62 @@
+import bisect
+import re
+
+import numpy as np
+import pandas as pd
+
+# --- DOCUMENT VAULT INDEX ---
+# Built once per Vault_Index fetch: the name/link columns are resolved up front into flat arrays,
+# and every word of every document name goes into an inverted index. A search is a prefix range
+# lookup on the sorted vocabulary plus a posting-list intersection, so paging through thousands
+# of SOPs and invoices never touches the DataFrame again.
+NAME_COLUMNS = ("document name", "name")
+LINK_COLUMNS = ("link", "url")
+TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def _first_filled(df, candidates, default):
+    # Row-wise "first non-blank of these columns", computed a column at a time
+    cols = {str(c).strip().lower(): c for c in df.columns}
+    out = pd.Series(pd.NA, index=df.index, dtype="object")
+    for name in candidates:
+        if name in cols:
+            values = df[cols[name]].astype("string").str.strip().replace("", pd.NA)
+            out = out.fillna(values)
+    return out.fillna(default).astype(str).to_numpy()
+
+
+class VaultIndex:
+    def __init__(self, df):
+        self.names = _first_filled(df, NAME_COLUMNS, "Doc")
+        self.links = _first_filled(df, LINK_COLUMNS, "#")
+        postings = {}
+        for doc_id, name in enumerate(self.names):
+            for token in set(TOKEN.findall(name.lower())):
+                postings.setdefault(token, []).append(doc_id)
+        self.vocab = sorted(postings)
+        self.postings = [np.asarray(postings[t], dtype=np.int32) for t in self.vocab]
+
+    def __len__(self):
+        return len(self.names)
+
+    def _prefix(self, term):
+        lo = bisect.bisect_left(self.vocab, term)
+        hi = bisect.bisect_left(self.vocab, term + "\uffff")
+        if hi - lo == 1: return self.postings[lo]
+        return np.unique(np.concatenate(self.postings[lo:hi])) if hi > lo else np.empty(0, dtype=np.int32)
+
+    def search(self, query):
+        # Doc ids (sheet order) whose name has a word starting with every query term
+        terms = TOKEN.findall(query.lower())
+        if not terms: return np.arange(len(self.names))
+        hits = None
+        for term in sorted(set(terms), key=len, reverse=True):
+            ids = self._prefix(term)
+            hits = ids if hits is None else np.intersect1d(hits, ids, assume_unique=True)
+            if not len(hits): break
+        return hits
+
+    def page(self, ids, page, per_page):
+        chunk = ids[page * per_page:(page + 1) * per_page]
+        return tuple(zip(self.names[chunk], self.links[chunk]))
+
@@ -0,0 +1,72 @@
+import importlib
+import os
+import sys
+import threading
+import time
+
+# --- COLD-START WARMUP ---
+# main.py renders the PIN gate with only Streamlit and a few light modules; everything heavy is
+# imported after sign-in. start() runs preload() on a daemon thread the first time any session
+# loads the app, so pandas, the Sheets client and the catalog are warm by the time the PIN is typed.
+# Run it ahead of the server too, so a freshly woken container starts with fresh sheet snapshots:
+#
+#   python warmup.py && streamlit run main.py
+#
+# CCK_WARMUP=0 turns the in-app warmup off (e.g. to measure a bare cold start).
+HEAVY_MODULES = (
+    "numpy", "pandas", "altair", "arrow", "fpdf", "streamlit_gsheets",
+    "quote_engine", "catalog", "recipe_engine", "pizza_optimizer", "inventory", "batch_quotes", "sheets", "vault",
+    "quote_pdf",
+)
+
+_started = False
+_started_lock = threading.Lock()
+timings = {}  # step -> ms, from the last preload()
+
+
+def _step(name, fn):
+    t = time.perf_counter()
+    try: fn()
+    except Exception as e: timings[name] = f"failed: {e}"
+    else: timings[name] = round((time.perf_counter() - t) * 1000, 1)
+
+
+def preload(sheets=True):
+    import branding
+    import templates
+    import tenants
+    for module in HEAVY_MODULES: _step(f"import {module}", lambda: importlib.import_module(module))
+    _step("stylesheet", templates.page_style_html)
+    _step("logo", branding.logo_bytes)
+    # The parsed PNG is the expensive part of each PDF; parse it before the first download
+    _step("pdf logo", lambda: importlib.import_module("quote_pdf").load_logo())
+    from recipe_engine import get_engine
+    for tenant_id in tenants.locations():
+        tenant = tenants.get_tenant(tenant_id)
+        _step(f"{tenant_id}: catalog", lambda: get_engine(tenant.catalog))
+        _step(f"{tenant_id}: calendar", lambda: tenant.event_store)
+        # Loads the disk snapshot or waits (bounded by cold_timeout) for the first fetch
+        if sheets: _step(f"{tenant_id}: vault", lambda: tenant.vault_index(tenant.vault.get()))
+    return timings
+
+
+def start():
+    # Once per process; later sessions and reruns return immediately
+    global _started
+    if os.environ.get("CCK_WARMUP", "1").lower() in ("0", "false", "no"): return
+    with _started_lock:
+        if _started: return
+        _started = True
+    threading.Thread(target=preload, name="warmup", daemon=True).start()
+
+
+if __name__ == "__main__":
+    t = time.perf_counter()
+    preload(sheets="--no-sheets" not in sys.argv)
+    for name, ms in timings.items(): print(f"{name:<32} {ms if isinstance(ms, str) else f'{ms:10.1f} ms'}")
+    print(f"{'total':<32} {(time.perf_counter() - t) * 1000:10.1f} ms")
+    # Sheet refreshes finish on daemon threads; let them land in the disk snapshots before exiting
+    import tenants
+    for tenant_id in tenants.locations():
+        sheet = tenants.get_tenant(tenant_id).vault
+        if sheet._refreshing: sheet._refresh_done.wait(30)